@@ -1,16 +1,28 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from uuid import UUID
 
 from ..core.database import get_db
+from ..core.pagination import InvalidCursorError
 from ..handlers.movie_handler import movie_handler
 from ..schemas.movie import (
     MovieCreate,
     MovieUpdate,
     MovieResponse,
     MovieSearchResponse,
+    MovieBulkRequest,
+    MovieBulkResponse,
+    MovieBulkItemResult,
+    MovieUpsertResponse,
+    MovieFacetsResponse,
+    InvalidFieldsError,
+    AutocompleteSuggestion,
+    HybridSearchResult,
     SimilarMovieResponse,
+    SimilarMoviesBatchRequest,
+    SimilarMoviesBatchResponse,
 )
 from ..core.auth import auth_required  # Placeholder for future auth
 
@@ -24,6 +36,118 @@ def create_movie(movie: MovieCreate, db: Session = Depends(get_db)):
     return movie_handler.create_movie(db, movie)
 
 
+@router.post("/bulk", response_model=MovieBulkResponse)
+# @auth_required  # Uncomment when auth is implemented
+def bulk_create_movies(request: MovieBulkRequest, db: Session = Depends(get_db)):
+    """Create up to 1000 movies in one transaction, reporting errors per movie"""
+    return movie_handler.bulk_create_movies(db, request.movies)
+
+
+@router.post("/upsert", response_model=MovieBulkItemResult)
+# @auth_required  # Uncomment when auth is implemented
+def upsert_movie(movie: MovieCreate, db: Session = Depends(get_db)):
+    """Create a movie, or replace the stored movie with the same imdb_id"""
+    result = movie_handler.upsert_movies(
+        db, [movie.model_dump(exclude_unset=True)]
+    ).results[0]
+    if result.status == "error":
+        raise HTTPException(status_code=422, detail=result.error)
+    return result
+
+
+@router.post("/bulk/upsert", response_model=MovieUpsertResponse)
+# @auth_required  # Uncomment when auth is implemented
+def bulk_upsert_movies(request: MovieBulkRequest, db: Session = Depends(get_db)):
+    """Upsert up to 1000 movies by imdb_id in one statement and transaction"""
+    return movie_handler.upsert_movies(db, request.movies)
+
+
+@router.get("/autocomplete", response_model=List[AutocompleteSuggestion])
+def autocomplete(
+    prefix: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db),
+):
+    """Title, director and cast-name suggestions for a typed prefix"""
+    return movie_handler.autocomplete(db, prefix, limit)
+
+
+@router.get("/facets", response_model=MovieFacetsResponse)
+def get_facets(
+    genre: Optional[str] = Query(None),
+    year: Optional[int] = Query(None),
+    year_from: Optional[int] = Query(None),
+    year_to: Optional[int] = Query(None),
+    director: Optional[str] = Query(None),
+    min_rating: Optional[float] = Query(None, ge=0, le=10),
+    max_rating: Optional[float] = Query(None, ge=0, le=10),
+    title: Optional[str] = Query(None),
+    fuzzy: bool = Query(False),
+    threshold: Optional[float] = Query(None, ge=0, le=1),
+    db: Session = Depends(get_db),
+):
+    """Movie counts per facet value for the same filters as GET /movies"""
+    return movie_handler.get_facets(
+        db,
+        genre,
+        year,
+        director,
+        min_rating,
+        max_rating,
+        title=title,
+        fuzzy=fuzzy,
+        similarity_threshold=threshold,
+        year_from=year_from,
+        year_to=year_to,
+    )
+
+
+@router.get("/export")
+def export_movies(
+    format: str = Query("ndjson", regex="^(ndjson|csv)$"),
+    fields: Optional[str] = Query(None),
+    genre: Optional[str] = Query(None),
+    year: Optional[int] = Query(None),
+    year_from: Optional[int] = Query(None),
+    year_to: Optional[int] = Query(None),
+    director: Optional[str] = Query(None),
+    min_rating: Optional[float] = Query(None, ge=0, le=10),
+    max_rating: Optional[float] = Query(None, ge=0, le=10),
+    title: Optional[str] = Query(None),
+    sort: str = Query(
+        "title", regex="^(title|rating|release_date|box_office|metacritic_score)$"
+    ),
+    order: str = Query("asc", regex="^(asc|desc)$"),
+    db: Session = Depends(get_db),
+):
+    """Stream every movie matching the filters as NDJSON or CSV"""
+    try:
+        chunks = movie_handler.export_movies(
+            db,
+            format,
+            fields,
+            sort,
+            order,
+            genre=genre,
+            year=year,
+            year_from=year_from,
+            year_to=year_to,
+            director=director,
+            min_rating=min_rating,
+            max_rating=max_rating,
+            title=title,
+        )
+    except InvalidFieldsError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="movies.{format}"'},
+    )
+
+
 @router.get("/{movie_id}", response_model=MovieResponse)
 def get_movie(movie_id: UUID, db: Session = Depends(get_db)):
     """Get a movie by ID"""
@@ -33,32 +157,74 @@ def get_movie(movie_id: UUID, db: Session = Depends(get_db)):
     return movie
 
 
-@router.get("/", response_model=MovieSearchResponse)
+# Listings only return the fields each movie was selected with (?fields=)
+@router.get("/", response_model=MovieSearchResponse, response_model_exclude_unset=True)
 def get_movies(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     genre: Optional[str] = Query(None),
     year: Optional[int] = Query(None),
+    year_from: Optional[int] = Query(None),
+    year_to: Optional[int] = Query(None),
     director: Optional[str] = Query(None),
     min_rating: Optional[float] = Query(None, ge=0, le=10),
     max_rating: Optional[float] = Query(None, ge=0, le=10),
+    title: Optional[str] = Query(None),
+    fuzzy: bool = Query(False),
+    threshold: Optional[float] = Query(None, ge=0, le=1),
+    cursor: Optional[str] = Query(None),
+    count: str = Query("exact", regex="^(exact|estimated)$"),
+    sort: str = Query(
+        "title", regex="^(title|rating|release_date|box_office|metacritic_score)$"
+    ),
+    order: str = Query("asc", regex="^(asc|desc)$"),
+    fields: Optional[str] = Query(None),
     db: Session = Depends(get_db),
 ):
     """Get movies with optional filtering"""
-    return movie_handler.get_movies(
-        db, skip, limit, genre, year, director, min_rating, max_rating
-    )
+    try:
+        return movie_handler.get_movies(
+            db,
+            skip,
+            limit,
+            genre,
+            year,
+            director,
+            min_rating,
+            max_rating,
+            title=title,
+            fuzzy=fuzzy,
+            similarity_threshold=threshold,
+            cursor=cursor,
+            count=count,
+            year_from=year_from,
+            year_to=year_to,
+            sort=sort,
+            order=order,
+            fields=fields,
+        )
+    except (InvalidCursorError, InvalidFieldsError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.get("/search/text", response_model=MovieSearchResponse)
+@router.get(
+    "/search/text",
+    response_model=MovieSearchResponse,
+    response_model_exclude_unset=True,
+)
 def search_movies(
     q: str = Query(..., min_length=1),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None),
     db: Session = Depends(get_db),
 ):
     """Full-text search for movies"""
-    return movie_handler.search_movies(db, q, skip, limit)
+    try:
+        return movie_handler.search_movies(db, q, skip, limit, cursor, fields)
+    except (InvalidCursorError, InvalidFieldsError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/search/similar", response_model=List[SimilarMovieResponse])
@@ -72,6 +238,48 @@ def find_similar_movies(
     return movie_handler.find_similar_movies(db, movie_id, limit, vector_type)
 
 
+@router.get("/search/semantic", response_model=List[SimilarMovieResponse])
+def semantic_search(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=50),
+    vector_type: str = Query("combined", regex="^(title|synopsis|combined)$"),
+    genre: Optional[str] = Query(None),
+    year: Optional[int] = Query(None),
+    min_rating: Optional[float] = Query(None, ge=0, le=10),
+    max_rating: Optional[float] = Query(None, ge=0, le=10),
+    db: Session = Depends(get_db),
+):
+    """Semantic search for movies matching a free-text query"""
+    return movie_handler.semantic_search(
+        db, q, limit, vector_type, genre, year, min_rating, max_rating
+    )
+
+
+@router.get("/search/hybrid", response_model=List[HybridSearchResult])
+def hybrid_search(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=100),
+    vector_type: str = Query("combined", regex="^(title|synopsis|combined)$"),
+    lexical_weight: float = Query(1.0, ge=0),
+    semantic_weight: float = Query(1.0, ge=0),
+    db: Session = Depends(get_db),
+):
+    """Hybrid full-text + semantic search ranked by reciprocal rank fusion"""
+    return movie_handler.hybrid_search(
+        db, q, limit, vector_type, lexical_weight, semantic_weight
+    )
+
+
+@router.post("/search/similar/batch", response_model=SimilarMoviesBatchResponse)
+def find_similar_movies_batch(
+    request: SimilarMoviesBatchRequest, db: Session = Depends(get_db)
+):
+    """Find similar movies for several movies in one call"""
+    return movie_handler.find_similar_movies_batch(
+        db, request.movie_ids, request.limit, request.vector_type
+    )
+
+
 @router.put("/{movie_id}", response_model=MovieResponse)
 # @auth_required  # Uncomment when auth is implemented
 def update_movie(
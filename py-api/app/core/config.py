@@ -24,6 +24,65 @@ class Settings(BaseSettings):
 
     # Vector Search
     vector_dimension: int = 384
+    vector_search_backend: str = "pgvector"  # "pgvector" or "hnsw" (in-process)
+    hnsw_m: int = 16
+    hnsw_ef_construction: int = 200
+    hnsw_ef_search: int = 64
+    hnsw_refresh_interval: float = 60.0  # seconds between syncs, 0 disables
+    hnsw_rebuild_interval: float = 86400.0  # seconds between full rebuilds, 0 never
+    vector_quantization: str = "none"  # "none", "halfvec" or "binary"
+    vector_rerank_factor: int = 4  # candidates fetched per result for re-ranking
+    neighbor_table_enabled: bool = False  # serve similar movies from movie_neighbors
+    neighbor_top_k: int = 20
+    neighbor_refresh_interval: float = 5.0  # seconds between idle passes, 0 = off
+    neighbor_refresh_batch_size: int = 50  # queued movies claimed per pass
+    neighbor_refresh_candidates: int = 100  # nearest movies checked per change
+
+    # Hybrid (full-text + vector) search
+    hybrid_candidates: int = 100  # candidates taken from each signal
+    hybrid_rrf_k: int = 60  # reciprocal rank fusion constant
+
+    # Fuzzy (pg_trgm) title/director filters
+    fuzzy_similarity_threshold: float = 0.3  # minimum trigram similarity
+
+    # Listing totals
+    count_cache_size: int = 1024  # cached totals, keyed by filter set
+    count_cache_ttl: float = 30.0  # seconds
+
+    # Facet counts (GET /movies/facets)
+    facets_cache_size: int = 256  # cached facet sets, keyed by filter set
+    facets_cache_ttl: float = 60.0  # seconds
+    facets_materialized_view: bool = False  # unfiltered facets from movie_facets
+
+    # Catalogue export (GET /movies/export)
+    export_batch_size: int = 1000  # rows per server-side cursor fetch and chunk
+
+    # Autocomplete (in-memory prefix index per worker)
+    autocomplete_enabled: bool = True
+    autocomplete_refresh_interval: float = 300.0  # seconds, 0 disables reloads
+
+    # Embedding cache
+    embedding_cache_size: int = 10000  # in-memory LRU entries
+    embedding_cache_path: Optional[str] = None  # enables the shared on-disk tier
+    embedding_cache_disk_slots: int = 65536
+    query_embedding_cache_size: int = 2048  # search queries
+    query_embedding_cache_ttl: float = 3600.0  # seconds
+
+    # Micro-batching of concurrent embedding requests
+    embedding_batching_enabled: bool = False
+    embedding_batch_max_size: int = 32
+    embedding_batch_wait_ms: float = 5.0
+
+    # Shared embedding server (python -m app.services.embedding_server)
+    embedding_server_socket: Optional[str] = None
+
+    # Background embedding jobs
+    embedding_mode: str = "sync"  # "sync" or "async" (queued for the worker)
+    embedding_worker_threads: int = 0  # in-process workers; 0 = external only
+    embedding_worker_batch_size: int = 16
+    embedding_worker_poll_interval: float = 1.0
+    embedding_job_max_attempts: int = 3
+    embedding_job_retention: float = 86400.0  # seconds done jobs are kept, 0 = forever
 
     # Auth (placeholder for future implementation)
     secret_key: str = "your-secret-key-here"
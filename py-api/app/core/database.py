@@ -21,10 +21,12 @@ def get_db():
 
 
 def init_db():
-    """Initialize database and enable pgvector extension"""
+    """Initialize database and enable the extensions the schema relies on"""
     try:
         with engine.connect() as conn:
             conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS btree_gin"))
             conn.commit()
         Base.metadata.create_all(bind=engine)
         logger.info("Database initialized successfully")
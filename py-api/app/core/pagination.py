@@ -0,0 +1,42 @@
+"""
+Opaque cursors for keyset pagination.
+
+A cursor carries the sort key values of the last row of a page (always ending
+with the movie id as tie-break) plus the kind of listing it belongs to, so a
+search cursor cannot be replayed against a different listing.
+"""
+
+from typing import Any, List, Sequence
+from uuid import UUID
+import base64
+import json
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(kind: str, values: Sequence[Any]) -> str:
+    payload = json.dumps([kind, list(values)], default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, kind: str, size: int = 2) -> List[Any]:
+    """The ``size`` key values stored in ``cursor``, the last one as a UUID.
+
+    Raises InvalidCursorError for tampered cursors or ones from another listing.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_kind, values = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError):
+        raise InvalidCursorError("Malformed cursor")
+    if cursor_kind != kind:
+        raise InvalidCursorError(f"Cursor does not belong to this {kind} listing")
+    if not isinstance(values, list) or len(values) != size:
+        raise InvalidCursorError("Malformed cursor")
+    try:
+        values[-1] = UUID(values[-1])
+    except (ValueError, TypeError, AttributeError):
+        raise InvalidCursorError("Malformed cursor")
+    return values
@@ -0,0 +1,90 @@
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta, timezone
+from typing import List
+from uuid import UUID
+
+from ..models.embedding_job import EmbeddingJob
+from ..models.movie import Movie
+
+
+class EmbeddingJobCRUD:
+
+    def enqueue(self, db: Session, movie_id: UUID) -> EmbeddingJob:
+        """Add a pending job; committed together with the caller's transaction"""
+        job = EmbeddingJob(movie_id=movie_id, status="pending", attempts=0)
+        db.add(job)
+        return job
+
+    def enqueue_many(self, db: Session, movie_ids: List[UUID]):
+        """Add one pending job per movie in multi-row INSERTs (caller commits)"""
+        if movie_ids:
+            db.execute(
+                insert(EmbeddingJob),
+                [
+                    {"movie_id": movie_id, "status": "pending", "attempts": 0}
+                    for movie_id in movie_ids
+                ],
+            )
+
+    def claim(self, db: Session, limit: int = 16) -> List[EmbeddingJob]:
+        """Lock up to ``limit`` due jobs, skipping rows other workers hold.
+
+        The row locks last until the caller commits or rolls back, so a worker
+        that dies mid-batch leaves its jobs pending for the next one.
+        """
+        return (
+            db.query(EmbeddingJob)
+            .filter(
+                EmbeddingJob.status == "pending",
+                EmbeddingJob.run_after <= datetime.now(timezone.utc),
+            )
+            .order_by(EmbeddingJob.run_after)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+
+    def mark_done(self, db: Session, job: EmbeddingJob):
+        job.status = "done"
+        job.attempts += 1
+        job.last_error = None
+
+    def record_failure(
+        self, db: Session, job_ids: List[UUID], error: str, max_attempts: int
+    ) -> int:
+        """Schedule a retry with exponential backoff, or fail after max_attempts"""
+        failed = 0
+        jobs = db.query(EmbeddingJob).filter(EmbeddingJob.id.in_(job_ids)).all()
+        for job in jobs:
+            job.attempts += 1
+            job.last_error = error
+            if job.attempts >= max_attempts:
+                job.status = "failed"
+                db.query(Movie).filter(Movie.id == job.movie_id).update(
+                    {Movie.embedding_status: "failed"}, synchronize_session=False
+                )
+                failed += 1
+            else:
+                job.run_after = datetime.now(timezone.utc) + timedelta(
+                    seconds=2**job.attempts
+                )
+        db.commit()
+        return failed
+
+    def purge_done(self, db: Session, older_than: timedelta) -> int:
+        """Delete done jobs finished more than ``older_than`` ago"""
+        cutoff = datetime.now(timezone.utc) - older_than
+        deleted = (
+            db.query(EmbeddingJob)
+            .filter(EmbeddingJob.status == "done", EmbeddingJob.updated_at < cutoff)
+            .delete(synchronize_session=False)
+        )
+        db.commit()
+        return deleted
+
+    def count_by_status(self, db: Session, status: str) -> int:
+        return db.query(EmbeddingJob).filter(EmbeddingJob.status == status).count()
+
+
+embedding_job_crud = EmbeddingJobCRUD()
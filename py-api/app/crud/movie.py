@@ -1,85 +1,528 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import text, func, or_
-from typing import List, Optional
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy import (
+    Integer,
+    Text,
+    case,
+    insert,
+    inspect,
+    or_,
+    text,
+    func,
+    cast,
+    literal,
+    literal_column,
+    true,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import JSONB, REAL, array, insert as pg_insert
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
 from uuid import UUID
 import numpy as np
 
-from ..models.movie import Movie
+from ..core.config import settings
+from ..models.movie import Movie, SORT_NULL_SENTINELS
 from ..schemas.movie import MovieCreate, MovieUpdate
 
+# Compact HNSW expression index of each quantization mode, per vector column:
+# (index name suffix, indexed expression and operator class)
+QUANTIZED_INDEXES = {
+    "halfvec": ("half", "({column}::halfvec({dim})) halfvec_cosine_ops"),
+    "binary": ("bit", "(binary_quantize({column})::bit({dim})) bit_hamming_ops"),
+}
+
+# ORDER BY expressions matching the QUANTIZED_INDEXES
+QUANTIZED_DISTANCES = {
+    "halfvec": "{column}::halfvec({dim}) <=> CAST(:query_vector AS halfvec({dim}))",
+    "binary": (
+        "binary_quantize({column})::bit({dim}) "
+        "<~> binary_quantize(CAST(:query_vector AS vector))"
+    ),
+}
+
+# GET /movies sort options and the columns they order by
+SORT_COLUMNS = {
+    "title": "title",
+    "rating": "imdb_rating",
+    "release_date": "release_date",
+    "box_office": "box_office",
+    "metacritic_score": "metacritic_score",
+}
+
+# get_multi keyword arguments that narrow the listing
+LISTING_FILTERS = (
+    "genre",
+    "year",
+    "year_from",
+    "year_to",
+    "director",
+    "min_rating",
+    "max_rating",
+    "title",
+)
+
+
+# Facets of GET /movies/facets, in GROUPING SETS order. decade is the first year
+# of the decade, rating the whole-number IMDb rating bucket (8 for 8.0-8.9)
+FACETS = ("genre", "language", "country", "decade", "rating")
+
+# GROUPING(<FACETS>) of each grouping set: one bit per facet left out of the
+# set, first facet highest. The empty set (all bits) counts the movies
+FACET_GROUPINGS = {
+    0b01111: "genre",
+    0b10111: "language",
+    0b11011: "country",
+    0b11101: "decade",
+    0b11110: "rating",
+}
+TOTAL_GROUPING = 0b11111
+
+
+def _movie_columns(table: str = "movies") -> str:
+    """Raw SQL select list of the movie columns ORM queries load by default.
+
+    Leaves out the deferred vector and search_vector columns, like
+    ``db.query(Movie)`` does.
+    """
+    return ", ".join(
+        f'{table}."{prop.columns[0].name}"'
+        for prop in inspect(Movie).column_attrs
+        if not prop.deferred
+    )
+
+
+def _escape_like(value: str) -> str:
+    """Escape LIKE wildcards so ``value`` matches literally"""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _contains_pattern(value: str) -> str:
+    """ILIKE pattern matching ``value`` literally anywhere in the column"""
+    return f"%{_escape_like(value)}%"
+
 
 class MovieCRUD:
 
-    def create(self, db: Session, movie_data: MovieCreate) -> Movie:
-        db_movie = Movie(**movie_data.model_dump(exclude_unset=True))
+    def create(self, db: Session, movie_data: MovieCreate, **columns) -> Movie:
+        """Insert a movie with one ``INSERT ... RETURNING`` statement.
 
-        # Generate search vector for full-text search
-        search_text = f"{movie_data.title or ''} {movie_data.synopsis or ''} {movie_data.director or ''}"
-        if movie_data.cast:
-            cast_names = " ".join([member.name for member in movie_data.cast])
-            search_text += f" {cast_names}"
-        if movie_data.genres:
-            search_text += f" {' '.join(movie_data.genres)}"
+        ``columns`` sets further columns, such as the vectors and
+        embedding_status. Runs in the caller's transaction.
+        """
+        return db.scalars(
+            insert(Movie)
+            .values(**movie_data.model_dump(exclude_unset=True), **columns)
+            .returning(Movie)
+        ).one()
 
-        db_movie.search_vector = search_text
+    def create_many(self, db: Session, rows: List[dict]) -> set:
+        """Insert movies given as column dicts, in multi-row INSERT statements.
 
-        db.add(db_movie)
-        db.commit()
-        db.refresh(db_movie)
-        return db_movie
+        Rows should share the same keys (``id`` included) so they go out in
+        as few statements as possible. Rows clashing with a stored movie on a
+        unique column (imdb_id, tmdb_id) are skipped with ``ON CONFLICT DO
+        NOTHING``. Returns the ids of the inserted rows. Runs in the caller's
+        transaction.
+        """
+        if not rows:
+            return set()
+        inserted = db.scalars(
+            pg_insert(Movie).on_conflict_do_nothing().returning(Movie.id), rows
+        )
+        return set(inserted)
+
+    def upsert_many(
+        self,
+        db: Session,
+        rows: List[dict],
+        columns: Sequence[str],
+        embedding_columns: Sequence[str] = (),
+    ) -> List[tuple]:
+        """Insert movies or update the stored ones with the same imdb_id.
+
+        One ``INSERT ... ON CONFLICT (imdb_id) DO UPDATE`` statement. On
+        conflict ``columns`` take the new values, while ``embedding_columns``
+        (vectors, embedding_status) only do when the content hash of title and
+        synopsis changed, so movies with unchanged text keep their vectors.
+        Rows whose ``columns`` are all unchanged are not written at all.
+
+        Returns (id, imdb_id, inserted, embedding_status) for the rows
+        written; unchanged rows are left out. embedding_status is the stored
+        one, so a row whose text the database saw as changed comes back with
+        the status sent for it. Runs in the caller's transaction.
+        """
+        if not rows:
+            return []
+
+        table = Movie.__table__
+        statement = pg_insert(table).values(rows)
+        excluded = statement.excluded
+
+        def distinct(column: str):
+            stored, new = table.c[column], excluded[column]
+            if column == "cast":  # json has no equality operator
+                stored, new = cast(stored, JSONB), cast(new, JSONB)
+            return stored.is_distinct_from(new)
+
+        # Same expression as the generated content_hash column
+        text_changed = table.c.content_hash.is_distinct_from(
+            func.md5(
+                func.concat(
+                    func.coalesce(excluded.title, ""),
+                    func.chr(31),
+                    func.coalesce(excluded.synopsis, ""),
+                )
+            )
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.imdb_id],
+            set_={
+                **{column: excluded[column] for column in columns},
+                **{
+                    column: case(
+                        (text_changed, excluded[column]), else_=table.c[column]
+                    )
+                    for column in embedding_columns
+                },
+                # ON CONFLICT updates skip the column's onupdate default
+                "updated_at": func.now(),
+            },
+            where=or_(*(distinct(column) for column in columns)),
+        ).returning(
+            table.c.id,
+            table.c.imdb_id,
+            # xmax is 0 for freshly inserted row versions
+            literal_column("xmax = 0").label("inserted"),
+            table.c.embedding_status,
+        )
+        return db.execute(statement).fetchall()
+
+    def update_vectors(self, db: Session, rows: List[dict]):
+        """Set vectors and embedding_status of movies given as column dicts.
+
+        Each row holds ``id`` plus the columns to set; rows sharing the same
+        keys go out as one executemany UPDATE. Runs in the caller's transaction.
+        """
+        if rows:
+            db.execute(update(Movie), rows)
+
+    def content_hashes(self, db: Session, imdb_ids: List[str]) -> dict:
+        """imdb_id -> (id, content_hash) of the stored movies among ``imdb_ids``"""
+        if not imdb_ids:
+            return {}
+        rows = (
+            db.query(Movie.imdb_id, Movie.id, Movie.content_hash)
+            .filter(Movie.imdb_id.in_(imdb_ids))
+            .all()
+        )
+        return {imdb_id: (movie_id, digest) for imdb_id, movie_id, digest in rows}
 
     def get(self, db: Session, movie_id: UUID) -> Optional[Movie]:
         return db.query(Movie).filter(Movie.id == movie_id).first()
 
+    def get_many(self, db: Session, movie_ids: List[UUID]) -> List[Movie]:
+        if not movie_ids:
+            return []
+        return db.query(Movie).filter(Movie.id.in_(movie_ids)).all()
+
+    def get_text(self, db: Session, movie_id: UUID) -> Optional[tuple]:
+        """(title, synopsis) of a movie, the texts its vectors embed"""
+        return (
+            db.query(Movie.title, Movie.synopsis).filter(Movie.id == movie_id).first()
+        )
+
     def get_by_imdb_id(self, db: Session, imdb_id: str) -> Optional[Movie]:
         return db.query(Movie).filter(Movie.imdb_id == imdb_id).first()
 
-    def get_multi(
+    def existing_external_ids(
+        self, db: Session, imdb_ids: List[str], tmdb_ids: List[int]
+    ) -> Tuple[set, set]:
+        """The ``imdb_ids`` and ``tmdb_ids`` already used by stored movies"""
+        if not imdb_ids and not tmdb_ids:
+            return set(), set()
+        rows = (
+            db.query(Movie.imdb_id, Movie.tmdb_id)
+            .filter(or_(Movie.imdb_id.in_(imdb_ids), Movie.tmdb_id.in_(tmdb_ids)))
+            .all()
+        )
+        return (
+            {imdb_id for imdb_id, _ in rows} & set(imdb_ids),
+            {tmdb_id for _, tmdb_id in rows} & set(tmdb_ids),
+        )
+
+    def imdb_ids_by_tmdb_id(self, db: Session, tmdb_ids: List[int]) -> dict:
+        """tmdb_id -> imdb_id of the stored movies among ``tmdb_ids``"""
+        if not tmdb_ids:
+            return {}
+        rows = (
+            db.query(Movie.tmdb_id, Movie.imdb_id)
+            .filter(Movie.tmdb_id.in_(tmdb_ids))
+            .all()
+        )
+        return dict(rows)
+
+    def _list_query(
         self,
         db: Session,
-        skip: int = 0,
-        limit: int = 100,
         genre: Optional[str] = None,
         year: Optional[int] = None,
         director: Optional[str] = None,
         min_rating: Optional[float] = None,
         max_rating: Optional[float] = None,
-    ) -> List[Movie]:
+        title: Optional[str] = None,
+        fuzzy: bool = False,
+        similarity_threshold: Optional[float] = None,
+        year_from: Optional[int] = None,
+        year_to: Optional[int] = None,
+    ):
+        """Movies matching the listing filters; fuzzy matches come closest first"""
         query = db.query(Movie)
 
         if genre:
             query = query.filter(Movie.genres.contains([genre]))
         if year:
-            query = query.filter(func.extract("year", Movie.release_date) == year)
-        if director:
-            query = query.filter(Movie.director.ilike(f"%{director}%"))
+            query = query.filter(Movie.release_year == year)
+        if year_from:
+            query = query.filter(Movie.release_year >= year_from)
+        if year_to:
+            query = query.filter(Movie.release_year <= year_to)
+        if fuzzy and (title or director):
+            # The % operator reads its cutoff from this setting
+            threshold = similarity_threshold
+            if threshold is None:
+                threshold = settings.fuzzy_similarity_threshold
+            db.execute(
+                text("SELECT set_config('pg_trgm.similarity_threshold', :t, true)"),
+                {"t": str(threshold)},
+            )
+            if title:
+                query = query.filter(Movie.title.bool_op("%")(title))
+                query = query.order_by(func.similarity(Movie.title, title).desc())
+            if director:
+                query = query.filter(Movie.director.bool_op("%")(director))
+                query = query.order_by(func.similarity(Movie.director, director).desc())
+        else:
+            if title:
+                query = query.filter(
+                    Movie.title.ilike(_contains_pattern(title), escape="\\")
+                )
+            if director:
+                query = query.filter(
+                    Movie.director.ilike(_contains_pattern(director), escape="\\")
+                )
         if min_rating:
             query = query.filter(Movie.imdb_rating >= min_rating)
         if max_rating:
             query = query.filter(Movie.imdb_rating <= max_rating)
 
+        return query
+
+    def get_multi(
+        self,
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        genre: Optional[str] = None,
+        year: Optional[int] = None,
+        director: Optional[str] = None,
+        min_rating: Optional[float] = None,
+        max_rating: Optional[float] = None,
+        title: Optional[str] = None,
+        fuzzy: bool = False,
+        similarity_threshold: Optional[float] = None,
+        after: Optional[Sequence] = None,
+        year_from: Optional[int] = None,
+        year_to: Optional[int] = None,
+        sort: str = "title",
+        descending: bool = False,
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[Movie]:
+        """List movies matching the given filters, ordered by ``sort`` then id.
+
+        ``title`` and ``director`` match as case-insensitive substrings, or with
+        ``fuzzy`` as pg_trgm similarity above ``similarity_threshold`` (closest
+        matches first). Both forms are served by the trigram GIN indexes.
+
+        ``year`` and the inclusive ``year_from``/``year_to`` range match the
+        indexed ``release_year`` column.
+
+        Movies without a value for the sort column come last in either
+        direction. ``after`` is the (sort key, id) of the last movie of the
+        previous page (see ``sort_value``); it replaces ``skip`` with a keyset
+        seek on the sort's index.
+
+        ``fields`` limits the loaded columns to those attributes (plus the id
+        and the sort column); the others are not fetched from the database.
+        """
+        query = self._list_query(
+            db,
+            genre,
+            year,
+            director,
+            min_rating,
+            max_rating,
+            title,
+            fuzzy,
+            similarity_threshold,
+            year_from,
+            year_to,
+        )
+
+        if after is not None:
+            key = tuple_(self._sort_expression(sort, descending), Movie.id)
+            after_value, after_id = after
+            bound = tuple_(literal(after_value), literal(UUID(str(after_id))))
+            query = query.filter(key < bound if descending else key > bound)
+            skip = 0
+
+        query = self._order(query, sort, descending)
+        query = self._load_only(query, fields, SORT_COLUMNS[sort])
         return query.offset(skip).limit(limit).all()
 
+    def get_multi_with_total(
+        self,
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        sort: str = "title",
+        descending: bool = False,
+        fields: Optional[Sequence[str]] = None,
+        **filters,
+    ) -> Tuple[List[Movie], Optional[int]]:
+        """A page of ``get_multi`` plus the number of movies matching the filters.
+
+        The total comes from ``count(*) OVER ()`` in the same query, which is
+        evaluated before LIMIT/OFFSET. It is None when the page is empty.
+        """
+        query = self._list_query(db, **filters).add_columns(
+            func.count().over().label("total")
+        )
+        query = self._load_only(query, fields, SORT_COLUMNS[sort])
+        rows = self._order(query, sort, descending).offset(skip).limit(limit).all()
+        return [row.Movie for row in rows], (rows[0].total if rows else None)
+
+    def stream(
+        self,
+        db: Session,
+        fields: Optional[Sequence[str]] = None,
+        batch_size: int = 1000,
+        sort: str = "title",
+        descending: bool = False,
+        **filters,
+    ) -> Iterable[Movie]:
+        """Every movie matching the ``get_multi`` filters, in ``sort`` order.
+
+        Rows are fetched ``batch_size`` at a time from a server-side cursor
+        (``yield_per`` turns on ``stream_results``), so memory use does not
+        grow with the number of movies. Consume the result before the session
+        is used for anything else.
+        """
+        query = self._order(self._list_query(db, **filters), sort, descending)
+        return self._load_only(query, fields).yield_per(batch_size)
+
+    def _load_only(self, query, fields: Optional[Sequence[str]], *required: str):
+        """Restrict the Movie columns ``query`` loads to ``fields`` (None: all)"""
+        if fields is None:
+            return query
+        names = dict.fromkeys([*fields, *required])
+        return query.options(load_only(*(getattr(Movie, name) for name in names)))
+
+    def _sort_expression(self, sort: str, descending: bool):
+        """Sort key of ``sort``, matching its (expression, id) index"""
+        column = SORT_COLUMNS[sort]
+        if column not in SORT_NULL_SENTINELS:
+            return getattr(Movie, column)
+        sentinel_sql = SORT_NULL_SENTINELS[column][descending][0]
+        return func.coalesce(getattr(Movie, column), literal_column(sentinel_sql))
+
+    def _order(self, query, sort: str, descending: bool):
+        key = self._sort_expression(sort, descending)
+        if descending:
+            return query.order_by(key.desc(), Movie.id.desc())
+        return query.order_by(key, Movie.id)
+
+    def sort_value(self, movie: Movie, sort: str, descending: bool) -> Any:
+        """The sort key of ``movie`` as used for keyset cursors"""
+        column = SORT_COLUMNS[sort]
+        value = getattr(movie, column)
+        if value is None and column in SORT_NULL_SENTINELS:
+            return SORT_NULL_SENTINELS[column][descending][1]
+        return value
+
     def search(
         self, db: Session, query: str, skip: int = 0, limit: int = 100
     ) -> List[Movie]:
-        search_terms = query.split()
-        conditions = []
-
-        for term in search_terms:
-            term_condition = or_(
-                Movie.title.ilike(f"%{term}%"),
-                Movie.synopsis.ilike(f"%{term}%"),
-                Movie.director.ilike(f"%{term}%"),
-                Movie.search_vector.ilike(f"%{term}%"),
-            )
-            conditions.append(term_condition)
+        """Full-text search over the weighted ``search_vector`` column.
+
+        ``query`` uses web search syntax ("quoted phrases", ``or``, ``-word``);
+        matches are ordered by ``ts_rank_cd`` so title hits outrank cast and
+        director hits, which outrank synopsis hits.
+        """
+        return [row.Movie for row in self.search_ranked(db, query, skip, limit)]
 
-        if conditions:
-            return (
-                db.query(Movie).filter(or_(*conditions)).offset(skip).limit(limit).all()
+    def search_ranked(
+        self,
+        db: Session,
+        query: str,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Sequence] = None,
+        with_total: bool = False,
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[tuple]:
+        """Like ``search`` but yields (Movie, rank) rows.
+
+        ``after`` is the (rank, id) key of the last row of the previous page and
+        replaces ``skip`` with a keyset seek. ``with_total`` adds a ``total``
+        column counting all matches (only meaningful without ``after``).
+        ``fields`` limits the loaded Movie columns as in ``get_multi``.
+        """
+        if not query.strip():
+            return []
+
+        tsquery = func.websearch_to_tsquery("english", query)
+        rank = func.ts_rank_cd(Movie.search_vector, tsquery)
+
+        results = db.query(Movie, rank.label("rank")).filter(
+            Movie.search_vector.op("@@")(tsquery)
+        )
+        results = self._load_only(results, fields)
+        if with_total:
+            results = results.add_columns(func.count().over().label("total"))
+        if after is not None:
+            after_rank, after_id = after
+            # ts_rank_cd returns real, so compare at that precision
+            results = results.filter(
+                tuple_(rank, Movie.id)
+                < tuple_(
+                    cast(float(after_rank), REAL),
+                    literal(UUID(str(after_id)), Movie.id.type),
+                )
             )
-        return []
+            skip = 0
+
+        return (
+            results.order_by(rank.desc(), Movie.id.desc())
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+
+    def search_count(self, db: Session, query: str) -> int:
+        if not query.strip():
+            return 0
+        tsquery = func.websearch_to_tsquery("english", query)
+        return db.query(Movie).filter(Movie.search_vector.op("@@")(tsquery)).count()
+
+    def title_prefix_search(self, db: Session, prefix: str, limit: int = 10):
+        """(id, title, imdb_rating) rows whose title starts with ``prefix``"""
+        return (
+            db.query(Movie.id, Movie.title, Movie.imdb_rating)
+            .filter(Movie.title.ilike(f"{_escape_like(prefix)}%", escape="\\"))
+            .order_by(Movie.imdb_rating.desc().nullslast(), Movie.title)
+            .limit(limit)
+            .all()
+        )
 
     def vector_search(
         self,
@@ -87,57 +530,232 @@ class MovieCRUD:
         query_vector: List[float],
         limit: int = 10,
         vector_type: str = "combined",
+        quantization: Optional[str] = None,
+        genre: Optional[str] = None,
+        year: Optional[int] = None,
+        min_rating: Optional[float] = None,
+        max_rating: Optional[float] = None,
     ) -> List[tuple]:
         vector_column = getattr(Movie, f"{vector_type}_vector")
+        quantization = quantization or settings.vector_quantization
 
         # Convert list to string format for pgvector
         vector_str = f"[{','.join(map(str, query_vector))}]"
 
+        # Optional prefilters, written so the btree/GIN indexes can serve them
+        filters = ""
+        params = {
+            "genre": genre,
+            "year": year,
+            "min_rating": min_rating,
+            "max_rating": max_rating,
+        }
+        if genre:
+            filters += " AND genres @> ARRAY[CAST(:genre AS varchar)]"
+        if year:
+            filters += " AND release_year = :year"
+        if min_rating:
+            filters += " AND imdb_rating >= :min_rating"
+        if max_rating:
+            filters += " AND imdb_rating <= :max_rating"
+
+        if quantization in QUANTIZED_DISTANCES:
+            # Find candidates on the compact index, then re-rank them exactly
+            candidate_order = QUANTIZED_DISTANCES[quantization].format(
+                column=vector_column.name, dim=settings.vector_dimension
+            )
+            candidates = limit * settings.vector_rerank_factor
+
+            # HNSW scans return at most ef_search rows, so widen it for this query
+            db.execute(
+                text("SELECT set_config('hnsw.ef_search', :ef_search, true)"),
+                {"ef_search": str(max(candidates, 40))},
+            )
+            result = db.execute(
+                text(
+                    f"""
+                    SELECT {_movie_columns("candidates")},
+                        ({vector_column.name} <=> CAST(:query_vector AS vector))
+                        as distance
+                    FROM (
+                        SELECT {_movie_columns()}, {vector_column.name} FROM movies
+                        WHERE {vector_column.name} IS NOT NULL{filters}
+                        ORDER BY {candidate_order}
+                        LIMIT :candidates
+                    ) candidates
+                    ORDER BY distance
+                    LIMIT :limit
+                """
+                ),
+                {
+                    "query_vector": vector_str,
+                    "limit": limit,
+                    "candidates": candidates,
+                    **params,
+                },
+            )
+            return result.fetchall()
+
         result = db.execute(
             text(
                 f"""
-                SELECT *, ({vector_column.name} <=> :query_vector) as distance
-                FROM movies 
-                WHERE {vector_column.name} IS NOT NULL
+                SELECT {_movie_columns()},
+                    ({vector_column.name} <=> :query_vector) as distance
+                FROM movies
+                WHERE {vector_column.name} IS NOT NULL{filters}
                 ORDER BY {vector_column.name} <=> :query_vector
                 LIMIT :limit
             """
             ),
-            {"query_vector": vector_str, "limit": limit},
+            {"query_vector": vector_str, "limit": limit, **params},
+        )
+
+        return result.fetchall()
+
+    def hybrid_search(
+        self,
+        db: Session,
+        query: str,
+        query_vector: Optional[List[float]],
+        limit: int = 10,
+        vector_type: str = "combined",
+        lexical_weight: float = 1.0,
+        semantic_weight: float = 1.0,
+    ) -> List[tuple]:
+        """Full-text and vector candidates fused with reciprocal rank fusion.
+
+        Both candidate lists are computed as CTEs of a single statement. Each
+        movie scores ``weight / (rrf_k + rank)`` per list it appears in; rows
+        carry the per-signal scores and ranks alongside ``rrf_score``.
+        """
+        column = getattr(Movie, f"{vector_type}_vector").name
+        use_semantic = query_vector is not None and any(query_vector)
+        vector_str = f"[{','.join(map(str, query_vector))}]" if use_semantic else None
+
+        result = db.execute(
+            text(
+                f"""
+                WITH q AS (
+                    SELECT websearch_to_tsquery('english', :query) as tsquery
+                ),
+                lexical AS (
+                    SELECT id, lexical_score,
+                        row_number() OVER (ORDER BY lexical_score DESC) as lexical_rank
+                    FROM (
+                        SELECT m.id,
+                            ts_rank_cd(m.search_vector, q.tsquery) as lexical_score
+                        FROM movies m, q
+                        WHERE m.search_vector @@ q.tsquery
+                        ORDER BY lexical_score DESC
+                        LIMIT :candidates
+                    ) ranked
+                ),
+                semantic AS (
+                    SELECT id, 1 - distance as semantic_score,
+                        row_number() OVER (ORDER BY distance) as semantic_rank
+                    FROM (
+                        SELECT id, ({column} <=> CAST(:query_vector AS vector))
+                            as distance
+                        FROM movies
+                        WHERE :use_semantic AND {column} IS NOT NULL
+                        ORDER BY {column} <=> CAST(:query_vector AS vector)
+                        LIMIT :candidates
+                    ) ranked
+                ),
+                fused AS (
+                    SELECT coalesce(l.id, s.id) as id,
+                        l.lexical_score, l.lexical_rank,
+                        s.semantic_score, s.semantic_rank,
+                        coalesce(
+                            CAST(:lexical_weight AS float) / (:rrf_k + l.lexical_rank),
+                            0
+                        )
+                        + coalesce(
+                            CAST(:semantic_weight AS float)
+                            / (:rrf_k + s.semantic_rank),
+                            0
+                        ) as rrf_score
+                    FROM lexical l
+                    FULL OUTER JOIN semantic s ON s.id = l.id
+                )
+                SELECT {_movie_columns()}, fused.lexical_score, fused.lexical_rank,
+                    fused.semantic_score, fused.semantic_rank, fused.rrf_score
+                FROM fused
+                JOIN movies ON movies.id = fused.id
+                ORDER BY fused.rrf_score DESC
+                LIMIT :limit
+            """
+            ),
+            {
+                "query": query,
+                "query_vector": vector_str,
+                "use_semantic": use_semantic,
+                "candidates": settings.hybrid_candidates,
+                "lexical_weight": lexical_weight,
+                "semantic_weight": semantic_weight,
+                "rrf_k": settings.hybrid_rrf_k,
+                "limit": limit,
+            },
+        )
+
+        return result.fetchall()
+
+    def vector_search_batch(
+        self,
+        db: Session,
+        movie_ids: List[UUID],
+        limit: int = 10,
+        vector_type: str = "combined",
+    ) -> List[tuple]:
+        """Nearest neighbours of several movies in one round trip.
+
+        Each returned row is a neighbour movie with its ``distance`` and the
+        ``reference_id`` of the movie it is similar to; the reference movie
+        itself is excluded from its own neighbours.
+        """
+        if not movie_ids:
+            return []
+
+        column = getattr(Movie, f"{vector_type}_vector").name
+
+        result = db.execute(
+            text(
+                f"""
+                SELECT ref.id AS reference_id, neighbour.*
+                FROM movies ref
+                CROSS JOIN LATERAL (
+                    SELECT {_movie_columns()},
+                        (movies.{column} <=> ref.{column}) as distance
+                    FROM movies
+                    WHERE movies.{column} IS NOT NULL AND movies.id <> ref.id
+                    ORDER BY movies.{column} <=> ref.{column}
+                    LIMIT :limit
+                ) neighbour
+                WHERE ref.id = ANY(CAST(:movie_ids AS uuid[]))
+                    AND ref.{column} IS NOT NULL
+                ORDER BY ref.id, neighbour.distance
+            """
+            ),
+            {"movie_ids": [str(movie_id) for movie_id in movie_ids], "limit": limit},
         )
 
         return result.fetchall()
 
     def update(
-        self, db: Session, movie_id: UUID, movie_update: MovieUpdate
+        self, db: Session, movie_id: UUID, movie_update: MovieUpdate, **columns
     ) -> Optional[Movie]:
-        db_movie = self.get(db, movie_id)
-        if not db_movie:
-            return None
-
-        update_data = movie_update.model_dump(exclude_unset=True)
-
-        for field, value in update_data.items():
-            setattr(db_movie, field, value)
-
-        # Update search vector if relevant fields changed
-        if any(
-            field in update_data
-            for field in ["title", "synopsis", "director", "cast", "genres"]
-        ):
-            search_text = f"{db_movie.title or ''} {db_movie.synopsis or ''} {db_movie.director or ''}"
-            if db_movie.cast:
-                cast_names = " ".join(
-                    [member.get("name", "") for member in db_movie.cast]
-                )
-                search_text += f" {cast_names}"
-            if db_movie.genres:
-                search_text += f" {' '.join(db_movie.genres)}"
-            db_movie.search_vector = search_text
+        """Update a movie with one ``UPDATE ... RETURNING`` statement.
 
-        db.commit()
-        db.refresh(db_movie)
-        return db_movie
+        ``columns`` sets further columns, like in create. Returns None when
+        the movie does not exist. Runs in the caller's transaction.
+        """
+        values = {**movie_update.model_dump(exclude_unset=True), **columns}
+        if not values:
+            return self.get(db, movie_id)
+
+        return db.scalars(
+            update(Movie).where(Movie.id == movie_id).values(**values).returning(Movie)
+        ).one_or_none()
 
     def delete(self, db: Session, movie_id: UUID) -> bool:
         db_movie = self.get(db, movie_id)
@@ -148,8 +766,136 @@ class MovieCRUD:
         db.commit()
         return True
 
-    def count(self, db: Session) -> int:
-        return db.query(Movie).count()
+    def facets(self, db: Session, **filters) -> List[tuple]:
+        """(facet, value, count) rows over the movies matching the filters.
+
+        One pass over the filtered movies: genres, languages and countries are
+        unnested side by side (shorter arrays padded with NULL) together with
+        one-element decade and rating arrays, so every value appears once per
+        movie, then GROUPING SETS counts each facet. The ``total`` facet (value
+        '') counts the movies themselves. Rows are ordered by facet, then by
+        count descending.
+        """
+        movies = (
+            self._list_query(db, **filters)
+            .order_by(None)
+            .with_entities(
+                Movie.genres.label("genres"),
+                Movie.languages.label("languages"),
+                Movie.countries.label("countries"),
+                array([Movie.release_year.op("/")(10) * 10]).label("decades"),
+                array([cast(func.floor(Movie.imdb_rating), Integer)]).label("ratings"),
+            )
+            .subquery("m")
+        )
+        values = (
+            func.unnest(
+                movies.c.genres,
+                movies.c.languages,
+                movies.c.countries,
+                movies.c.decades,
+                movies.c.ratings,
+            )
+            .table_valued(*FACETS, with_ordinality="n")
+            .render_derived(name="f")
+        )
+        keys = [values.c[facet] for facet in FACETS]
+
+        grouping = func.grouping(*keys)
+        facet = case(FACET_GROUPINGS, value=grouping, else_="total")
+        value = func.coalesce(*keys[:3], cast(keys[3], Text), cast(keys[4], Text), "")
+        count = case(
+            (grouping == TOTAL_GROUPING, func.count().filter(values.c.n == 1)),
+            else_=func.count(),
+        )
+
+        facets = (
+            db.query(facet.label("facet"), value.label("value"), count.label("count"))
+            .select_from(movies)
+            .join(values, true())
+            .group_by(func.grouping_sets(*keys, tuple_()))
+            .subquery("facets")
+        )
+        return (
+            db.query(facets.c.facet, facets.c.value, facets.c.count)
+            # Drop the NULL padding rows
+            .filter((facets.c.value != "") | (facets.c.facet == "total"))
+            .order_by(facets.c.facet, facets.c.count.desc(), facets.c.value)
+            .all()
+        )
+
+    def facets_from_view(self, db: Session) -> List[tuple]:
+        """Unfiltered ``facets`` rows precomputed in the movie_facets view"""
+        return db.execute(
+            text(
+                "SELECT facet, value, count FROM movie_facets "
+                "ORDER BY facet, count DESC, value"
+            )
+        ).fetchall()
+
+    def refresh_facets_view(self, db: Session):
+        """Recompute movie_facets without blocking readers"""
+        db.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY movie_facets"))
+        db.commit()
+
+    def sync_quantized_indexes(self, db: Session, mode: str):
+        """Create the compact HNSW indexes ``mode`` searches and drop the
+        other mode's, which would only add size and write cost"""
+        for index_mode, (suffix, expression) in QUANTIZED_INDEXES.items():
+            for vector_type in ("title", "synopsis", "combined"):
+                column = f"{vector_type}_vector"
+                index = f"idx_movies_{column}_{suffix}"
+                if index_mode == mode:
+                    expression_sql = expression.format(
+                        column=column, dim=settings.vector_dimension
+                    )
+                    db.execute(
+                        text(
+                            f"CREATE INDEX IF NOT EXISTS {index} ON movies "
+                            f"USING hnsw ({expression_sql})"
+                        )
+                    )
+                else:
+                    db.execute(text(f"DROP INDEX IF EXISTS {index}"))
+        db.commit()
+
+    def count(self, db: Session, **filters) -> int:
+        """Exact number of movies matching the ``get_multi`` filters"""
+        if not filters:
+            return db.query(Movie).count()
+        return self._list_query(db, **filters).order_by(None).count()
+
+    def estimate_count(self, db: Session, **filters) -> int:
+        """Planner estimate of the number of movies matching the filters.
+
+        Unfiltered listings read ``pg_class.reltuples`` (kept by ANALYZE and
+        autovacuum); filtered ones take the row estimate of EXPLAIN. Neither
+        scans the table.
+        """
+        if not any(filters.get(name) for name in LISTING_FILTERS):
+            reltuples = db.execute(
+                text(
+                    "SELECT reltuples::bigint FROM pg_class "
+                    "WHERE oid = 'movies'::regclass"
+                )
+            ).scalar()
+            # -1 (or 0 before PostgreSQL 14) until the table is first analyzed
+            if reltuples and reltuples > 0:
+                return int(reltuples)
+            return self.count(db)
+
+        plan = self.explain(db, self._list_query(db, **filters))
+        return int(plan["Plan"]["Plan Rows"])
+
+    def explain(self, db: Session, query) -> dict:
+        """EXPLAIN (FORMAT JSON) output of an ORM query, without running it"""
+        compiled = query.statement.compile(dialect=db.get_bind().dialect)
+        plan = (
+            db.connection()
+            .exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params)
+            .scalar()
+        )
+        return plan[0]
 
 
 movie_crud = MovieCRUD()
@@ -1,53 +1,397 @@
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from uuid import UUID
+from types import SimpleNamespace
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from uuid import UUID, uuid4
+import numpy as np
+import csv
+import io
+import json
 import logging
 
-from ..crud.movie import movie_crud
+from ..core.cache import TTLCache
+from ..core.config import settings
+from ..core.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from ..crud.movie import movie_crud, LISTING_FILTERS
+from ..crud.embedding_job import embedding_job_crud
+from ..models.movie import content_hash
 from ..schemas.movie import (
     MovieCreate,
     MovieUpdate,
     MovieResponse,
+    MoviePartialResponse,
+    MovieBulkItemResult,
+    MovieBulkResponse,
+    MovieUpsertResponse,
     MovieSearchResponse,
+    MovieFacetsResponse,
+    FacetCount,
+    AutocompleteSuggestion,
+    HybridSearchResult,
     SimilarMovieResponse,
+    SimilarMoviesBatchResponse,
+    SimilarMoviesResult,
+    MOVIE_FIELDS,
+    parse_fields,
 )
-from ..services.vector_service import vector_service
+from ..services.vector_service import vector_service, movie_vector_texts
+from ..services.ann_index import ann_index_service
+from ..services.autocomplete import autocomplete_service
+from ..services.neighbor_service import neighbor_service
 
 logger = logging.getLogger(__name__)
 
+# movie_crud facet name: MovieFacetsResponse field
+FACET_FIELDS = {
+    "genre": "genres",
+    "decade": "decades",
+    "language": "languages",
+    "country": "countries",
+    "rating": "ratings",
+}
+
+
+VECTOR_COLUMNS = ("title_vector", "synopsis_vector", "combined_vector")
+
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in e['loc'])}: {e['msg']}"
+        for e in error.errors()
+    )
+
 
 class MovieHandler:
 
+    def __init__(self):
+        # Listing totals keyed by filter set; cleared on local writes, other
+        # workers' writes show up once the TTL expires
+        self.count_cache = TTLCache(
+            max_size=settings.count_cache_size, ttl=settings.count_cache_ttl
+        )
+        # Facet counts keyed by filter set, cleared the same way
+        self.facets_cache = TTLCache(
+            max_size=settings.facets_cache_size, ttl=settings.facets_cache_ttl
+        )
+
+    def _generate_vectors(
+        self,
+        title: Optional[str],
+        synopsis: Optional[str],
+        title_changed: bool = True,
+        synopsis_changed: bool = True,
+    ) -> Dict[str, np.ndarray]:
+        """Embed title, synopsis and title + synopsis in one model batch"""
+        texts = movie_vector_texts(title, synopsis, title_changed, synopsis_changed)
+        return vector_service.generate_movie_vectors([texts])[0]
+
+    def _partial(self, movie, fields: Sequence[str]) -> MoviePartialResponse:
+        """Serialize only ``fields`` of ``movie``, the columns that were loaded"""
+        return MoviePartialResponse.model_validate(
+            {field: getattr(movie, field, None) for field in fields}
+        )
+
+    def _snapshot(self, db_movie, vectors: Dict[str, Any]) -> SimpleNamespace:
+        """The response fields of ``db_movie`` plus ``vectors``, for use after
+        commit has expired ``db_movie``"""
+        return SimpleNamespace(
+            **{field: getattr(db_movie, field) for field in MOVIE_FIELDS}, **vectors
+        )
+
     def create_movie(self, db: Session, movie_data: MovieCreate) -> MovieResponse:
         """Create a new movie with vector embeddings"""
         try:
-            # Create movie
-            db_movie = movie_crud.create(db, movie_data)
+            vectors = {}
+            if settings.embedding_mode == "async":
+                # Vectors are filled in later by the embedding worker
+                columns = {}
+            else:
+                # Embed first so the movie is inserted together with its vectors
+                vectors = self._generate_vectors(movie_data.title, movie_data.synopsis)
+                columns = {**vectors, "embedding_status": "ready"}
 
-            # Generate and store vector embeddings
-            if movie_data.title:
-                title_vector = vector_service.generate_embedding(movie_data.title)
-                db_movie.title_vector = title_vector
+            db_movie = movie_crud.create(db, movie_data, **columns)
+            if settings.embedding_mode == "async":
+                embedding_job_crud.enqueue(db, db_movie.id)
+            else:
+                neighbor_service.queue_refresh(db, [db_movie.id])
 
-            if movie_data.synopsis:
-                synopsis_vector = vector_service.generate_embedding(movie_data.synopsis)
-                db_movie.synopsis_vector = synopsis_vector
+            movie = self._snapshot(
+                db_movie, {column: vectors.get(column) for column in VECTOR_COLUMNS}
+            )
+            db.commit()
+            self.count_cache.invalidate()
+            self.facets_cache.invalidate()
+            ann_index_service.upsert_movie(movie)
+            autocomplete_service.upsert_movie(movie)
 
-            # Combined vector for title + synopsis
-            if movie_data.title and movie_data.synopsis:
-                combined_text = f"{movie_data.title} {movie_data.synopsis}"
-                combined_vector = vector_service.generate_embedding(combined_text)
-                db_movie.combined_vector = combined_vector
+            return MovieResponse.model_validate(movie)
+        except Exception as e:
+            logger.error(f"Error creating movie: {e}")
+            db.rollback()
+            raise
 
+    def _validate_items(
+        self, items: List[Dict[str, Any]]
+    ) -> Tuple[Dict[int, MovieBulkItemResult], List[Tuple[int, MovieCreate]]]:
+        """Error results for invalid items, and (index, movie) for valid ones"""
+        results: Dict[int, MovieBulkItemResult] = {}
+        valid: List[Tuple[int, MovieCreate]] = []
+        for index, item in enumerate(items):
+            try:
+                valid.append((index, MovieCreate.model_validate(item)))
+            except ValidationError as e:
+                results[index] = MovieBulkItemResult(
+                    index=index, status="error", error=_validation_message(e)
+                )
+        return results, valid
+
+    def bulk_create_movies(
+        self, db: Session, items: List[Dict[str, Any]]
+    ) -> MovieBulkResponse:
+        """Validate, embed and insert many movies in one transaction.
+
+        Items that fail validation, or whose imdb_id / tmdb_id is already taken
+        (stored, or earlier in the batch), are reported and skipped. The rest
+        are embedded in one model batch and inserted with multi-row INSERTs.
+        """
+        results, valid = self._validate_items(items)
+
+        # One lookup for the unique external ids of the whole batch
+        taken_imdb, taken_tmdb = movie_crud.existing_external_ids(
+            db,
+            [movie.imdb_id for _, movie in valid if movie.imdb_id],
+            [movie.tmdb_id for _, movie in valid if movie.tmdb_id is not None],
+        )
+        accepted: List[Tuple[int, MovieCreate]] = []
+        for index, movie in valid:
+            if movie.imdb_id and movie.imdb_id in taken_imdb:
+                error = f"imdb_id {movie.imdb_id} already exists"
+            elif movie.tmdb_id is not None and movie.tmdb_id in taken_tmdb:
+                error = f"tmdb_id {movie.tmdb_id} already exists"
+            else:
+                accepted.append((index, movie))
+                if movie.imdb_id:
+                    taken_imdb.add(movie.imdb_id)
+                if movie.tmdb_id is not None:
+                    taken_tmdb.add(movie.tmdb_id)
+                continue
+            results[index] = MovieBulkItemResult(
+                index=index, status="error", error=error
+            )
+
+        # Omitted fields are stored as NULL, as POST /movies/ does
+        # (exclude_unset dumps), but every row still gets every key
+        rows = [
+            {
+                "id": uuid4(),
+                **dict.fromkeys(MovieCreate.model_fields),
+                **movie.model_dump(exclude_unset=True),
+            }
+            for _, movie in accepted
+        ]
+        embed_now = settings.embedding_mode != "async"
+        if embed_now and rows:
+            all_vectors = vector_service.generate_movie_vectors(
+                [movie_vector_texts(m.title, m.synopsis) for _, m in accepted]
+            )
+            for row, vectors in zip(rows, all_vectors):
+                row.update(vectors)
+
+        # Same keys in every row, so the INSERTs batch as multi-row VALUES
+        status = "ready" if embed_now else "pending"
+        rows = [
+            {**dict.fromkeys(VECTOR_COLUMNS), **row, "embedding_status": status}
+            for row in rows
+        ]
+
+        try:
+            # A concurrent insert may still have taken an external id since
+            # the lookup above; those rows are skipped and reported below
+            inserted = movie_crud.create_many(db, rows)
+            movie_ids = [row["id"] for row in rows if row["id"] in inserted]
+            if embed_now:
+                neighbor_service.queue_refresh(db, movie_ids)
+            else:
+                embedding_job_crud.enqueue_many(db, movie_ids)
             db.commit()
-            db.refresh(db_movie)
+        except Exception as e:
+            logger.error(f"Error bulk creating movies: {e}")
+            db.rollback()
+            raise
 
-            return MovieResponse.model_validate(db_movie)
+        if movie_ids:
+            self.count_cache.invalidate()
+            self.facets_cache.invalidate()
+        for (index, item), row in zip(accepted, rows):
+            if row["id"] not in inserted:
+                results[index] = MovieBulkItemResult(
+                    index=index,
+                    status="error",
+                    error=(
+                        f"imdb_id {item.imdb_id} or tmdb_id {item.tmdb_id} "
+                        f"already exists"
+                    ),
+                )
+                continue
+            movie = SimpleNamespace(**row)
+            ann_index_service.upsert_movie(movie)
+            autocomplete_service.upsert_movie(movie)
+            results[index] = MovieBulkItemResult(
+                index=index, status="created", id=row["id"]
+            )
+
+        return MovieBulkResponse(
+            created=len(movie_ids),
+            failed=len(items) - len(movie_ids),
+            results=[results[index] for index in range(len(items))],
+        )
+
+    def upsert_movies(
+        self, db: Session, items: List[Dict[str, Any]]
+    ) -> MovieUpsertResponse:
+        """Insert movies, or replace the stored movies with the same imdb_id.
+
+        Every field of a stored movie is replaced, fields missing from the item
+        included. Movies are only re-embedded when the content hash of their
+        title and synopsis changed, and movies with no changes at all are not
+        written. Each item is reported as inserted, updated, unchanged or error.
+        """
+        results, valid = self._validate_items(items)
+
+        # tmdb_id is unique too, but only imdb_id can be the ON CONFLICT target
+        tmdb_owners = movie_crud.imdb_ids_by_tmdb_id(
+            db, [movie.tmdb_id for _, movie in valid if movie.tmdb_id is not None]
+        )
+        batch_tmdb_ids = set()
+        accepted: Dict[str, Tuple[int, MovieCreate]] = {}
+        for index, movie in valid:
+            if not movie.imdb_id:
+                error = "imdb_id is required to upsert"
+            elif movie.imdb_id in accepted:
+                error = f"imdb_id {movie.imdb_id} appears more than once"
+            elif movie.tmdb_id is not None and movie.tmdb_id in batch_tmdb_ids:
+                error = f"tmdb_id {movie.tmdb_id} appears more than once"
+            elif tmdb_owners.get(movie.tmdb_id, movie.imdb_id) != movie.imdb_id:
+                error = f"tmdb_id {movie.tmdb_id} belongs to another movie"
+            else:
+                accepted[movie.imdb_id] = (index, movie)
+                if movie.tmdb_id is not None:
+                    batch_tmdb_ids.add(movie.tmdb_id)
+                continue
+            results[index] = MovieBulkItemResult(
+                index=index, status="error", error=error
+            )
+
+        # One lookup decides which movies need new embeddings
+        stored = movie_crud.content_hashes(db, list(accepted))
+        changed = {
+            imdb_id
+            for imdb_id, (_, movie) in accepted.items()
+            if imdb_id not in stored
+            or stored[imdb_id][1] != content_hash(movie.title, movie.synopsis)
+        }
+
+        columns = [field for field in MovieCreate.model_fields if field != "imdb_id"]
+        rows = {
+            imdb_id: {
+                "id": uuid4(),
+                **dict.fromkeys(VECTOR_COLUMNS),
+                **movie.model_dump(),
+                "embedding_status": "pending",
+            }
+            for imdb_id, (_, movie) in accepted.items()
+        }
+        embed_now = settings.embedding_mode != "async"
+        if embed_now and changed:
+            embedded = sorted(changed)
+            all_vectors = vector_service.generate_movie_vectors(
+                [
+                    movie_vector_texts(rows[i]["title"], rows[i]["synopsis"])
+                    for i in embedded
+                ]
+            )
+            for imdb_id, vectors in zip(embedded, all_vectors):
+                rows[imdb_id].update(vectors, embedding_status="ready")
+        embedding_columns = ["embedding_status"]
+        if embed_now:
+            embedding_columns += VECTOR_COLUMNS
+
+        try:
+            written = {
+                imdb_id: (movie_id, inserted, status)
+                for movie_id, imdb_id, inserted, status in movie_crud.upsert_many(
+                    db, list(rows.values()), columns, embedding_columns
+                )
+            }
+            # The database decides whether the text changed: rows written
+            # with the "pending" status sent for movies not embedded above
+            # need embeddings, even if the hash lookup missed the change
+            pending = [
+                i for i, (_, _, status) in written.items() if status == "pending"
+            ]
+            if embed_now and pending:
+                all_vectors = vector_service.generate_movie_vectors(
+                    [
+                        movie_vector_texts(rows[i]["title"], rows[i]["synopsis"])
+                        for i in pending
+                    ]
+                )
+                for imdb_id, vectors in zip(pending, all_vectors):
+                    rows[imdb_id].update(vectors, embedding_status="ready")
+                movie_crud.update_vectors(
+                    db,
+                    [
+                        {
+                            "id": written[i][0],
+                            **{column: rows[i][column] for column in VECTOR_COLUMNS},
+                            "embedding_status": "ready",
+                        }
+                        for i in pending
+                    ],
+                )
+                changed |= set(pending)
+            reembedded = [written[i][0] for i in changed if i in written]
+            if embed_now:
+                neighbor_service.queue_refresh(db, reembedded)
+            else:
+                embedding_job_crud.enqueue_many(db, [written[i][0] for i in pending])
+            db.commit()
         except Exception as e:
-            logger.error(f"Error creating movie: {e}")
+            logger.error(f"Error upserting movies: {e}")
             db.rollback()
             raise
 
+        if written:
+            self.count_cache.invalidate()
+            self.facets_cache.invalidate()
+        for imdb_id, (index, _) in accepted.items():
+            if imdb_id not in written:
+                stored_id = stored.get(imdb_id, (None, None))[0]
+                results[index] = MovieBulkItemResult(
+                    index=index, status="unchanged", id=stored_id
+                )
+                continue
+            movie_id, inserted, _ = written[imdb_id]
+            movie = SimpleNamespace(**{**rows[imdb_id], "id": movie_id})
+            if embed_now and imdb_id in changed:
+                ann_index_service.upsert_movie(movie)
+            autocomplete_service.upsert_movie(movie)
+            results[index] = MovieBulkItemResult(
+                index=index,
+                status="inserted" if inserted else "updated",
+                id=movie_id,
+            )
+
+        statuses = [results[index].status for index in range(len(items))]
+        return MovieUpsertResponse(
+            inserted=statuses.count("inserted"),
+            updated=statuses.count("updated"),
+            unchanged=statuses.count("unchanged"),
+            failed=statuses.count("error"),
+            results=[results[index] for index in range(len(items))],
+        )
+
     def get_movie(self, db: Session, movie_id: UUID) -> Optional[MovieResponse]:
         """Get a movie by ID"""
         db_movie = movie_crud.get(db, movie_id)
@@ -65,34 +409,285 @@ class MovieHandler:
         director: Optional[str] = None,
         min_rating: Optional[float] = None,
         max_rating: Optional[float] = None,
+        title: Optional[str] = None,
+        fuzzy: bool = False,
+        similarity_threshold: Optional[float] = None,
+        cursor: Optional[str] = None,
+        count: str = "exact",
+        year_from: Optional[int] = None,
+        year_to: Optional[int] = None,
+        sort: str = "title",
+        order: str = "asc",
+        fields: Optional[str] = None,
     ) -> MovieSearchResponse:
-        """Get movies with filtering"""
-        movies = movie_crud.get_multi(
-            db, skip, limit, genre, year, director, min_rating, max_rating
+        """Get movies with filtering.
+
+        Movies are ordered by ``sort`` (``order`` asc or desc) with id as
+        tie-break. With ``cursor`` (the ``next_cursor`` of a previous page) the
+        page is fetched by keyset seek instead of ``skip``. ``total`` counts the movies
+        matching the filters, either exactly or, with ``count="estimated"``,
+        from planner statistics.
+
+        ``fields`` (see ``parse_fields``) picks the columns loaded and returned
+        per movie; by default a slim listing projection.
+        """
+        selected = parse_fields(fields)
+        descending = order == "desc"
+        # Cursors only replay against the same ordering
+        cursor_kind = f"movies:{sort}:{order}"
+        after = decode_cursor(cursor, cursor_kind) if cursor else None
+        if after is not None and fuzzy:
+            raise InvalidCursorError(
+                "Cursor pagination is not available for fuzzy filters"
+            )
+
+        filters = dict(
+            genre=genre,
+            year=year,
+            director=director,
+            min_rating=min_rating,
+            max_rating=max_rating,
+            title=title,
+            fuzzy=fuzzy,
+            similarity_threshold=similarity_threshold,
+            year_from=year_from,
+            year_to=year_to,
         )
-        total = movie_crud.count(db)
+        count_key = ("movies", count, *sorted(filters.items()))
+        total = self.count_cache.get(count_key)
+        cached = total is not None
+
+        if not cached and count == "exact" and after is None:
+            # Count in the same query with a window function
+            movies, total = movie_crud.get_multi_with_total(
+                db,
+                skip,
+                limit,
+                sort=sort,
+                descending=descending,
+                fields=selected,
+                **filters,
+            )
+        else:
+            movies = movie_crud.get_multi(
+                db,
+                skip,
+                limit,
+                after=after,
+                sort=sort,
+                descending=descending,
+                fields=selected,
+                **filters,
+            )
+
+        if total is None:
+            if count == "estimated":
+                total = movie_crud.estimate_count(db, **filters)
+            else:
+                total = movie_crud.count(db, **filters)
+        if not cached:
+            self.count_cache.set(count_key, total)
+
+        next_cursor = None
+        if len(movies) == limit and not fuzzy:
+            last = movies[-1]
+            next_cursor = encode_cursor(
+                cursor_kind,
+                [movie_crud.sort_value(last, sort, descending), last.id],
+            )
 
         return MovieSearchResponse(
-            movies=[MovieResponse.model_validate(movie) for movie in movies],
+            movies=[self._partial(movie, selected) for movie in movies],
             total=total,
             page=skip // limit + 1,
             size=len(movies),
             total_pages=(total + limit - 1) // limit,
+            next_cursor=next_cursor,
         )
 
     def search_movies(
-        self, db: Session, query: str, skip: int = 0, limit: int = 100
+        self,
+        db: Session,
+        query: str,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None,
     ) -> MovieSearchResponse:
-        """Full-text search for movies"""
-        movies = movie_crud.search(db, query, skip, limit)
+        """Full-text search for movies, returning the ``fields`` of each match"""
+        selected = parse_fields(fields)
+        after = decode_cursor(cursor, "search") if cursor else None
+        count_key = ("search", query)
+        total = self.count_cache.get(count_key)
+        with_total = total is None and after is None
+
+        results = movie_crud.search_ranked(
+            db,
+            query,
+            skip,
+            limit,
+            after=after,
+            with_total=with_total,
+            fields=selected,
+        )
+        if total is None:
+            if with_total and results:
+                total = results[0].total
+            else:
+                total = movie_crud.search_count(db, query)
+            self.count_cache.set(count_key, total)
+
+        next_cursor = None
+        if len(results) == limit:
+            last = results[-1]
+            next_cursor = encode_cursor("search", [last.rank, last.Movie.id])
 
         return MovieSearchResponse(
-            movies=[MovieResponse.model_validate(movie) for movie in movies],
-            total=len(movies),
+            movies=[self._partial(row.Movie, selected) for row in results],
+            total=total,
             page=skip // limit + 1,
-            size=len(movies),
-            total_pages=1,  # Simplified for search results
+            size=len(results),
+            total_pages=(total + limit - 1) // limit,
+            next_cursor=next_cursor,
+        )
+
+    def get_facets(
+        self,
+        db: Session,
+        genre: Optional[str] = None,
+        year: Optional[int] = None,
+        director: Optional[str] = None,
+        min_rating: Optional[float] = None,
+        max_rating: Optional[float] = None,
+        title: Optional[str] = None,
+        fuzzy: bool = False,
+        similarity_threshold: Optional[float] = None,
+        year_from: Optional[int] = None,
+        year_to: Optional[int] = None,
+    ) -> MovieFacetsResponse:
+        """Counts per genre, decade, language, country and rating bucket.
+
+        Takes the ``get_movies`` filters. Unfiltered counts come from the
+        movie_facets materialized view when FACETS_MATERIALIZED_VIEW is set.
+        """
+        filters = dict(
+            genre=genre,
+            year=year,
+            director=director,
+            min_rating=min_rating,
+            max_rating=max_rating,
+            title=title,
+            fuzzy=fuzzy,
+            similarity_threshold=similarity_threshold,
+            year_from=year_from,
+            year_to=year_to,
         )
+        cache_key = tuple(sorted(filters.items()))
+        facets = self.facets_cache.get(cache_key)
+        if facets is not None:
+            return facets
+
+        unfiltered = not any(filters.get(name) for name in LISTING_FILTERS)
+        if unfiltered and settings.facets_materialized_view:
+            rows = movie_crud.facets_from_view(db)
+        else:
+            rows = movie_crud.facets(db, **filters)
+
+        facets = MovieFacetsResponse()
+        for facet, value, count in rows:
+            if facet == "total":
+                facets.total = count
+            else:
+                getattr(facets, FACET_FIELDS[facet]).append(
+                    FacetCount(value=value, count=count)
+                )
+
+        self.facets_cache.set(cache_key, facets)
+        return facets
+
+    def export_movies(
+        self,
+        db: Session,
+        format: str = "ndjson",
+        fields: Optional[str] = None,
+        sort: str = "title",
+        order: str = "asc",
+        **filters,
+    ) -> Iterator[str]:
+        """The movies matching the ``get_movies`` filters as NDJSON or CSV.
+
+        ``fields`` is validated up front (all fields by default); the returned
+        iterator then reads and serializes one batch of rows at a time, each
+        chunk holding EXPORT_BATCH_SIZE movies.
+        """
+        selected = parse_fields(fields, default=MOVIE_FIELDS)
+        movies = movie_crud.stream(
+            db,
+            fields=selected,
+            batch_size=settings.export_batch_size,
+            sort=sort,
+            descending=order == "desc",
+            **filters,
+        )
+        if format == "csv":
+            return self._export_csv(movies, selected)
+        return self._export_ndjson(movies, selected)
+
+    def _export_ndjson(self, movies: Iterable, fields: Sequence[str]) -> Iterator[str]:
+        lines = []
+        for movie in movies:
+            partial = self._partial(movie, fields)
+            lines.append(partial.model_dump_json(exclude_unset=True) + "\n")
+            if len(lines) >= settings.export_batch_size:
+                yield "".join(lines)
+                lines = []
+        if lines:
+            yield "".join(lines)
+
+    def _export_csv(self, movies: Iterable, fields: Sequence[str]) -> Iterator[str]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(fields)
+        rows = 0
+        for movie in movies:
+            values = self._partial(movie, fields).model_dump(
+                mode="json", exclude_unset=True
+            )
+            # Lists (genres, cast, ...) become JSON inside their cell
+            writer.writerow(
+                [
+                    json.dumps(value) if isinstance(value, (list, dict)) else value
+                    for value in (values.get(field) for field in fields)
+                ]
+            )
+            rows += 1
+            if rows % settings.export_batch_size == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    def autocomplete(
+        self, db: Session, prefix: str, limit: int = 10
+    ) -> List[AutocompleteSuggestion]:
+        """As-you-type suggestions from the in-memory prefix index"""
+        if autocomplete_service.ready:
+            return [
+                AutocompleteSuggestion(**suggestion)
+                for suggestion in autocomplete_service.suggest(prefix, limit)
+            ]
+
+        # Index not loaded in this worker: fall back to title prefixes in SQL
+        return [
+            AutocompleteSuggestion(
+                text=row.title,
+                type="title",
+                movie_id=row.id,
+                imdb_rating=row.imdb_rating,
+            )
+            for row in movie_crud.title_prefix_search(db, prefix.strip(), limit)
+        ]
 
     def find_similar_movies(
         self,
@@ -102,6 +697,28 @@ class MovieHandler:
         vector_type: str = "combined",
     ) -> List[SimilarMovieResponse]:
         """Find similar movies using vector similarity"""
+        # Longer lists than the precomputed top-K need a live search
+        if neighbor_service.enabled and limit <= settings.neighbor_top_k:
+            neighbours = neighbor_service.get_neighbors(
+                db, movie_id, limit, vector_type
+            )
+            if neighbours:
+                return [
+                    SimilarMovieResponse(
+                        movie=MovieResponse.model_validate(movie),
+                        similarity_score=1.0 - distance,
+                    )
+                    for movie, distance in neighbours
+                ]
+
+        if ann_index_service.ready:
+            similar = self._find_similar_movies_in_memory(
+                db, movie_id, limit, vector_type
+            )
+            # Movies this process has not indexed yet fall back to pgvector
+            if similar is not None:
+                return similar
+
         # Get the reference movie
         reference_movie = movie_crud.get(db, movie_id)
         if not reference_movie:
@@ -132,39 +749,224 @@ class MovieHandler:
 
         return similar_movies[:limit]
 
+    def _in_memory_neighbours(
+        self, movie_id: UUID, limit: int, vector_type: str
+    ) -> Optional[List[Tuple[UUID, float]]]:
+        """(movie_id, distance) neighbours from the in-process HNSW index.
+
+        None when the movie is not in this process's index (yet).
+        """
+        reference_vector = ann_index_service.get_vector(movie_id, vector_type)
+        if reference_vector is None:
+            return None
+
+        return [
+            (neighbour_id, distance)
+            for neighbour_id, distance in ann_index_service.search(
+                reference_vector, limit + 1, vector_type  # +1 to exclude self
+            )
+            if neighbour_id != movie_id
+        ][:limit]
+
+    def _find_similar_movies_in_memory(
+        self, db: Session, movie_id: UUID, limit: int, vector_type: str
+    ) -> Optional[List[SimilarMovieResponse]]:
+        """Find similar movies using the in-process HNSW index (None if the
+        movie is not indexed)"""
+        neighbours = self._in_memory_neighbours(movie_id, limit, vector_type)
+        if neighbours is None:
+            return None
+
+        movies = {
+            movie.id: movie
+            for movie in movie_crud.get_many(db, [n[0] for n in neighbours])
+        }
+
+        return [
+            SimilarMovieResponse(
+                movie=MovieResponse.model_validate(movies[neighbour_id]),
+                similarity_score=1.0 - distance,
+            )
+            for neighbour_id, distance in neighbours
+            if neighbour_id in movies
+        ]
+
+    def find_similar_movies_batch(
+        self,
+        db: Session,
+        movie_ids: List[UUID],
+        limit: int = 10,
+        vector_type: str = "combined",
+    ) -> SimilarMoviesBatchResponse:
+        """Find similar movies for many reference movies in one batched query"""
+        movie_ids = list(dict.fromkeys(movie_ids))
+        similar = {str(movie_id): [] for movie_id in movie_ids}
+
+        # Movies missing from the in-process index are searched with pgvector
+        missing = movie_ids
+        if ann_index_service.ready:
+            neighbours = {
+                movie_id: self._in_memory_neighbours(movie_id, limit, vector_type)
+                for movie_id in movie_ids
+            }
+            missing = [m for m, found in neighbours.items() if found is None]
+            neighbours = {m: found for m, found in neighbours.items() if found}
+            movies = {
+                movie.id: movie
+                for movie in movie_crud.get_many(
+                    db, list({n[0] for found in neighbours.values() for n in found})
+                )
+            }
+            for movie_id, found in neighbours.items():
+                similar[str(movie_id)] = [
+                    SimilarMovieResponse(
+                        movie=MovieResponse.model_validate(movies[neighbour_id]),
+                        similarity_score=1.0 - distance,
+                    )
+                    for neighbour_id, distance in found
+                    if neighbour_id in movies
+                ]
+
+        if missing:
+            for result in movie_crud.vector_search_batch(
+                db, missing, limit, vector_type
+            ):
+                similar[str(result.reference_id)].append(
+                    SimilarMovieResponse(
+                        movie=MovieResponse.model_validate(result),
+                        similarity_score=1.0 - result.distance,
+                    )
+                )
+
+        return SimilarMoviesBatchResponse(
+            results=[
+                SimilarMoviesResult(movie_id=movie_id, similar=similar[str(movie_id)])
+                for movie_id in movie_ids
+            ]
+        )
+
+    def semantic_search(
+        self,
+        db: Session,
+        query: str,
+        limit: int = 10,
+        vector_type: str = "combined",
+        genre: Optional[str] = None,
+        year: Optional[int] = None,
+        min_rating: Optional[float] = None,
+        max_rating: Optional[float] = None,
+    ) -> List[SimilarMovieResponse]:
+        """Free-text semantic search: embed the query and rank movies by it"""
+        query_vector = vector_service.generate_query_embedding(query)
+        if not any(query_vector):
+            return []
+
+        results = movie_crud.vector_search(
+            db,
+            query_vector,
+            limit,
+            vector_type,
+            genre=genre,
+            year=year,
+            min_rating=min_rating,
+            max_rating=max_rating,
+        )
+
+        return [
+            SimilarMovieResponse(
+                movie=MovieResponse.model_validate(result),
+                similarity_score=1.0 - result.distance,
+            )
+            for result in results
+        ]
+
+    def hybrid_search(
+        self,
+        db: Session,
+        query: str,
+        limit: int = 10,
+        vector_type: str = "combined",
+        lexical_weight: float = 1.0,
+        semantic_weight: float = 1.0,
+    ) -> List[HybridSearchResult]:
+        """Full-text and semantic search fused with reciprocal rank fusion"""
+        query_vector = (
+            vector_service.generate_query_embedding(query) if semantic_weight else None
+        )
+        results = movie_crud.hybrid_search(
+            db,
+            query,
+            query_vector,
+            limit,
+            vector_type,
+            lexical_weight,
+            semantic_weight,
+        )
+
+        return [
+            HybridSearchResult(
+                movie=MovieResponse.model_validate(result),
+                score=result.rrf_score,
+                lexical_score=result.lexical_score,
+                lexical_rank=result.lexical_rank,
+                semantic_score=result.semantic_score,
+                semantic_rank=result.semantic_rank,
+            )
+            for result in results
+        ]
+
     def update_movie(
         self, db: Session, movie_id: UUID, movie_update: MovieUpdate
     ) -> Optional[MovieResponse]:
         """Update a movie"""
         try:
-            db_movie = movie_crud.update(db, movie_id, movie_update)
-            if not db_movie:
-                return None
-
             # Update vector embeddings if relevant fields changed
             update_data = movie_update.model_dump(exclude_unset=True)
+            title_changed = "title" in update_data
+            synopsis_changed = "synopsis" in update_data
+            text_changed = title_changed or synopsis_changed
 
-            if "title" in update_data and db_movie.title:
-                title_vector = vector_service.generate_embedding(db_movie.title)
-                db_movie.title_vector = title_vector
+            vectors, columns = {}, {}
+            if text_changed and settings.embedding_mode == "async":
+                columns["embedding_status"] = "pending"
+            elif text_changed:
+                # Embed first so the update writes the vectors too. The
+                # combined vector needs the stored text that is not changing
+                if title_changed and synopsis_changed:
+                    title, synopsis = update_data["title"], update_data["synopsis"]
+                else:
+                    stored = movie_crud.get_text(db, movie_id)
+                    if not stored:
+                        return None
+                    title = update_data.get("title", stored.title)
+                    synopsis = update_data.get("synopsis", stored.synopsis)
+                vectors = self._generate_vectors(
+                    title,
+                    synopsis,
+                    title_changed=title_changed,
+                    synopsis_changed=synopsis_changed,
+                )
+                columns = {**vectors, "embedding_status": "ready"}
 
-            if "synopsis" in update_data and db_movie.synopsis:
-                synopsis_vector = vector_service.generate_embedding(db_movie.synopsis)
-                db_movie.synopsis_vector = synopsis_vector
+            db_movie = movie_crud.update(db, movie_id, movie_update, **columns)
+            if not db_movie:
+                return None
 
-            if (
-                ("title" in update_data or "synopsis" in update_data)
-                and db_movie.title
-                and db_movie.synopsis
-            ):
-                combined_text = f"{db_movie.title} {db_movie.synopsis}"
-                combined_vector = vector_service.generate_embedding(combined_text)
-                db_movie.combined_vector = combined_vector
+            if text_changed and settings.embedding_mode == "async":
+                embedding_job_crud.enqueue(db, db_movie.id)
+            elif text_changed:
+                neighbor_service.queue_refresh(db, [db_movie.id])
 
+            movie = self._snapshot(db_movie, vectors)
             db.commit()
-            db.refresh(db_movie)
+            self.count_cache.invalidate()
+            self.facets_cache.invalidate()
+            if text_changed:
+                ann_index_service.upsert_movie(movie)
+            if {"title", "director", "cast", "imdb_rating"} & update_data.keys():
+                autocomplete_service.upsert_movie(movie)
 
-            return MovieResponse.model_validate(db_movie)
+            return MovieResponse.model_validate(movie)
         except Exception as e:
             logger.error(f"Error updating movie: {e}")
             db.rollback()
@@ -172,7 +974,17 @@ class MovieHandler:
 
     def delete_movie(self, db: Session, movie_id: UUID) -> bool:
         """Delete a movie"""
-        return movie_crud.delete(db, movie_id)
+        # Queued in the delete's transaction, before the cascade drops the lists
+        neighbor_service.queue_dependents(db, movie_id)
+        deleted = movie_crud.delete(db, movie_id)
+        if deleted:
+            self.count_cache.invalidate()
+            self.facets_cache.invalidate()
+            ann_index_service.remove_movie(movie_id)
+            autocomplete_service.remove_movie(movie_id)
+        else:
+            db.rollback()
+        return deleted
 
 
 movie_handler = MovieHandler()
@@ -1,9 +1,67 @@
-from sqlalchemy import Column, Integer, String, Text, Float, Date, JSON, ARRAY
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import (
+    Column,
+    Computed,
+    Index,
+    Integer,
+    String,
+    Text,
+    Float,
+    Date,
+    DateTime,
+    JSON,
+    func,
+    text,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, UUID, TSVECTOR
+from sqlalchemy.orm import deferred
 from pgvector.sqlalchemy import Vector
 from ..core.database import Base
+from datetime import date
+from typing import Optional
+import hashlib
 import uuid
 
+# Cast contributes only member names, not character names. Migrations copy
+# this and the expressions below; tests/test_migrations.py keeps them in sync.
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(director, '')), 'B') || "
+    "setweight(jsonb_to_tsvector('english', jsonb_path_query_array("
+    "coalesce(\"cast\", '[]'::json)::jsonb, '$[*].name'), '[\"string\"]'), 'B') || "
+    "setweight(to_tsvector('english', coalesce(synopsis, '')), 'C')"
+)
+
+# md5 of the text the embeddings are computed from; content_hash() is the same
+# in Python (chr(31) separates title and synopsis)
+CONTENT_HASH_EXPRESSION = (
+    "md5(coalesce(title, '') || chr(31) || coalesce(synopsis, ''))"
+)
+
+
+def content_hash(title: Optional[str], synopsis: Optional[str]) -> str:
+    text = f"{title or ''}\x1f{synopsis or ''}"
+    return hashlib.md5(text.encode("utf-8")).hexdigest()
+
+
+# Sortable nullable columns. NULL is replaced by a sentinel (SQL literal, Python
+# value) so movies without a value sort last: (for ascending, for descending)
+SORT_NULL_SENTINELS = {
+    "imdb_rating": (
+        ("'Infinity'::float8", float("inf")),
+        ("'-Infinity'::float8", float("-inf")),
+    ),
+    "release_date": (
+        ("'9999-12-31'::date", date(9999, 12, 31)),
+        ("'0001-01-01'::date", date(1, 1, 1)),
+    ),
+    "box_office": (("2147483647", 2147483647), ("-2147483648", -2147483648)),
+    "metacritic_score": (("2147483647", 2147483647), ("-2147483648", -2147483648)),
+}
+
+
+def sort_index_name(column: str, descending: bool) -> str:
+    return f"idx_movies_sort_{column}_{'desc' if descending else 'asc'}"
+
 
 class Movie(Base):
     __tablename__ = "movies"
@@ -12,6 +70,9 @@ class Movie(Base):
     title = Column(String(255), nullable=False, index=True)
     original_title = Column(String(255))
     release_date = Column(Date)
+    release_year = Column(
+        Integer, Computed("EXTRACT(year FROM release_date)::integer", persisted=True)
+    )
     runtime = Column(Integer)  # in minutes
 
     # Content
@@ -58,10 +119,69 @@ class Movie(Base):
     imdb_id = Column(String(20), unique=True, index=True)
     tmdb_id = Column(Integer, unique=True, index=True)
 
-    # Vector embeddings for similarity search
-    title_vector = Column(Vector(384))
-    synopsis_vector = Column(Vector(384))
-    combined_vector = Column(Vector(384))
+    # Vector embeddings for similarity search. Deferred: ORM queries only load
+    # them when an attribute is accessed, since API responses never include them
+    title_vector = deferred(Column(Vector(384)), group="vectors")
+    synopsis_vector = deferred(Column(Vector(384)), group="vectors")
+    combined_vector = deferred(Column(Vector(384)), group="vectors")
+    embedding_status = Column(
+        String(20), nullable=False, default="pending", server_default="pending"
+    )  # pending, ready or failed
+    # Upserts only re-embed a movie when this changes
+    content_hash = Column(String(32), Computed(CONTENT_HASH_EXPRESSION, persisted=True))
+    # Set on every write; in-process HNSW indexes sync the rows changed since
+    # their last read
+    updated_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+        index=True,
+    )
+
+    # Search: weighted full-text document maintained by PostgreSQL
+    # (title A, director and cast B, synopsis C), only read inside SQL
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+        )
+    )
 
-    # Search
-    search_vector = Column(Text)  # For full-text search
+    __table_args__ = (
+        Index("idx_movies_search_vector", "search_vector", postgresql_using="gin"),
+        # Trigram indexes for substring (ILIKE) and fuzzy (%) title/director filters
+        Index(
+            "idx_movies_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+        Index(
+            "idx_movies_director_trgm",
+            "director",
+            postgresql_using="gin",
+            postgresql_ops={"director": "gin_trgm_ops"},
+        ),
+        # Keyset pagination order of GET /movies
+        Index("idx_movies_title_id", "title", "id"),
+        # Browse filters: year (+ rating), and genre + year + rating (btree_gin)
+        Index("idx_movies_year_rating", "release_year", "imdb_rating"),
+        Index(
+            "idx_movies_genres_year_rating",
+            "genres",
+            "release_year",
+            "imdb_rating",
+            postgresql_using="gin",
+        ),
+        # (sort key, id) per sort direction, for index-ordered GET /movies pages
+        *(
+            Index(
+                sort_index_name(column, descending),
+                text(f"coalesce({column}, {sentinels[descending][0]})"),
+                "id",
+            )
+            for column, sentinels in SORT_NULL_SENTINELS.items()
+            for descending in (False, True)
+        ),
+    )
@@ -0,0 +1,54 @@
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Integer,
+    String,
+    func,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from ..core.database import Base
+
+
+class MovieNeighbor(Base):
+    """Precomputed top-K similar movies per movie and vector type"""
+
+    __tablename__ = "movie_neighbors"
+
+    movie_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("movies.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    vector_type = Column(String(20), primary_key=True)
+    rank = Column(Integer, primary_key=True)
+    neighbor_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("movies.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    distance = Column(Float, nullable=False)
+
+
+class MovieNeighborRefresh(Base):
+    """Movies whose neighbour lists the background pass has to recompute.
+
+    Writers append a row per changed movie in their own transaction; repeated
+    entries for a movie are collapsed when the pass claims them.
+    """
+
+    __tablename__ = "movie_neighbor_refresh_queue"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    movie_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("movies.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    queued_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Sequence, Tuple
 from datetime import date
 from uuid import UUID
 
@@ -78,20 +78,144 @@ class MovieUpdate(BaseModel):
 
 class MovieResponse(MovieBase):
     id: UUID
-    search_vector: Optional[str] = None
+    release_year: Optional[int] = None
+    embedding_status: Optional[str] = None
 
     class Config:
         from_attributes = True
 
 
+class MoviePartialResponse(MovieUpdate):
+    """Any subset of the MovieResponse fields, as selected with ?fields="""
+
+    id: Optional[UUID] = None
+    release_year: Optional[int] = None
+    embedding_status: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+MOVIE_FIELDS = tuple(MovieResponse.model_fields)
+
+# Slim projection listings return unless ?fields= asks for more
+MOVIE_LIST_FIELDS = (
+    "id",
+    "title",
+    "release_date",
+    "release_year",
+    "runtime",
+    "imdb_rating",
+    "director",
+    "genres",
+    "poster_url",
+)
+
+
+class InvalidFieldsError(ValueError):
+    pass
+
+
+def parse_fields(
+    fields: Optional[str], default: Sequence[str] = MOVIE_LIST_FIELDS
+) -> Tuple[str, ...]:
+    """MovieResponse field names selected by a ``fields`` query parameter.
+
+    ``fields`` is a comma-separated list of field names, or ``*`` for all of
+    them; ``id`` is always included. Raises InvalidFieldsError for unknown names.
+    """
+    if not fields or not fields.strip():
+        return tuple(default)
+    if fields.strip() == "*":
+        return MOVIE_FIELDS
+
+    selected = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in selected if name not in MOVIE_FIELDS]
+    if unknown:
+        raise InvalidFieldsError(f"Unknown movie fields: {', '.join(unknown)}")
+    return tuple(dict.fromkeys(["id", *selected]))
+
+
 class MovieSearchResponse(BaseModel):
-    movies: List[MovieResponse]
+    movies: List[MoviePartialResponse]  # the fields selected with ?fields=
     total: int
     page: int
     size: int
     total_pages: int
+    next_cursor: Optional[str] = None  # pass as ?cursor= to fetch the next page
 
 
 class SimilarMovieResponse(BaseModel):
     movie: MovieResponse
     similarity_score: float
+
+
+class HybridSearchResult(BaseModel):
+    movie: MovieResponse
+    score: float  # reciprocal rank fusion score
+    lexical_score: Optional[float] = None
+    lexical_rank: Optional[int] = None
+    semantic_score: Optional[float] = None
+    semantic_rank: Optional[int] = None
+
+
+class MovieBulkRequest(BaseModel):
+    # Validated one by one in the handler, so a bad movie only fails itself
+    movies: List[Dict[str, Any]] = Field(..., min_length=1, max_length=1000)
+
+
+class MovieBulkItemResult(BaseModel):
+    index: int  # position in the request
+    status: str  # created, inserted, updated, unchanged or error
+    id: Optional[UUID] = None
+    error: Optional[str] = None
+
+
+class MovieBulkResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[MovieBulkItemResult]
+
+
+class MovieUpsertResponse(BaseModel):
+    inserted: int
+    updated: int
+    unchanged: int
+    failed: int
+    results: List[MovieBulkItemResult]
+
+
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+
+class MovieFacetsResponse(BaseModel):
+    total: int = 0  # movies matching the filters
+    genres: List[FacetCount] = []
+    decades: List[FacetCount] = []  # first year of the decade, e.g. "1990"
+    languages: List[FacetCount] = []
+    countries: List[FacetCount] = []
+    ratings: List[FacetCount] = []  # whole IMDb rating, "8" is 8.0-8.9
+
+
+class AutocompleteSuggestion(BaseModel):
+    text: str
+    type: str  # title, director or cast
+    movie_id: Optional[UUID] = None  # set for title suggestions
+    imdb_rating: Optional[float] = None
+
+
+class SimilarMoviesBatchRequest(BaseModel):
+    movie_ids: List[UUID] = Field(..., min_length=1, max_length=100)
+    limit: int = Field(10, ge=1, le=50)
+    vector_type: str = Field("combined", pattern="^(title|synopsis|combined)$")
+
+
+class SimilarMoviesResult(BaseModel):
+    movie_id: UUID
+    similar: List[SimilarMovieResponse]
+
+
+class SimilarMoviesBatchResponse(BaseModel):
+    results: List[SimilarMoviesResult]
@@ -0,0 +1,331 @@
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+import threading
+import logging
+import time
+
+import numpy as np
+
+try:
+    import hnswlib
+except ImportError:  # pragma: no cover - optional dependency
+    hnswlib = None
+
+from sqlalchemy import func
+
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..models.movie import Movie
+
+logger = logging.getLogger(__name__)
+
+VECTOR_TYPES = ("title", "synopsis", "combined")
+
+# Syncs re-read rows this far behind the newest updated_at seen: updated_at is
+# the writing transaction's start time, so a slow transaction can commit after
+# rows stamped later than it
+SYNC_OVERLAP = timedelta(minutes=5)
+
+
+class HNSWIndex:
+    """In-process HNSW index for a single vector column"""
+
+    def __init__(
+        self,
+        dim: int,
+        max_elements: int = 1024,
+        m: int = 16,
+        ef_construction: int = 200,
+        ef_search: int = 64,
+    ):
+        self.dim = dim
+        self.m = m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self._lock = threading.RLock()
+        self._labels: Dict[UUID, int] = {}
+        self._ids: Dict[int, UUID] = {}
+        self._next_label = 0
+        self._index = hnswlib.Index(space="cosine", dim=dim)
+        self._index.init_index(
+            max_elements=max_elements,
+            ef_construction=ef_construction,
+            M=m,
+            allow_replace_deleted=True,
+        )
+        self._index.set_ef(ef_search)
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    def _ensure_capacity(self, extra: int):
+        required = self._index.get_current_count() + extra
+        capacity = self._index.get_max_elements()
+        if required > capacity:
+            self._index.resize_index(max(required, capacity * 2))
+
+    def add_items(self, movie_ids: List[UUID], vectors: np.ndarray):
+        """Insert or replace vectors for the given movie ids"""
+        if not movie_ids:
+            return
+
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(
+            len(movie_ids), self.dim
+        )
+        with self._lock:
+            labels = []
+            for movie_id in movie_ids:
+                label = self._labels.get(movie_id)
+                if label is None:
+                    label = self._next_label
+                    self._next_label += 1
+                    self._labels[movie_id] = label
+                    self._ids[label] = movie_id
+                labels.append(label)
+
+            self._ensure_capacity(len(labels))
+            self._index.add_items(vectors, np.asarray(labels), replace_deleted=True)
+
+    def remove(self, movie_id: UUID) -> bool:
+        """Mark a movie's vector as deleted; its slot is reused by later inserts"""
+        with self._lock:
+            label = self._labels.pop(movie_id, None)
+            if label is None:
+                return False
+            self._ids.pop(label, None)
+            self._index.mark_deleted(label)
+            return True
+
+    def get_vector(self, movie_id: UUID) -> Optional[np.ndarray]:
+        with self._lock:
+            label = self._labels.get(movie_id)
+            if label is None:
+                return None
+            return np.asarray(self._index.get_items([label])[0], dtype=np.float32)
+
+    def knn_query(self, vector, k: int = 10) -> List[Tuple[UUID, float]]:
+        """Return up to k (movie_id, cosine distance) pairs, closest first"""
+        with self._lock:
+            k = min(k, len(self._labels))
+            if k <= 0:
+                return []
+            labels, distances = self._index.knn_query(
+                np.asarray(vector, dtype=np.float32).reshape(1, self.dim), k=k
+            )
+            return [
+                (self._ids[int(label)], float(distance))
+                for label, distance in zip(labels[0], distances[0])
+                if int(label) in self._ids
+            ]
+
+
+class ANNIndexService:
+    """Keeps one HNSW index per vector type in sync with the movies table.
+
+    Each process holds its own copy. Local writes update it directly; writes
+    made by other processes (other API workers, embedding workers) show up
+    at the next periodic ``sync``, which reads only the movies whose
+    updated_at moved. Deletes by other processes are only dropped by the
+    rare full rebuild (``load``); callers skip ids missing from the table.
+    """
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+        self.indexes: Dict[str, HNSWIndex] = {}
+        self.ready = False
+        # Guards the swap of ``indexes`` against concurrent local writes, which
+        # are journaled while a load runs and replayed onto the new indexes
+        self._sync_lock = threading.Lock()
+        self._journal: Optional[List[Tuple[UUID, dict]]] = None
+        # Newest movies.updated_at applied so far
+        self._synced_at: Optional[datetime] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _new_index(self, size: int) -> HNSWIndex:
+        return HNSWIndex(
+            dim=settings.vector_dimension,
+            max_elements=max(size, 1024),
+            m=settings.hnsw_m,
+            ef_construction=settings.hnsw_ef_construction,
+            ef_search=settings.hnsw_ef_search,
+        )
+
+    def load(self, db) -> None:
+        """Build all indexes from the vectors currently stored in the database"""
+        if settings.vector_search_backend != "hnsw":
+            return
+        if hnswlib is None:
+            logger.warning(
+                "hnswlib is not installed, falling back to pgvector for similarity search"
+            )
+            return
+
+        with self._sync_lock:
+            self._journal = []
+        try:
+            # Read first, so rows updated during the load are synced later
+            synced_at = db.query(func.max(Movie.updated_at)).scalar()
+            indexes = {}
+            for vector_type in VECTOR_TYPES:
+                column = getattr(Movie, f"{vector_type}_vector")
+                rows = db.query(Movie.id, column).filter(column.isnot(None)).all()
+                index = self._new_index(len(rows))
+                if rows:
+                    index.add_items(
+                        [row[0] for row in rows],
+                        np.stack([np.asarray(row[1]) for row in rows]),
+                    )
+                indexes[vector_type] = index
+                logger.info(f"Loaded {len(rows)} {vector_type} vectors into HNSW index")
+        except Exception:
+            with self._sync_lock:
+                self._journal = None
+            raise
+
+        with self._sync_lock:
+            # Writes that committed during the load may be missing from the rows
+            for movie_id, vectors in self._journal:
+                self._apply(indexes, movie_id, vectors)
+            self._journal = None
+            self.indexes = indexes
+            self._synced_at = synced_at
+            self.ready = True
+
+    def sync(self, db) -> int:
+        """Apply the vectors of movies updated since the last load or sync.
+
+        Returns the number of rows read. Loads the indexes if not ready yet.
+        """
+        if not self.ready:
+            self.load(db)
+            return 0
+
+        with self._sync_lock:
+            self._journal = []
+        try:
+            query = db.query(
+                Movie.id,
+                Movie.updated_at,
+                *(
+                    getattr(Movie, f"{vector_type}_vector")
+                    for vector_type in VECTOR_TYPES
+                ),
+            )
+            if self._synced_at is not None:
+                query = query.filter(Movie.updated_at > self._synced_at - SYNC_OVERLAP)
+            rows = query.all()
+        except Exception:
+            with self._sync_lock:
+                self._journal = None
+            raise
+
+        with self._sync_lock:
+            for row in rows:
+                self._apply(
+                    self.indexes,
+                    row.id,
+                    {
+                        vector_type: getattr(row, f"{vector_type}_vector")
+                        for vector_type in VECTOR_TYPES
+                    },
+                )
+            # Local writes may be newer than the rows read
+            for movie_id, vectors in self._journal:
+                self._apply(self.indexes, movie_id, vectors)
+            self._journal = None
+            seen = [row.updated_at for row in rows]
+            if self._synced_at is not None:
+                seen.append(self._synced_at)
+            self._synced_at = max(seen, default=None)
+        return len(rows)
+
+    def _apply(
+        self,
+        indexes: Dict[str, HNSWIndex],
+        movie_id: UUID,
+        vectors: Dict[str, Optional[np.ndarray]],
+    ) -> None:
+        for vector_type, vector in vectors.items():
+            if vector is None:
+                indexes[vector_type].remove(movie_id)
+            else:
+                indexes[vector_type].add_items([movie_id], np.asarray(vector))
+
+    def _write(self, movie_id: UUID, vectors: Dict[str, Optional[np.ndarray]]):
+        with self._sync_lock:
+            if self._journal is not None:
+                self._journal.append((movie_id, vectors))
+            if self.ready:
+                self._apply(self.indexes, movie_id, vectors)
+
+    def upsert_movie(self, movie) -> None:
+        """Refresh the indexed vectors of a movie after create or update.
+
+        Vector attributes ``movie`` does not have are left as indexed.
+        """
+        self._write(
+            movie.id,
+            {
+                vector_type: getattr(movie, f"{vector_type}_vector")
+                for vector_type in VECTOR_TYPES
+                if hasattr(movie, f"{vector_type}_vector")
+            },
+        )
+
+    def remove_movie(self, movie_id: UUID) -> None:
+        self._write(movie_id, dict.fromkeys(VECTOR_TYPES))
+
+    def get_vector(self, movie_id: UUID, vector_type: str) -> Optional[np.ndarray]:
+        if not self.ready:
+            return None
+        return self.indexes[vector_type].get_vector(movie_id)
+
+    def search(
+        self, vector, limit: int = 10, vector_type: str = "combined"
+    ) -> List[Tuple[UUID, float]]:
+        return self.indexes[vector_type].knn_query(vector, limit)
+
+    def refresh(self, rebuild: bool = False) -> None:
+        """Sync recent changes, or rebuild the indexes with ``rebuild``"""
+        db = self.session_factory()
+        try:
+            if rebuild:
+                self.load(db)
+            else:
+                self.sync(db)
+        finally:
+            db.close()
+
+    def _refresh_forever(self, interval: float, rebuild_interval: float):
+        next_rebuild = time.monotonic() + rebuild_interval
+        while not self._stop.wait(interval):
+            rebuild = rebuild_interval > 0 and time.monotonic() >= next_rebuild
+            try:
+                self.refresh(rebuild=rebuild)
+                if rebuild:
+                    next_rebuild = time.monotonic() + rebuild_interval
+            except Exception as e:
+                logger.error(f"Error refreshing HNSW index: {e}")
+
+    def start(self, interval: float, rebuild_interval: float = 0.0):
+        """Sync the indexes every ``interval`` seconds and rebuild them every
+        ``rebuild_interval`` seconds (0 never) in a daemon thread"""
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._refresh_forever,
+            args=(interval, rebuild_interval),
+            name="hnsw-refresh",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+
+ann_index_service = ANNIndexService()
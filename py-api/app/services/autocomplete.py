@@ -0,0 +1,367 @@
+"""
+In-memory prefix index for as-you-type title, director and cast suggestions.
+
+Every name is stored as sorted (term, kind, text, movie_id) keys, one key per
+word it contains ("christopher nolan" and "nolan"), so suggestions never touch
+the database. Prefixes up to PREFIX_LENGTH_CAP characters map to a precomputed
+list of their TOP_K best-rated suggestions, so lookups cost O(k) however many
+keys match; longer prefixes match few keys and are answered by bisect.
+
+Each worker process keeps its own copy: handlers apply local writes
+immediately and a background thread reloads the whole index every
+AUTOCOMPLETE_REFRESH_INTERVAL seconds to pick up writes made by other workers.
+Local writes made while a reload runs are replayed onto the new index.
+"""
+
+from bisect import bisect_left, insort
+from collections import defaultdict
+from itertools import groupby
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+import heapq
+import logging
+import threading
+import unicodedata
+
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..models.movie import Movie
+
+logger = logging.getLogger(__name__)
+
+# Largest limit GET /autocomplete accepts
+MAX_SUGGESTIONS = 50
+# Suggestions kept per prefix; the headroom over MAX_SUGGESTIONS lets writes
+# drop entries without rescanning the prefix
+TOP_K = 2 * MAX_SUGGESTIONS
+# Prefixes up to this length get a precomputed top list
+PREFIX_LENGTH_CAP = 6
+
+Key = Tuple[str, str, str, UUID]  # (term, kind, text, movie_id)
+Suggestion = Tuple[float, str, str, UUID]  # (rating, kind, text, movie_id)
+
+
+def normalize(value: str) -> str:
+    """Lowercase, strip accents and collapse whitespace"""
+    value = unicodedata.normalize("NFKD", value)
+    value = "".join(c for c in value if not unicodedata.combining(c))
+    return " ".join(value.lower().split())
+
+
+def movie_names(title, director, cast) -> List[Tuple[str, str]]:
+    """(kind, text) pairs a movie contributes to the index"""
+    names = []
+    if title:
+        names.append(("title", title))
+    if director:
+        names.append(("director", director))
+    for member in cast or []:
+        name = member.get("name") if isinstance(member, dict) else None
+        if name:
+            names.append(("cast", name))
+    return names
+
+
+def _keys(movie_id: UUID, names: Iterable[Tuple[str, str]]) -> List[Key]:
+    keys = set()
+    for kind, text in names:
+        words = normalize(text).split()
+        for i in range(len(words)):
+            keys.add((" ".join(words[i:]), kind, text, movie_id))
+    return list(keys)
+
+
+def _group(suggestion: Suggestion) -> tuple:
+    """Titles are suggested per movie, other names once per text"""
+    _, kind, text, movie_id = suggestion
+    return (kind, movie_id if kind == "title" else text)
+
+
+def _prefixes(text: str) -> set:
+    """Indexed prefixes (up to PREFIX_LENGTH_CAP) of every term of ``text``"""
+    words = normalize(text).split()
+    terms = (" ".join(words[i:]) for i in range(len(words)))
+    return {
+        term[:length]
+        for term in terms
+        for length in range(1, min(len(term), PREFIX_LENGTH_CAP) + 1)
+    }
+
+
+def _best(suggestions: Iterable[Suggestion]) -> Tuple[List[Suggestion], bool]:
+    """The TOP_K best-rated suggestions, one per group, and whether that is
+    all of them"""
+    best: Dict[tuple, Suggestion] = {}
+    for suggestion in suggestions:
+        group = _group(suggestion)
+        if group not in best or suggestion[0] > best[group][0]:
+            best[group] = suggestion
+    top = heapq.nlargest(TOP_K, best.values(), key=lambda s: s[0])
+    return top, len(best) <= TOP_K
+
+
+class _TopList:
+    """Best-rated suggestions of one prefix, highest first.
+
+    ``complete`` means the list holds every suggestion of the prefix;
+    otherwise everything left out ranks at or below its last entry.
+    """
+
+    __slots__ = ("entries", "complete")
+
+    def __init__(self, entries: List[Suggestion], complete: bool):
+        self.entries = entries
+        self.complete = complete
+
+
+def _build_top(keys: List[Key], ratings: Dict[UUID, float]) -> Dict[str, _TopList]:
+    """Top lists of every indexed prefix of the sorted ``keys``"""
+    top: Dict[str, _TopList] = {}
+    # Keys sharing a prefix are contiguous, so the longest prefixes come
+    # straight from one pass over the sorted keys
+    for prefix, group in groupby(keys, key=lambda key: key[0][:PREFIX_LENGTH_CAP]):
+        top[prefix] = _TopList(
+            *_best((ratings.get(m, 0.0), kind, text, m) for _, kind, text, m in group)
+        )
+    # A shorter prefix merges the lists one character longer (plus its own,
+    # if some term is exactly that prefix). Merging top lists is exact: a
+    # suggestion in the parent's top K is in the top K of the child holding
+    # its best entry.
+    for length in range(PREFIX_LENGTH_CAP - 1, 0, -1):
+        children: Dict[str, List[_TopList]] = defaultdict(list)
+        for prefix in [p for p in top if len(p) == length + 1]:
+            children[prefix[:length]].append(top[prefix])
+        for prefix, lists in children.items():
+            if prefix in top:
+                lists.append(top[prefix])
+            entries, complete = _best(s for lst in lists for s in lst.entries)
+            top[prefix] = _TopList(
+                entries, complete and all(child.complete for child in lists)
+            )
+    return top
+
+
+class AutocompleteService:
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+        self.ready = False
+        self._lock = threading.RLock()
+        self._keys: List[Key] = []
+        self._movie_keys: Dict[UUID, List[Key]] = {}
+        self._ratings: Dict[UUID, float] = {}
+        self._top: Dict[str, _TopList] = {}
+        # Local writes made while load() runs, replayed onto the new index
+        self._journal: Optional[List[tuple]] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def load(self, db) -> None:
+        """Rebuild the index from the movies table and swap it in"""
+        if not settings.autocomplete_enabled:
+            return
+
+        with self._lock:
+            self._journal = []
+        try:
+            rows = db.query(
+                Movie.id, Movie.title, Movie.director, Movie.cast, Movie.imdb_rating
+            ).all()
+        except Exception:
+            with self._lock:
+                self._journal = None
+            raise
+
+        keys: List[Key] = []
+        movie_keys: Dict[UUID, List[Key]] = {}
+        ratings: Dict[UUID, float] = {}
+        for movie_id, title, director, cast, rating in rows:
+            movie_keys[movie_id] = _keys(movie_id, movie_names(title, director, cast))
+            keys.extend(movie_keys[movie_id])
+            ratings[movie_id] = rating or 0.0
+        keys.sort()
+        top = _build_top(keys, ratings)
+
+        with self._lock:
+            journal, self._journal = self._journal or [], None
+            self._keys = keys
+            self._movie_keys = movie_keys
+            self._ratings = ratings
+            self._top = top
+            self.ready = True
+            # The rows may predate writes applied while they were indexed
+            for write in journal:
+                self._apply(*write)
+        logger.info(f"Loaded {len(rows)} movies into autocomplete index")
+
+    def _scan(self, prefix: str) -> Tuple[List[Suggestion], bool]:
+        """Walk every key starting with ``prefix``; O(matches)"""
+        matches = []
+        i = bisect_left(self._keys, (prefix,))
+        while i < len(self._keys) and self._keys[i][0].startswith(prefix):
+            _, kind, text, movie_id = self._keys[i]
+            matches.append((self._ratings.get(movie_id, 0.0), kind, text, movie_id))
+            i += 1
+        return _best(matches)
+
+    def _current(self, kind: str, text: str, movie_id: UUID) -> Optional[Suggestion]:
+        """The suggestion for (kind, text) as indexed now, None if gone"""
+        if kind == "title":
+            if (kind, text) not in {k[1:3] for k in self._movie_keys.get(movie_id, [])}:
+                return None
+            return (self._ratings[movie_id], kind, text, movie_id)
+
+        # A name is ranked by its best-rated movie; all of them share its
+        # full term
+        term = normalize(text)
+        best = None
+        i = bisect_left(self._keys, (term,))
+        while i < len(self._keys) and self._keys[i][0] == term:
+            _, key_kind, key_text, key_movie_id = self._keys[i]
+            rating = self._ratings.get(key_movie_id, 0.0)
+            if (
+                key_kind == kind
+                and key_text == text
+                and (best is None or rating > best[0])
+            ):
+                best = (rating, kind, text, key_movie_id)
+            i += 1
+        return best
+
+    def _update_top(self, prefix: str, group: tuple, suggestion: Optional[Suggestion]):
+        """Replace ``group``'s entry in ``prefix``'s top list"""
+        top = self._top.get(prefix)
+        if top is None:
+            if suggestion is not None:
+                self._top[prefix] = _TopList([suggestion], True)
+            return
+
+        entries = [s for s in top.entries if _group(s) != group]
+        # A suggestion ranking below a partial list's last entry may be
+        # outranked by ones left out, so it stays out too
+        if suggestion is not None and (
+            top.complete or (entries and suggestion[0] >= entries[-1][0])
+        ):
+            i = 0
+            while i < len(entries) and entries[i][0] >= suggestion[0]:
+                i += 1
+            entries.insert(i, suggestion)
+            if len(entries) > TOP_K:
+                entries.pop()
+                top.complete = False
+        top.entries = entries
+
+        if not top.complete and len(entries) < MAX_SUGGESTIONS:
+            self._top[prefix] = _TopList(*self._scan(prefix))
+        elif not entries:
+            del self._top[prefix]
+
+    def _apply(
+        self,
+        movie_id: UUID,
+        names: Optional[List[Tuple[str, str]]],
+        rating: float = 0.0,
+    ):
+        """Index ``movie_id`` under ``names``, or drop it if None"""
+        old_keys = self._movie_keys.pop(movie_id, [])
+        for key in old_keys:
+            i = bisect_left(self._keys, key)
+            if i < len(self._keys) and self._keys[i] == key:
+                del self._keys[i]
+        self._ratings.pop(movie_id, None)
+
+        new_keys = []
+        if names is not None:
+            new_keys = _keys(movie_id, names)
+            for key in new_keys:
+                insort(self._keys, key)
+            self._movie_keys[movie_id] = new_keys
+            self._ratings[movie_id] = rating
+
+        # Removals first: an old and a new title are the same group
+        changes = sorted(
+            (
+                (self._current(kind, text, movie_id), kind, text)
+                for kind, text in {key[1:3] for key in old_keys + new_keys}
+            ),
+            key=lambda change: change[0] is not None,
+        )
+        for suggestion, kind, text in changes:
+            group = _group((0.0, kind, text, movie_id))
+            for prefix in _prefixes(text):
+                self._update_top(prefix, group, suggestion)
+
+    def _write(self, movie_id: UUID, names, rating: float = 0.0):
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append((movie_id, names, rating))
+            if self.ready:
+                self._apply(movie_id, names, rating)
+
+    def upsert_movie(self, movie) -> None:
+        """Re-index a movie after create or update"""
+        names = movie_names(movie.title, movie.director, movie.cast)
+        self._write(movie.id, names, movie.imdb_rating or 0.0)
+
+    def remove_movie(self, movie_id: UUID) -> None:
+        self._write(movie_id, None)
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[dict]:
+        """Best-rated titles, directors and cast names starting with ``prefix``.
+
+        Titles are suggested per movie; a director or cast name is suggested
+        once, ranked by the best-rated movie it appears in.
+        """
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+
+        with self._lock:
+            if len(prefix) <= PREFIX_LENGTH_CAP:
+                top = self._top.get(prefix)
+                entries = top.entries[:limit] if top else []
+            else:
+                entries = self._scan(prefix)[0][:limit]
+
+        return [
+            {
+                "text": text,
+                "type": kind,
+                "movie_id": movie_id if kind == "title" else None,
+                "imdb_rating": rating or None,
+            }
+            for rating, kind, text, movie_id in entries
+        ]
+
+    def refresh(self) -> None:
+        db = self.session_factory()
+        try:
+            self.load(db)
+        finally:
+            db.close()
+
+    def _refresh_forever(self, interval: float):
+        while not self._stop.wait(interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Error refreshing autocomplete index: {e}")
+
+    def start(self, interval: float):
+        """Reload the index every ``interval`` seconds in a daemon thread"""
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._refresh_forever,
+            args=(interval,),
+            name="autocomplete-refresh",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+
+autocomplete_service = AutocompleteService()
@@ -0,0 +1,184 @@
+from collections import OrderedDict
+from typing import Optional
+import hashlib
+import threading
+import logging
+import os
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+KEY_SIZE = 16
+EMPTY_KEY = bytes(KEY_SIZE)
+MAX_PROBES = 8
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so trivially different strings share a cache entry"""
+    return " ".join(text.split())
+
+
+def cache_key(model_name: str, text: str) -> bytes:
+    """Content address of an embedding: model name plus hash of normalized text"""
+    digest = hashlib.sha256(f"{model_name}\0{normalize_text(text)}".encode("utf-8"))
+    return digest.digest()[:KEY_SIZE]
+
+
+class DiskEmbeddingStore:
+    """Fixed-size, memory-mapped hash table of embeddings shared between processes.
+
+    Slots are addressed by the cache key with linear probing. Writers clear a
+    slot's key, write its vector, then set the key; readers take no lock and
+    re-read the key after copying the vector, treating a change as a miss. When
+    a probe chain is full the home slot is overwritten, keeping the file bounded.
+    """
+
+    def __init__(self, path: str, dim: int, slots: int = 65536):
+        self.path = path
+        self.dim = dim
+        self.slots = slots
+        self.dtype = np.dtype([("key", "u1", (KEY_SIZE,)), ("vector", "<f4", (dim,))])
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        # Grow (never truncate) the file in place so concurrent workers can open it
+        size = self.dtype.itemsize * slots
+        with open(path, "ab") as f:
+            if os.path.getsize(path) < size:
+                f.truncate(size)
+        self.table = np.memmap(path, dtype=self.dtype, mode="r+", shape=(slots,))
+        self._lock_path = f"{path}.lock"
+
+    def _slot(self, key: bytes) -> int:
+        return int.from_bytes(key[:8], "little") % self.slots
+
+    def _stored_key(self, index: int) -> bytes:
+        return self.table["key"][index].tobytes()
+
+    def get(self, key: bytes) -> Optional[np.ndarray]:
+        home = self._slot(key)
+        for probe in range(MAX_PROBES):
+            index = (home + probe) % self.slots
+            stored = self._stored_key(index)
+            if stored == key:
+                vector = np.array(self.table["vector"][index], dtype=np.float32)
+                # A concurrent put may have evicted the slot mid-copy
+                if self._stored_key(index) != key:
+                    return None
+                return vector
+            if stored == EMPTY_KEY:
+                return None
+        return None
+
+    def put(self, key: bytes, vector: np.ndarray):
+        with open(self._lock_path, "a") as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                home = self._slot(key)
+                target = home
+                for probe in range(MAX_PROBES):
+                    index = (home + probe) % self.slots
+                    stored = self._stored_key(index)
+                    if stored == EMPTY_KEY or stored == key:
+                        target = index
+                        break
+
+                self.table["key"][target] = 0
+                self.table["vector"][target] = vector
+                self.table["key"][target] = np.frombuffer(key, dtype=np.uint8)
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def flush(self):
+        self.table.flush()
+
+
+class EmbeddingCache:
+    """Bounded in-memory LRU of embeddings with an optional on-disk tier"""
+
+    def __init__(
+        self,
+        max_size: int = 10000,
+        disk_path: Optional[str] = None,
+        disk_slots: int = 65536,
+        dim: int = 384,
+    ):
+        self.max_size = max_size
+        self._entries: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self.disk = None
+        if disk_path:
+            try:
+                self.disk = DiskEmbeddingStore(disk_path, dim, disk_slots)
+                logger.info(f"Embedding disk cache opened at {disk_path}")
+            except Exception as e:
+                logger.error(f"Error opening embedding disk cache: {e}")
+
+    def get(self, key: bytes) -> Optional[np.ndarray]:
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return vector
+
+        if self.disk is not None:
+            vector = self.disk.get(key)
+            if vector is not None:
+                with self._lock:
+                    self.disk_hits += 1
+                self._remember(key, vector)
+                return vector
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: bytes, vector: np.ndarray):
+        vector = np.array(vector, dtype=np.float32)
+        self._remember(key, vector)
+        if self.disk is not None:
+            try:
+                self.disk.put(key, vector)
+            except Exception as e:
+                logger.error(f"Error writing embedding disk cache: {e}")
+
+    def _remember(self, key: bytes, vector: np.ndarray):
+        if self.max_size <= 0:
+            return
+        vector.setflags(write=False)
+        with self._lock:
+            self._entries[key] = vector
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.disk_hits = self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                "disk_enabled": self.disk is not None,
+            }
@@ -0,0 +1,195 @@
+"""
+Per-host embedding server: one process owns the SentenceTransformer model and
+gunicorn workers reach it over a Unix socket instead of loading their own copy.
+
+    python -m app.services.embedding_server --socket /tmp/imdb-embeddings.sock
+
+Workers use it by setting EMBEDDING_SERVER_SOCKET to the same path.
+
+Wire format (integers big-endian, vectors native float32 since both ends
+share the host):
+    request:  uint32 length + UTF-8 JSON list of texts
+    response: uint8 status + uint32 rows + uint32 dim + rows * dim float32
+              (status 1 = error, followed by uint32 length + UTF-8 message)
+"""
+
+from typing import List, Optional
+import argparse
+import json
+import logging
+import os
+import socket
+import socketserver
+import struct
+import threading
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+REQUEST_HEADER = struct.Struct("!I")
+RESPONSE_HEADER = struct.Struct("!BII")
+STATUS_OK = 0
+STATUS_ERROR = 1
+
+
+class EmbeddingServerError(Exception):
+    pass
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = sock.recv(size)
+        if not chunk:
+            raise ConnectionError("Embedding server connection closed")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+class EmbeddingClient:
+    """Drop-in replacement for SentenceTransformer.encode backed by the server"""
+
+    def __init__(self, socket_path: str, timeout: float = 30.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self) -> socket.socket:
+        sock = getattr(self._local, "sock", None)
+        # Sockets are per thread and must not be reused after a fork
+        if sock is None or self._local.pid != os.getpid():
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            self._local.sock = sock
+            self._local.pid = os.getpid()
+        return sock
+
+    def _reset(self):
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            try:
+                sock.close()
+            except OSError:
+                pass
+        self._local.sock = None
+
+    def _request(self, payload: bytes) -> np.ndarray:
+        sock = self._connection()
+        sock.sendall(REQUEST_HEADER.pack(len(payload)) + payload)
+
+        status, rows, dim = RESPONSE_HEADER.unpack(
+            _recv_exactly(sock, RESPONSE_HEADER.size)
+        )
+        if status != STATUS_OK:
+            (length,) = REQUEST_HEADER.unpack(_recv_exactly(sock, REQUEST_HEADER.size))
+            raise EmbeddingServerError(_recv_exactly(sock, length).decode("utf-8"))
+
+        data = _recv_exactly(sock, rows * dim * 4)
+        return np.frombuffer(data, dtype=np.float32).reshape(rows, dim)
+
+    def encode(self, texts) -> np.ndarray:
+        single = isinstance(texts, str)
+        payload = json.dumps([texts] if single else list(texts)).encode("utf-8")
+
+        try:
+            embeddings = self._request(payload)
+        except (ConnectionError, OSError):
+            # The server may have restarted; retry once on a fresh connection
+            self._reset()
+            embeddings = self._request(payload)
+
+        return embeddings[0] if single else embeddings
+
+
+class EmbeddingRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        while True:
+            header = self.rfile.read(REQUEST_HEADER.size)
+            if len(header) < REQUEST_HEADER.size:
+                return
+            (length,) = REQUEST_HEADER.unpack(header)
+
+            try:
+                texts = json.loads(self.rfile.read(length).decode("utf-8"))
+                embeddings = np.asarray(
+                    self.server.embed(texts), dtype=np.float32
+                ).reshape(len(texts), -1)
+                rows, dim = embeddings.shape
+                self.wfile.write(RESPONSE_HEADER.pack(STATUS_OK, rows, dim))
+                self.wfile.write(embeddings.tobytes())
+            except Exception as e:
+                logger.error(f"Error serving embedding request: {e}")
+                message = str(e).encode("utf-8")
+                self.wfile.write(RESPONSE_HEADER.pack(STATUS_ERROR, 0, 0))
+                self.wfile.write(REQUEST_HEADER.pack(len(message)) + message)
+            self.wfile.flush()
+
+
+class EmbeddingServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, embed):
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        self.embed = embed
+        super().__init__(socket_path, EmbeddingRequestHandler)
+        os.chmod(socket_path, 0o660)
+
+
+def service_embed(service):
+    """EmbeddingServer callback over a VectorService.
+
+    Encode errors raise, so clients get STATUS_ERROR rather than zero vectors
+    they would cache and store.
+    """
+    return lambda texts: service.generate_embeddings_batch(
+        texts, as_numpy=True, raise_on_error=True
+    )
+
+
+def main(argv: Optional[List[str]] = None):
+    from ..core.config import settings
+
+    parser = argparse.ArgumentParser(description="Shared embedding model server")
+    parser.add_argument(
+        "--socket",
+        default=settings.embedding_server_socket or "/tmp/imdb-embeddings.sock",
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+    # This process owns the model, so it must not become a client of itself
+    settings.embedding_server_socket = None
+    from .vector_service import EmbeddingBatcher, vector_service
+
+    if vector_service.model is None:
+        raise SystemExit("Embedding model could not be loaded")
+
+    # Requests from all workers share model batches
+    if vector_service.batcher is None:
+        vector_service.batcher = EmbeddingBatcher(
+            vector_service.model.encode,
+            max_batch_size=settings.embedding_batch_max_size,
+            max_wait_ms=settings.embedding_batch_wait_ms,
+        )
+
+    server = EmbeddingServer(args.socket, service_embed(vector_service))
+    logger.info(f"Embedding server listening on {args.socket}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        os.unlink(args.socket)
+
+
+if __name__ == "__main__":
+    main()
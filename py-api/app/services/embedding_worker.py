@@ -0,0 +1,142 @@
+"""
+Background worker that fills in movie embeddings queued by the API.
+
+Run it in-process (EMBEDDING_WORKER_THREADS > 0) or as a separate process:
+
+    python -m app.services.embedding_worker
+"""
+
+from datetime import timedelta
+from typing import List, Optional
+import threading
+import logging
+import time
+
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..crud.embedding_job import embedding_job_crud
+from ..crud.movie import movie_crud
+from .ann_index import ann_index_service
+from .neighbor_service import neighbor_service
+from .vector_service import vector_service, movie_vector_texts
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingWorker:
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        batch_size: int = 16,
+        poll_interval: float = 1.0,
+        max_attempts: int = 3,
+        retention: float = 0.0,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.retention = retention
+        self._next_purge = 0.0
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def run_once(self) -> int:
+        """Claim a batch of due jobs, embed their movies and store the vectors"""
+        db = self.session_factory()
+        try:
+            jobs = embedding_job_crud.claim(db, self.batch_size)
+            if not jobs:
+                db.rollback()
+                return 0
+
+            job_ids = [job.id for job in jobs]
+            try:
+                movies = movie_crud.get_many(db, list({job.movie_id for job in jobs}))
+                # Errors must reach record_failure, not become zero vectors
+                all_vectors = vector_service.generate_movie_vectors(
+                    [movie_vector_texts(m.title, m.synopsis) for m in movies],
+                    raise_on_error=True,
+                )
+                for movie, vectors in zip(movies, all_vectors):
+                    for column, vector in vectors.items():
+                        setattr(movie, column, vector)
+                    movie.embedding_status = "ready"
+                for job in jobs:
+                    embedding_job_crud.mark_done(db, job)
+                neighbor_service.queue_refresh(db, [movie.id for movie in movies])
+                db.commit()
+            except Exception as e:
+                logger.error(f"Error processing embedding jobs: {e}")
+                db.rollback()
+                embedding_job_crud.record_failure(
+                    db, job_ids, str(e), self.max_attempts
+                )
+                return 0
+
+            for movie in movies:
+                ann_index_service.upsert_movie(movie)
+            return len(jobs)
+        finally:
+            db.close()
+
+    def purge_done(self) -> int:
+        """Delete done jobs older than ``retention`` seconds (0 keeps them)"""
+        if self.retention <= 0:
+            return 0
+        db = self.session_factory()
+        try:
+            return embedding_job_crud.purge_done(db, timedelta(seconds=self.retention))
+        finally:
+            db.close()
+
+    def run_forever(self):
+        logger.info("Embedding worker started")
+        while not self._stop.is_set():
+            try:
+                processed = self.run_once()
+                # While idle, purge every retention / 10 seconds (at most hourly)
+                if not processed and time.monotonic() >= self._next_purge:
+                    self._next_purge = time.monotonic() + min(self.retention / 10, 3600)
+                    self.purge_done()
+            except Exception as e:
+                logger.error(f"Embedding worker error: {e}")
+                processed = 0
+            if not processed:
+                self._stop.wait(self.poll_interval)
+        logger.info("Embedding worker stopped")
+
+    def start(self, threads: int = 1):
+        """Run ``threads`` polling loops inside the current process"""
+        self._stop.clear()
+        for i in range(threads):
+            thread = threading.Thread(
+                target=self.run_forever, name=f"embedding-worker-{i}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+
+embedding_worker = EmbeddingWorker(
+    batch_size=settings.embedding_worker_batch_size,
+    poll_interval=settings.embedding_worker_poll_interval,
+    max_attempts=settings.embedding_job_max_attempts,
+    retention=settings.embedding_job_retention,
+)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    try:
+        embedding_worker.run_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,329 @@
+"""
+Maintains the movie_neighbors table: the top-K most similar movies of every
+movie per vector type, so similar-movie reads become one indexed lookup.
+
+Writes only queue the movies whose vectors changed (movie_neighbor_refresh_queue,
+in the writer's transaction). A background pass, started in the API lifespan,
+claims queued movies and recomputes the affected lists.
+
+Rebuild the whole table with:
+
+    python -m app.services.neighbor_service
+"""
+
+from sqlalchemy import insert, text
+from sqlalchemy.orm import Session
+from typing import Dict, Iterable, List, Optional, Set
+from uuid import UUID
+import logging
+import threading
+
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..models.movie import Movie
+from ..models.movie_neighbor import MovieNeighbor, MovieNeighborRefresh
+from .ann_index import VECTOR_TYPES
+
+logger = logging.getLogger(__name__)
+
+# First key of the transaction-level advisory locks taken per movie id before
+# its neighbour lists are rewritten
+NEIGHBOR_LOCK_CLASS = 20_251_017
+
+
+class NeighborService:
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def enabled(self) -> bool:
+        return settings.neighbor_table_enabled
+
+    def _recompute(
+        self, db: Session, vector_type: str, movie_ids: Optional[List[UUID]] = None
+    ):
+        """Replace the neighbour lists of ``movie_ids`` (all movies if None).
+
+        Upserts the new (movie_id, vector_type, rank) rows, skipping unchanged
+        ones, and deletes ranks a list no longer has.
+        """
+        column = f"{vector_type}_vector"
+        params = {"vector_type": vector_type, "k": settings.neighbor_top_k}
+        delete_scope = scope = ""
+        if movie_ids is not None:
+            if not movie_ids:
+                return
+            params["movie_ids"] = [str(movie_id) for movie_id in movie_ids]
+            delete_scope = "AND stored.movie_id = ANY(CAST(:movie_ids AS uuid[]))"
+            scope = "AND ref.id = ANY(CAST(:movie_ids AS uuid[]))"
+
+        db.execute(
+            text(
+                f"""
+                WITH fresh AS (
+                    SELECT ref.id as movie_id,
+                        row_number() OVER (
+                            PARTITION BY ref.id ORDER BY n.distance
+                        ) as rank,
+                        n.id as neighbor_id, n.distance
+                    FROM movies ref
+                    CROSS JOIN LATERAL (
+                        SELECT m.id, (m.{column} <=> ref.{column}) as distance
+                        FROM movies m
+                        WHERE m.{column} IS NOT NULL AND m.id <> ref.id
+                        ORDER BY m.{column} <=> ref.{column}
+                        LIMIT :k
+                    ) n
+                    WHERE ref.{column} IS NOT NULL {scope}
+                ),
+                upserted AS (
+                    INSERT INTO movie_neighbors
+                        (movie_id, vector_type, rank, neighbor_id, distance)
+                    SELECT movie_id, :vector_type, rank, neighbor_id, distance
+                    FROM fresh
+                    ON CONFLICT (movie_id, vector_type, rank) DO UPDATE
+                    SET neighbor_id = excluded.neighbor_id,
+                        distance = excluded.distance
+                    WHERE (movie_neighbors.neighbor_id, movie_neighbors.distance)
+                        IS DISTINCT FROM (excluded.neighbor_id, excluded.distance)
+                )
+                DELETE FROM movie_neighbors stored
+                WHERE stored.vector_type = :vector_type {delete_scope}
+                    AND NOT EXISTS (
+                        SELECT 1 FROM fresh
+                        WHERE fresh.movie_id = stored.movie_id
+                            AND fresh.rank = stored.rank
+                    )
+            """
+            ),
+            params,
+        )
+
+    def _affected_by(
+        self, db: Session, vector_type: str, movie_ids: List[UUID]
+    ) -> Set[UUID]:
+        """Movies whose neighbour list may change when ``movie_ids``' vectors do.
+
+        That is every movie that currently lists one of them, plus the movies
+        among each new vector's ``neighbor_refresh_candidates`` nearest (an
+        index scan, not a table scan) that it is closer to than their current
+        K-th neighbour.
+        """
+        column = f"{vector_type}_vector"
+        result = db.execute(
+            text(
+                f"""
+                SELECT candidate.id
+                FROM movies changed
+                CROSS JOIN LATERAL (
+                    SELECT ref.id, (ref.{column} <=> changed.{column}) as distance
+                    FROM movies ref
+                    WHERE ref.{column} IS NOT NULL AND ref.id <> changed.id
+                    ORDER BY ref.{column} <=> changed.{column}
+                    LIMIT :candidates
+                ) candidate
+                CROSS JOIN LATERAL (
+                    SELECT max(distance) as worst, count(*) as size
+                    FROM movie_neighbors
+                    WHERE movie_id = candidate.id AND vector_type = :vector_type
+                ) current
+                WHERE changed.id = ANY(CAST(:movie_ids AS uuid[]))
+                    AND changed.{column} IS NOT NULL
+                    AND (current.size < :k OR candidate.distance < current.worst)
+                UNION
+                SELECT movie_id FROM movie_neighbors
+                WHERE vector_type = :vector_type
+                    AND neighbor_id = ANY(CAST(:movie_ids AS uuid[]))
+            """
+            ),
+            {
+                "vector_type": vector_type,
+                "movie_ids": [str(movie_id) for movie_id in movie_ids],
+                "k": settings.neighbor_top_k,
+                "candidates": settings.neighbor_refresh_candidates,
+            },
+        )
+        return {row[0] for row in result}
+
+    def _lock(self, db: Session, movie_ids: Iterable[UUID]):
+        """Take the advisory locks of ``movie_ids`` in key order.
+
+        Concurrent passes rewriting overlapping lists then wait for each other
+        instead of deadlocking or colliding on the same ranks.
+        """
+        db.execute(
+            text(
+                """
+                SELECT pg_advisory_xact_lock(:lock_class, keys.key)
+                FROM (
+                    SELECT DISTINCT hashtext(id::text) as key
+                    FROM unnest(CAST(:movie_ids AS uuid[])) id
+                    ORDER BY key
+                ) keys
+            """
+            ),
+            {
+                "lock_class": NEIGHBOR_LOCK_CLASS,
+                "movie_ids": [str(movie_id) for movie_id in movie_ids],
+            },
+        )
+
+    def rebuild(self, db: Session, vector_types: Iterable[str] = VECTOR_TYPES):
+        """Recompute every neighbour list (bulk job)"""
+        # Background passes wait until the rebuild commits
+        db.execute(text("LOCK TABLE movie_neighbors IN SHARE ROW EXCLUSIVE MODE"))
+        for vector_type in vector_types:
+            self._recompute(db, vector_type)
+            logger.info(f"Rebuilt {vector_type} neighbour lists")
+        db.commit()
+
+    def queue_refresh(self, db: Session, movie_ids: List[UUID]):
+        """Queue neighbour refreshes for movies whose vectors changed.
+
+        One multi-row INSERT in the caller's transaction; the caller commits.
+        """
+        if not self.enabled or not movie_ids:
+            return
+        db.execute(
+            insert(MovieNeighborRefresh),
+            [{"movie_id": movie_id} for movie_id in movie_ids],
+        )
+
+    def queue_dependents(self, db: Session, movie_id: UUID):
+        """Queue the movies listing ``movie_id``, before it is deleted.
+
+        Runs in the caller's transaction, so the queue entries commit together
+        with the delete.
+        """
+        if not self.enabled:
+            return
+        db.execute(
+            text(
+                """
+                INSERT INTO movie_neighbor_refresh_queue (movie_id)
+                SELECT DISTINCT movie_id FROM movie_neighbors
+                WHERE neighbor_id = :movie_id AND movie_id <> :movie_id
+            """
+            ),
+            {"movie_id": str(movie_id)},
+        )
+
+    def refresh_movies(self, db: Session, movie_ids: List[UUID]):
+        """Update neighbour lists after the vectors of ``movie_ids`` changed.
+
+        Runs inside the caller's transaction; the caller commits.
+        """
+        if not movie_ids:
+            return
+
+        affected: Dict[str, Set[UUID]] = {}
+        for vector_type in VECTOR_TYPES:
+            affected[vector_type] = set(movie_ids) | self._affected_by(
+                db, vector_type, movie_ids
+            )
+        self._lock(db, set().union(*affected.values()))
+        for vector_type, ids in affected.items():
+            self._recompute(db, vector_type, list(ids))
+
+    def process_pending(self, limit: Optional[int] = None) -> int:
+        """Claim up to ``limit`` queued entries and refresh their movies.
+
+        Entries other passes hold are skipped. On error the entries stay
+        queued for the next pass. Returns the number of entries processed.
+        """
+        db = self.session_factory()
+        try:
+            entries = (
+                db.query(MovieNeighborRefresh)
+                .order_by(MovieNeighborRefresh.id)
+                .limit(limit or settings.neighbor_refresh_batch_size)
+                .with_for_update(skip_locked=True)
+                .all()
+            )
+            if not entries:
+                db.rollback()
+                return 0
+
+            try:
+                self.refresh_movies(db, list({entry.movie_id for entry in entries}))
+                db.query(MovieNeighborRefresh).filter(
+                    MovieNeighborRefresh.id.in_([entry.id for entry in entries])
+                ).delete(synchronize_session=False)
+                db.commit()
+            except Exception as e:
+                logger.error(f"Error refreshing neighbour lists: {e}")
+                db.rollback()
+                return 0
+            return len(entries)
+        finally:
+            db.close()
+
+    def _refresh_forever(self, interval: float):
+        while not self._stop.is_set():
+            try:
+                processed = self.process_pending()
+            except Exception as e:
+                logger.error(f"Neighbour refresh error: {e}")
+                processed = 0
+            if not processed:
+                self._stop.wait(interval)
+
+    def start(self, interval: float):
+        """Drain the refresh queue, polling every ``interval`` seconds when
+        it is empty, in a daemon thread"""
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._refresh_forever,
+            args=(interval,),
+            name="neighbor-refresh",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def get_neighbors(
+        self, db: Session, movie_id: UUID, limit: int, vector_type: str
+    ) -> List[tuple]:
+        """(Movie, distance) pairs from the precomputed list, closest first.
+
+        Lists hold ``neighbor_top_k`` entries, so ``limit`` must not exceed it.
+        """
+        if limit > settings.neighbor_top_k:
+            raise ValueError(
+                f"limit {limit} exceeds the {settings.neighbor_top_k} "
+                f"precomputed neighbours"
+            )
+        return (
+            db.query(Movie, MovieNeighbor.distance)
+            .join(MovieNeighbor, MovieNeighbor.neighbor_id == Movie.id)
+            .filter(
+                MovieNeighbor.movie_id == movie_id,
+                MovieNeighbor.vector_type == vector_type,
+            )
+            .order_by(MovieNeighbor.rank)
+            .limit(limit)
+            .all()
+        )
+
+
+neighbor_service = NeighborService()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    db = SessionLocal()
+    try:
+        neighbor_service.rebuild(db)
+    finally:
+        db.close()
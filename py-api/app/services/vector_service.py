@@ -1,21 +1,172 @@
-from typing import List
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Tuple, Union
+import asyncio
+import logging
+import os
+import queue
+import threading
+import time
+
 import numpy as np
 from sentence_transformers import SentenceTransformer
-import logging
+
+from ..core.cache import TTLCache
+from ..core.config import settings
+from .embedding_cache import EmbeddingCache, cache_key, normalize_text
+from .embedding_server import EmbeddingClient
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_SIMILARITY_CHUNK_SIZE = 65536
+
+
+def movie_vector_texts(
+    title: Optional[str],
+    synopsis: Optional[str],
+    title_changed: bool = True,
+    synopsis_changed: bool = True,
+) -> Dict[str, str]:
+    """Map each movie vector column that needs refreshing to the text it embeds"""
+    texts = {}
+    if title_changed and title:
+        texts["title_vector"] = title
+    if synopsis_changed and synopsis:
+        texts["synopsis_vector"] = synopsis
+    if (title_changed or synopsis_changed) and title and synopsis:
+        texts["combined_vector"] = f"{title} {synopsis}"
+    return texts
+
+
+class EmbeddingBatcher:
+    """Coalesces concurrent embedding requests into shared model batches.
+
+    Callers submit single texts and get a Future back. A background thread
+    waits up to ``max_wait_ms`` after the first pending request (or until
+    ``max_batch_size`` requests are queued), runs one ``encode`` call for the
+    group and resolves every caller's future with its row of the result.
+    """
+
+    def __init__(
+        self,
+        encode: Callable[[List[str]], np.ndarray],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+    ):
+        self.encode = encode
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: "queue.Queue[Tuple[str, Future]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    def _ensure_started(self):
+        # Threads do not survive gunicorn's fork, so start one per process
+        with self._lock:
+            if (
+                self._thread is None
+                or not self._thread.is_alive()
+                or self._pid != os.getpid()
+            ):
+                self._queue = queue.Queue()
+                self._pid = os.getpid()
+                self._thread = threading.Thread(
+                    target=self._run, name="embedding-batcher", daemon=True
+                )
+                self._thread.start()
+
+    def submit(self, text: str) -> Future:
+        self._ensure_started()
+        future: Future = Future()
+        self._queue.put((text, future))
+        return future
+
+    def embed(self, text: str, timeout: Optional[float] = None) -> np.ndarray:
+        """Blocking embed for sync endpoints"""
+        return self.submit(text).result(timeout)
+
+    def embed_many(
+        self, texts: List[str], timeout: Optional[float] = None
+    ) -> List[np.ndarray]:
+        futures = [self.submit(text) for text in texts]
+        return [future.result(timeout) for future in futures]
+
+    async def embed_async(self, text: str) -> np.ndarray:
+        """Awaitable embed for async code; does not block the event loop"""
+        return await asyncio.wrap_future(self.submit(text))
+
+    def _collect(self) -> List[Tuple[str, Future]]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            pending = [item for item in batch if item[1].set_running_or_notify_cancel()]
+            if not pending:
+                continue
+            try:
+                embeddings = self.encode([text for text, _ in pending])
+                for (_, future), embedding in zip(pending, embeddings):
+                    future.set_result(embedding)
+            except Exception as e:
+                logger.error(f"Error encoding embedding batch: {e}")
+                for _, future in pending:
+                    future.set_exception(e)
+
 
 class VectorService:
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+    def __init__(
+        self,
+        model_name: str = "all-MiniLM-L6-v2",
+        cache: Optional[EmbeddingCache] = None,
+    ):
         """Initialize with a sentence transformer model"""
+        self.model_name = model_name
+        self.cache = cache or EmbeddingCache(
+            max_size=settings.embedding_cache_size,
+            disk_path=settings.embedding_cache_path,
+            disk_slots=settings.embedding_cache_disk_slots,
+            dim=settings.vector_dimension,
+        )
+        self.query_cache = TTLCache(
+            max_size=settings.query_embedding_cache_size,
+            ttl=settings.query_embedding_cache_ttl,
+        )
         try:
-            self.model = SentenceTransformer(model_name)
+            if settings.embedding_server_socket:
+                # Share the model owned by the host's embedding server
+                self.model = EmbeddingClient(settings.embedding_server_socket)
+            else:
+                self.model = SentenceTransformer(model_name)
             logger.info(f"Vector service initialized with model: {model_name}")
         except Exception as e:
             logger.error(f"Error initializing vector service: {e}")
             self.model = None
 
+        self.batcher = None
+        if self.model and settings.embedding_batching_enabled:
+            self.batcher = EmbeddingBatcher(
+                self.model.encode,
+                max_batch_size=settings.embedding_batch_max_size,
+                max_wait_ms=settings.embedding_batch_wait_ms,
+            )
+
+    def _encode(self, texts: List[str]) -> List[np.ndarray]:
+        """Run the model, sharing a batch with concurrent callers when enabled"""
+        if self.batcher:
+            return self.batcher.embed_many(texts)
+        return list(self.model.encode(texts))
+
     def generate_embedding(self, text: str) -> List[float]:
         """Generate vector embedding for text"""
         if not self.model:
@@ -28,25 +179,113 @@ class VectorService:
             if not text:
                 return [0.0] * 384
 
-            # Generate embedding
-            embedding = self.model.encode(text)
+            # Reuse the embedding if this text was seen before
+            key = cache_key(self.model_name, text)
+            embedding = self.cache.get(key)
+            if embedding is None:
+                embedding = self._encode([normalize_text(text)])[0]
+                self.cache.put(key, embedding)
             return embedding.tolist()
         except Exception as e:
             logger.error(f"Error generating embedding: {e}")
             return [0.0] * 384
 
-    def generate_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings for multiple texts"""
+    def generate_embeddings_batch(
+        self, texts: List[str], as_numpy: bool = False, raise_on_error: bool = False
+    ) -> Union[List[List[float]], np.ndarray]:
+        """Generate embeddings for multiple texts in a single model pass.
+
+        Duplicate texts are encoded once. With ``as_numpy`` the result is a
+        float32 array of shape (len(texts), 384) instead of Python lists.
+        A missing model or encode error gives zero vectors, or raises with
+        ``raise_on_error`` (callers that must not store zero vectors).
+        """
         if not self.model:
+            if raise_on_error:
+                raise RuntimeError("Vector model not available")
             logger.warning("Vector model not available, returning zero vectors")
-            return [[0.0] * 384 for _ in texts]
+            return self._zero_vectors(len(texts), as_numpy)
 
         try:
-            embeddings = self.model.encode(texts)
-            return [emb.tolist() for emb in embeddings]
+            keys = [cache_key(self.model_name, text) for text in texts]
+            unique = {key: self.cache.get(key) for key in dict.fromkeys(keys)}
+
+            # Only run the model for texts missing from the cache
+            missing = [key for key, emb in unique.items() if emb is None]
+            if missing:
+                texts_by_key = dict(zip(keys, texts))
+                encoded = self._encode(
+                    [normalize_text(texts_by_key[key]) for key in missing]
+                )
+                for key, emb in zip(missing, encoded):
+                    self.cache.put(key, emb)
+                    unique[key] = emb
+
+            embeddings = np.asarray([unique[key] for key in keys], dtype=np.float32)
+            if as_numpy:
+                return embeddings.reshape(len(texts), -1)
+            return embeddings.tolist()
         except Exception as e:
             logger.error(f"Error generating batch embeddings: {e}")
-            return [[0.0] * 384 for _ in texts]
+            if raise_on_error:
+                raise
+            return self._zero_vectors(len(texts), as_numpy)
+
+    def _zero_vectors(
+        self, count: int, as_numpy: bool
+    ) -> Union[List[List[float]], np.ndarray]:
+        if as_numpy:
+            return np.zeros((count, 384), dtype=np.float32)
+        return [[0.0] * 384 for _ in range(count)]
+
+    def generate_movie_vectors(
+        self, movie_texts: List[Dict[str, str]], raise_on_error: bool = False
+    ) -> List[Dict[str, np.ndarray]]:
+        """Embed the texts of many movies (see movie_vector_texts) in one batch"""
+        flat = [text for texts in movie_texts for text in texts.values()]
+        if not flat:
+            return [{} for _ in movie_texts]
+
+        embeddings = iter(
+            self.generate_embeddings_batch(
+                flat, as_numpy=True, raise_on_error=raise_on_error
+            )
+        )
+        return [{column: next(embeddings) for column in texts} for texts in movie_texts]
+
+    async def generate_embedding_async(self, text: str) -> List[float]:
+        """Async variant of generate_embedding for use from coroutines"""
+        if self.model and self.batcher and text.strip():
+            key = cache_key(self.model_name, text)
+            embedding = self.cache.get(key)
+            if embedding is None:
+                try:
+                    embedding = await self.batcher.embed_async(normalize_text(text))
+                except Exception as e:
+                    logger.error(f"Error generating embedding: {e}")
+                    return [0.0] * 384
+                self.cache.put(key, embedding)
+            return embedding.tolist()
+
+        return await asyncio.to_thread(self.generate_embedding, text)
+
+    def generate_query_embedding(self, query: str) -> List[float]:
+        """Embed a search query; popular queries stay in a small TTL/LRU cache"""
+        key = normalize_text(query)
+        embedding = self.query_cache.get(key)
+        if embedding is None:
+            embedding = self.generate_embedding(query)
+            if any(embedding):  # don't cache the zero-vector fallback
+                self.query_cache.set(key, embedding)
+        return embedding
+
+    def cache_stats(self) -> dict:
+        """Hit/miss counters of the embedding cache"""
+        return self.cache.stats()
+
+    def query_cache_stats(self) -> dict:
+        """Hit/miss counters of the search-query embedding cache"""
+        return self.query_cache.stats()
 
     def calculate_similarity(self, vector1: List[float], vector2: List[float]) -> float:
         """Calculate cosine similarity between two vectors"""
@@ -68,5 +307,105 @@ class VectorService:
             logger.error(f"Error calculating similarity: {e}")
             return 0.0
 
+    @staticmethod
+    def normalize(vectors) -> np.ndarray:
+        """Return float32 rows scaled to unit length; zero rows stay zero"""
+        matrix = np.array(vectors, dtype=np.float32, ndmin=2)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+    def similarity_one_to_many(
+        self, query, candidates, normalized: bool = False
+    ) -> np.ndarray:
+        """Cosine similarity of one vector against every row of ``candidates``"""
+        return self.similarity_many_to_many(
+            np.asarray(query, dtype=np.float32).reshape(1, -1),
+            candidates,
+            normalized=normalized,
+        )[0]
+
+    def similarity_many_to_many(
+        self,
+        queries,
+        candidates,
+        normalized: bool = False,
+        chunk_size: int = DEFAULT_SIMILARITY_CHUNK_SIZE,
+    ) -> np.ndarray:
+        """Cosine similarity matrix of shape (len(queries), len(candidates)).
+
+        Pass ``normalized=True`` when both inputs already have unit-length rows
+        (see ``normalize``) to skip re-normalizing them on every call.
+        Otherwise candidates are normalized one chunk at a time, so the only
+        copy of them held at once is a chunk.
+        """
+        # No copy for float32 arrays
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        candidates = np.atleast_2d(np.asarray(candidates, dtype=np.float32))
+        if not normalized:
+            queries = self.normalize(queries)
+
+        result = np.empty((len(queries), len(candidates)), dtype=np.float32)
+        for start in range(0, len(candidates), chunk_size):
+            end = start + chunk_size
+            chunk = candidates[start:end]
+            if not normalized:
+                chunk = self.normalize(chunk)
+            np.matmul(queries, chunk.T, out=result[:, start:end])
+        return result
+
+    def top_k_similar(
+        self,
+        queries,
+        candidates,
+        k: int = 10,
+        normalized: bool = False,
+        chunk_size: int = DEFAULT_SIMILARITY_CHUNK_SIZE,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Indices and scores of the ``k`` most similar candidates per query.
+
+        Candidates are scanned in chunks and only a running top-k is kept, so
+        memory stays at O(len(queries) * (chunk_size + k)) however many
+        candidates there are. Both returned arrays are sorted best first.
+        """
+        if not normalized:
+            queries = self.normalize(queries)
+        else:
+            queries = np.asarray(queries, dtype=np.float32).reshape(
+                -1, np.shape(candidates)[1]
+            )
+
+        k = min(k, len(candidates))
+        best_scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+        best_indices = np.empty((len(queries), 0), dtype=np.int64)
+
+        for start in range(0, len(candidates), chunk_size):
+            chunk = candidates[start : start + chunk_size]
+            if normalized:
+                chunk = np.asarray(chunk, dtype=np.float32)
+            else:
+                chunk = self.normalize(chunk)
+            scores = np.concatenate([best_scores, queries @ chunk.T], axis=1)
+            indices = np.concatenate(
+                [
+                    best_indices,
+                    np.broadcast_to(
+                        np.arange(start, start + len(chunk)), (len(queries), len(chunk))
+                    ),
+                ],
+                axis=1,
+            )
+            if scores.shape[1] > k:
+                keep = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+                scores = np.take_along_axis(scores, keep, axis=1)
+                indices = np.take_along_axis(indices, keep, axis=1)
+            best_scores, best_indices = scores, indices
+
+        order = np.argsort(-best_scores, axis=1, kind="stable")
+        return (
+            np.take_along_axis(best_indices, order, axis=1),
+            np.take_along_axis(best_scores, order, axis=1),
+        )
+
 
 vector_service = VectorService()
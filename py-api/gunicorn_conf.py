@@ -4,6 +4,8 @@ import os
 bind = "0.0.0.0:8000"
 backlog = 2048
 
+# Each worker loads its own embedding model unless EMBEDDING_SERVER_SOCKET points
+# at a shared `python -m app.services.embedding_server` process.
 workers = multiprocessing.cpu_count() * 2 + 1
 worker_class = "uvicorn.workers.UvicornWorker"
 worker_connections = 1000
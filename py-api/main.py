@@ -4,8 +4,14 @@ from contextlib import asynccontextmanager
 import logging
 
 from app.core.config import settings
-from app.core.database import init_db
+from app.core.database import init_db, SessionLocal
+from app.services.ann_index import ann_index_service
+from app.services.autocomplete import autocomplete_service
+from app.services.vector_service import vector_service
+from app.services.embedding_worker import embedding_worker
+from app.services.neighbor_service import neighbor_service
 from app.controllers.movie_controller import router as movie_router
+from app.handlers.movie_handler import movie_handler
 
 # Configure logging
 logging.basicConfig(
@@ -25,10 +31,42 @@ async def lifespan(app: FastAPI):
         logger.error(f"Failed to initialize database: {e}")
         raise
 
+    if settings.vector_search_backend == "hnsw":
+        db = SessionLocal()
+        try:
+            ann_index_service.load(db)
+        except Exception as e:
+            logger.error(f"Failed to load HNSW index, using pgvector: {e}")
+        finally:
+            db.close()
+        if settings.hnsw_refresh_interval > 0:
+            # Picks up writes made by other workers and the embedding worker
+            ann_index_service.start(
+                settings.hnsw_refresh_interval, settings.hnsw_rebuild_interval
+            )
+
+    if settings.autocomplete_enabled:
+        try:
+            autocomplete_service.refresh()
+        except Exception as e:
+            logger.error(f"Failed to load autocomplete index, using SQL: {e}")
+        if settings.autocomplete_refresh_interval > 0:
+            autocomplete_service.start(settings.autocomplete_refresh_interval)
+
+    if settings.embedding_mode == "async" and settings.embedding_worker_threads > 0:
+        embedding_worker.start(settings.embedding_worker_threads)
+
+    if settings.neighbor_table_enabled and settings.neighbor_refresh_interval > 0:
+        neighbor_service.start(settings.neighbor_refresh_interval)
+
     yield
 
     # Shutdown
     logger.info("Shutting down IMDb API...")
+    embedding_worker.stop(timeout=5)
+    neighbor_service.stop(timeout=5)
+    autocomplete_service.stop(timeout=5)
+    ann_index_service.stop(timeout=5)
 
 
 app = FastAPI(
@@ -66,6 +104,16 @@ async def health_check():
     return {"status": "healthy", "version": settings.version}
 
 
+@app.get("/stats")
+async def stats():
+    return {
+        "embedding_cache": vector_service.cache_stats(),
+        "query_embedding_cache": vector_service.query_cache_stats(),
+        "count_cache": movie_handler.count_cache.stats(),
+        "facets_cache": movie_handler.facets_cache.stats(),
+    }
+
+
 if __name__ == "__main__":
     import uvicorn
 
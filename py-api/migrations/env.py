@@ -9,6 +9,8 @@ sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from app.core.database import Base
 from app.models.movie import Movie
+from app.models.embedding_job import EmbeddingJob
+from app.models.movie_neighbor import MovieNeighbor, MovieNeighborRefresh
 
 # this is the Alembic Config object
 config = context.config
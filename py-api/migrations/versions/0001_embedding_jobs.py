@@ -0,0 +1,80 @@
+"""Add movie embedding status and embedding job queue
+
+Revision ID: 0001_embedding_jobs
+Revises:
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "0001_embedding_jobs"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The movies table itself is created by init_db() on first start
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("movies"):
+        return
+
+    columns = [column["name"] for column in inspector.get_columns("movies")]
+    if "embedding_status" not in columns:
+        op.add_column(
+            "movies",
+            sa.Column(
+                "embedding_status",
+                sa.String(length=20),
+                nullable=False,
+                server_default="pending",
+            ),
+        )
+        op.execute(
+            "UPDATE movies SET embedding_status = 'ready' "
+            "WHERE title_vector IS NOT NULL"
+        )
+
+    if not inspector.has_table("embedding_jobs"):
+        op.create_table(
+            "embedding_jobs",
+            sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column(
+                "movie_id",
+                postgresql.UUID(as_uuid=True),
+                sa.ForeignKey("movies.id", ondelete="CASCADE"),
+                nullable=False,
+            ),
+            sa.Column("status", sa.String(length=20), nullable=False),
+            sa.Column("attempts", sa.Integer(), nullable=False),
+            sa.Column("last_error", sa.Text()),
+            sa.Column(
+                "run_after",
+                sa.DateTime(timezone=True),
+                nullable=False,
+                server_default=sa.func.now(),
+            ),
+            sa.Column(
+                "created_at",
+                sa.DateTime(timezone=True),
+                nullable=False,
+                server_default=sa.func.now(),
+            ),
+            sa.Column(
+                "updated_at",
+                sa.DateTime(timezone=True),
+                nullable=False,
+                server_default=sa.func.now(),
+            ),
+        )
+        op.create_index("ix_embedding_jobs_movie_id", "embedding_jobs", ["movie_id"])
+        op.create_index("ix_embedding_jobs_status", "embedding_jobs", ["status"])
+
+
+def downgrade() -> None:
+    op.drop_table("embedding_jobs")
+    op.drop_column("movies", "embedding_status")
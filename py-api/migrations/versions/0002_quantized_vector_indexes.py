@@ -0,0 +1,52 @@
+"""Add the compact HNSW indexes of the configured vector quantization mode
+
+Revision ID: 0002_quantized_vector_indexes
+Revises: 0001_embedding_jobs
+Create Date: 2026-10-17 00:00:00.000000
+
+Requires pgvector >= 0.7.0. Only VECTOR_QUANTIZATION's indexes are created
+(none for "none"); scripts/quantized_indexes.py switches them after a mode
+change. The compact forms only live in the indexes, so the full-precision
+columns stay the source of truth for exact re-ranking.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+
+# revision identifiers, used by Alembic.
+revision = "0002_quantized_vector_indexes"
+down_revision = "0001_embedding_jobs"
+branch_labels = None
+depends_on = None
+
+VECTOR_TYPES = ("title", "synopsis", "combined")
+DIMENSION = 384
+
+# Same as app.crud.movie.QUANTIZED_INDEXES
+QUANTIZED_INDEXES = {
+    "halfvec": ("half", "({column}::halfvec({dim})) halfvec_cosine_ops"),
+    "binary": ("bit", "(binary_quantize({column})::bit({dim})) bit_hamming_ops"),
+}
+
+
+def upgrade() -> None:
+    if not sa.inspect(op.get_bind()).has_table("movies"):
+        return
+    if settings.vector_quantization not in QUANTIZED_INDEXES:
+        return
+
+    suffix, expression = QUANTIZED_INDEXES[settings.vector_quantization]
+    for vector_type in VECTOR_TYPES:
+        column = f"{vector_type}_vector"
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_movies_{column}_{suffix} ON movies "
+            f"USING hnsw ({expression.format(column=column, dim=DIMENSION)})"
+        )
+
+
+def downgrade() -> None:
+    for suffix, _ in QUANTIZED_INDEXES.values():
+        for vector_type in VECTOR_TYPES:
+            op.execute(f"DROP INDEX IF EXISTS idx_movies_{vector_type}_vector_{suffix}")
@@ -0,0 +1,50 @@
+"""Add materialized top-K movie_neighbors table
+
+Revision ID: 0003_movie_neighbors
+Revises: 0002_quantized_vector_indexes
+Create Date: 2026-10-17 00:00:00.000000
+
+Fill it afterwards with: python -m app.services.neighbor_service
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "0003_movie_neighbors"
+down_revision = "0002_quantized_vector_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("movies") or inspector.has_table("movie_neighbors"):
+        return
+
+    op.create_table(
+        "movie_neighbors",
+        sa.Column(
+            "movie_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("movies.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("vector_type", sa.String(length=20), primary_key=True),
+        sa.Column("rank", sa.Integer(), primary_key=True),
+        sa.Column(
+            "neighbor_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("movies.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("distance", sa.Float(), nullable=False),
+    )
+    op.create_index(
+        "ix_movie_neighbors_neighbor_id", "movie_neighbors", ["neighbor_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("movie_neighbors")
@@ -0,0 +1,58 @@
+"""Replace search_vector text with a weighted generated tsvector column
+
+Revision ID: 0004_weighted_search_vector
+Revises: 0003_movie_neighbors
+Create Date: 2026-10-17 00:00:00.000000
+
+Adding a STORED generated column rewrites the table, which backfills
+search_vector for every existing movie.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0004_weighted_search_vector"
+down_revision = "0003_movie_neighbors"
+branch_labels = None
+depends_on = None
+
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(director, '')), 'B') || "
+    "setweight(json_to_tsvector('english', coalesce(\"cast\", '[]'::json), "
+    "'[\"string\"]'), 'B') || "
+    "setweight(to_tsvector('english', coalesce(synopsis, '')), 'C')"
+)
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("movies"):
+        return
+
+    columns = {c["name"]: c for c in inspector.get_columns("movies")}
+    if "search_vector" in columns and columns["search_vector"].get("computed"):
+        return
+
+    op.execute("DROP INDEX IF EXISTS idx_movies_title")
+    op.execute("DROP INDEX IF EXISTS idx_movies_synopsis")
+    if "search_vector" in columns:
+        op.drop_column("movies", "search_vector")
+    op.execute(
+        f"ALTER TABLE movies ADD COLUMN search_vector tsvector "
+        f"GENERATED ALWAYS AS ({SEARCH_VECTOR_EXPRESSION}) STORED"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_movies_search_vector "
+        "ON movies USING gin (search_vector)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_movies_search_vector")
+    op.drop_column("movies", "search_vector")
+    op.add_column("movies", sa.Column("search_vector", sa.Text()))
+    op.execute(
+        "UPDATE movies SET search_vector = concat_ws(' ', title, synopsis, director)"
+    )
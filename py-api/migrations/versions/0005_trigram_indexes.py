@@ -0,0 +1,36 @@
+"""Add pg_trgm GIN indexes on movie title and director
+
+Revision ID: 0005_trigram_indexes
+Revises: 0004_weighted_search_vector
+Create Date: 2026-10-17 00:00:00.000000
+
+The indexes serve both substring (ILIKE '%...%') and fuzzy (%) filters.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0005_trigram_indexes"
+down_revision = "0004_weighted_search_vector"
+branch_labels = None
+depends_on = None
+
+COLUMNS = ("title", "director")
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    if not sa.inspect(op.get_bind()).has_table("movies"):
+        return
+
+    for column in COLUMNS:
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_movies_{column}_trgm ON movies "
+            f"USING gin ({column} gin_trgm_ops)"
+        )
+
+
+def downgrade() -> None:
+    for column in COLUMNS:
+        op.execute(f"DROP INDEX IF EXISTS idx_movies_{column}_trgm")
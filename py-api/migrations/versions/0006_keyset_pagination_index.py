@@ -0,0 +1,26 @@
+"""Add (title, id) index for keyset pagination of movie listings
+
+Revision ID: 0006_keyset_pagination_index
+Revises: 0005_trigram_indexes
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0006_keyset_pagination_index"
+down_revision = "0005_trigram_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if not sa.inspect(op.get_bind()).has_table("movies"):
+        return
+
+    op.execute("CREATE INDEX IF NOT EXISTS idx_movies_title_id ON movies (title, id)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_movies_title_id")
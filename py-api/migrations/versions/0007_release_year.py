@@ -0,0 +1,46 @@
+"""Add generated release_year column and browse filter indexes
+
+Revision ID: 0007_release_year
+Revises: 0006_keyset_pagination_index
+Create Date: 2026-10-17 00:00:00.000000
+
+Adding a STORED generated column rewrites the table, which backfills
+release_year for every existing movie.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0007_release_year"
+down_revision = "0006_keyset_pagination_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gin")
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("movies"):
+        return
+
+    columns = {c["name"] for c in inspector.get_columns("movies")}
+    if "release_year" not in columns:
+        op.execute(
+            "ALTER TABLE movies ADD COLUMN release_year integer "
+            "GENERATED ALWAYS AS (EXTRACT(year FROM release_date)::integer) STORED"
+        )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_movies_year_rating "
+        "ON movies (release_year, imdb_rating)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_movies_genres_year_rating "
+        "ON movies USING gin (genres, release_year, imdb_rating)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_movies_genres_year_rating")
+    op.execute("DROP INDEX IF EXISTS idx_movies_year_rating")
+    op.drop_column("movies", "release_year")
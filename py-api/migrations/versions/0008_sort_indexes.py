@@ -0,0 +1,44 @@
+"""Add (sort key, id) indexes for sorted movie listings
+
+Revision ID: 0008_sort_indexes
+Revises: 0007_release_year
+Create Date: 2026-10-17 00:00:00.000000
+
+Each sortable nullable column gets one index per direction, keyed on the column
+with NULL replaced by a sentinel that sorts last in that direction.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0008_sort_indexes"
+down_revision = "0007_release_year"
+branch_labels = None
+depends_on = None
+
+# column: (NULL sentinel for ascending order, for descending order)
+SORT_NULL_SENTINELS = {
+    "imdb_rating": ("'Infinity'::float8", "'-Infinity'::float8"),
+    "release_date": ("'9999-12-31'::date", "'0001-01-01'::date"),
+    "box_office": ("2147483647", "-2147483648"),
+    "metacritic_score": ("2147483647", "-2147483648"),
+}
+
+
+def upgrade() -> None:
+    if not sa.inspect(op.get_bind()).has_table("movies"):
+        return
+
+    for column, sentinels in SORT_NULL_SENTINELS.items():
+        for direction, sentinel in zip(("asc", "desc"), sentinels):
+            op.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_movies_sort_{column}_{direction} "
+                f"ON movies (coalesce({column}, {sentinel}), id)"
+            )
+
+
+def downgrade() -> None:
+    for column in SORT_NULL_SENTINELS:
+        for direction in ("asc", "desc"):
+            op.execute(f"DROP INDEX IF EXISTS idx_movies_sort_{column}_{direction}")
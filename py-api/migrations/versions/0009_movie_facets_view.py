@@ -0,0 +1,59 @@
+"""Add the movie_facets materialized view
+
+Revision ID: 0009_movie_facets_view
+Revises: 0008_sort_indexes
+Create Date: 2026-10-17 00:00:00.000000
+
+Precomputed unfiltered facet counts, read by GET /movies/facets when
+FACETS_MATERIALIZED_VIEW is enabled. The unique index lets
+scripts/refresh_facets.py refresh it concurrently.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0009_movie_facets_view"
+down_revision = "0008_sort_indexes"
+branch_labels = None
+depends_on = None
+
+MOVIE_FACETS_QUERY = """
+SELECT facet, value, count FROM (
+    SELECT
+        CASE grouping(f.genre, f.language, f.country, f.decade, f.rating)
+            WHEN 15 THEN 'genre' WHEN 23 THEN 'language' WHEN 27 THEN 'country'
+            WHEN 29 THEN 'decade' WHEN 30 THEN 'rating' ELSE 'total'
+        END AS facet,
+        coalesce(
+            f.genre, f.language, f.country, f.decade::text, f.rating::text, ''
+        ) AS value,
+        CASE WHEN grouping(f.genre, f.language, f.country, f.decade, f.rating) = 31
+            THEN count(*) FILTER (WHERE f.n = 1) ELSE count(*)
+        END AS count
+    FROM movies m
+    JOIN unnest(
+        m.genres, m.languages, m.countries,
+        ARRAY[m.release_year / 10 * 10], ARRAY[floor(m.imdb_rating)::integer]
+    ) WITH ORDINALITY AS f(genre, language, country, decade, rating, n) ON true
+    GROUP BY GROUPING SETS (f.genre, f.language, f.country, f.decade, f.rating, ())
+) facets
+WHERE value <> '' OR facet = 'total'
+"""
+
+
+def upgrade() -> None:
+    if not sa.inspect(op.get_bind()).has_table("movies"):
+        return
+
+    op.execute(
+        f"CREATE MATERIALIZED VIEW IF NOT EXISTS movie_facets AS {MOVIE_FACETS_QUERY}"
+    )
+    op.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_movie_facets_facet_value "
+        "ON movie_facets (facet, value)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS movie_facets")
@@ -0,0 +1,40 @@
+"""Add generated content_hash column
+
+Revision ID: 0010_content_hash
+Revises: 0009_movie_facets_view
+Create Date: 2026-10-17 00:00:00.000000
+
+md5 of title and synopsis, the text embeddings are computed from. Upserts
+compare it to skip re-embedding unchanged movies. Adding a STORED generated
+column rewrites the table, which backfills it for every existing movie.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0010_content_hash"
+down_revision = "0009_movie_facets_view"
+branch_labels = None
+depends_on = None
+
+CONTENT_HASH_EXPRESSION = (
+    "md5(coalesce(title, '') || chr(31) || coalesce(synopsis, ''))"
+)
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("movies"):
+        return
+
+    columns = {c["name"] for c in inspector.get_columns("movies")}
+    if "content_hash" not in columns:
+        op.execute(
+            f"ALTER TABLE movies ADD COLUMN content_hash varchar(32) "
+            f"GENERATED ALWAYS AS ({CONTENT_HASH_EXPRESSION}) STORED"
+        )
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE movies DROP COLUMN IF EXISTS content_hash")
@@ -0,0 +1,53 @@
+"""Add movie_neighbor_refresh_queue for background neighbour refreshes
+
+Revision ID: 0011_neighbor_refresh_queue
+Revises: 0010_content_hash
+Create Date: 2026-10-17 00:00:00.000000
+
+Writes queue the movies whose vectors changed; the background pass in
+neighbor_service recomputes the affected movie_neighbors lists.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "0011_neighbor_refresh_queue"
+down_revision = "0010_content_hash"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("movies") or inspector.has_table(
+        "movie_neighbor_refresh_queue"
+    ):
+        return
+
+    op.create_table(
+        "movie_neighbor_refresh_queue",
+        sa.Column("id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column(
+            "movie_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("movies.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "queued_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+    )
+    op.create_index(
+        "ix_movie_neighbor_refresh_queue_movie_id",
+        "movie_neighbor_refresh_queue",
+        ["movie_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("movie_neighbor_refresh_queue")
@@ -0,0 +1,67 @@
+"""Index only cast member names in search_vector
+
+Revision ID: 0012_search_vector_cast_names
+Revises: 0011_neighbor_refresh_queue
+Create Date: 2026-10-17 00:00:00.000000
+
+0004 indexed every string in the cast objects, character names included, so
+searching "joker" matched every film with a Joker. A generated column's
+expression cannot be altered before PostgreSQL 17, so the column is dropped and
+re-added, which rewrites the table and rebuilds it for every movie.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0012_search_vector_cast_names"
+down_revision = "0011_neighbor_refresh_queue"
+branch_labels = None
+depends_on = None
+
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(director, '')), 'B') || "
+    "setweight(jsonb_to_tsvector('english', jsonb_path_query_array("
+    "coalesce(\"cast\", '[]'::json)::jsonb, '$[*].name'), '[\"string\"]'), 'B') || "
+    "setweight(to_tsvector('english', coalesce(synopsis, '')), 'C')"
+)
+
+# As created by 0004_weighted_search_vector
+PREVIOUS_SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(director, '')), 'B') || "
+    "setweight(json_to_tsvector('english', coalesce(\"cast\", '[]'::json), "
+    "'[\"string\"]'), 'B') || "
+    "setweight(to_tsvector('english', coalesce(synopsis, '')), 'C')"
+)
+
+
+def _replace_search_vector(expression: str) -> None:
+    op.execute("DROP INDEX IF EXISTS idx_movies_search_vector")
+    op.execute("ALTER TABLE movies DROP COLUMN IF EXISTS search_vector")
+    op.execute(
+        f"ALTER TABLE movies ADD COLUMN search_vector tsvector "
+        f"GENERATED ALWAYS AS ({expression}) STORED"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_movies_search_vector "
+        "ON movies USING gin (search_vector)"
+    )
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("movies"):
+        return
+
+    columns = {c["name"]: c for c in inspector.get_columns("movies")}
+    computed = columns.get("search_vector", {}).get("computed") or {}
+    if "jsonb_path_query_array" in computed.get("sqltext", ""):
+        return
+
+    _replace_search_vector(SEARCH_VECTOR_EXPRESSION)
+
+
+def downgrade() -> None:
+    _replace_search_vector(PREVIOUS_SEARCH_VECTOR_EXPRESSION)
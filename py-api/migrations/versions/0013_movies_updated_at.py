@@ -0,0 +1,42 @@
+"""Add movies.updated_at for incremental HNSW index syncs
+
+Revision ID: 0013_movies_updated_at
+Revises: 0012_search_vector_cast_names
+Create Date: 2026-10-17 00:00:00.000000
+
+now() is stable, so existing rows take the migration's timestamp without a
+table rewrite.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0013_movies_updated_at"
+down_revision = "0012_search_vector_cast_names"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("movies"):
+        return
+
+    columns = {c["name"] for c in inspector.get_columns("movies")}
+    if "updated_at" not in columns:
+        op.add_column(
+            "movies",
+            sa.Column(
+                "updated_at",
+                sa.DateTime(timezone=True),
+                nullable=False,
+                server_default=sa.func.now(),
+            ),
+        )
+    op.execute("CREATE INDEX IF NOT EXISTS ix_movies_updated_at ON movies (updated_at)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_movies_updated_at")
+    op.execute("ALTER TABLE movies DROP COLUMN IF EXISTS updated_at")
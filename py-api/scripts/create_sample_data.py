@@ -14,6 +14,7 @@ from sqlalchemy.orm import Session
 from app.core.database import SessionLocal, init_db
 from app.schemas.movie import MovieCreate, CastMember
 from app.crud.movie import movie_crud
+from app.handlers.movie_handler import movie_handler
 
 
 def create_sample_movies():
@@ -173,14 +174,11 @@ def create_sample_movies():
     db = SessionLocal()
     try:
         print("Creating sample movies...")
-        for movie_data in sample_movies:
-            existing_movie = movie_crud.get_by_imdb_id(db, movie_data.imdb_id)
-            if existing_movie:
-                print(f"Movie '{movie_data.title}' already exists, skipping...")
-                continue
-
-            movie = movie_crud.create(db, movie_data)
-            print(f"Created movie: {movie.title} (ID: {movie.id})")
+        response = movie_handler.upsert_movies(
+            db, [movie.model_dump(exclude_unset=True) for movie in sample_movies]
+        )
+        for movie_data, result in zip(sample_movies, response.results):
+            print(f"{result.status.capitalize()}: {movie_data.title} (ID: {result.id})")
 
         print(f"\nSample data creation completed!")
         print(f"Total movies in database: {movie_crud.count(db)}")
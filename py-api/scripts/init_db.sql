@@ -1,14 +1,30 @@
 
--- Enable pgvector extension
+-- Enable the pgvector, pg_trgm and btree_gin extensions
 CREATE EXTENSION IF NOT EXISTS vector;
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE EXTENSION IF NOT EXISTS btree_gin;
 
 -- Create indexes for better performance
-CREATE INDEX IF NOT EXISTS idx_movies_title ON movies USING gin(to_tsvector('english', title));
-CREATE INDEX IF NOT EXISTS idx_movies_synopsis ON movies USING gin(to_tsvector('english', synopsis));
+CREATE INDEX IF NOT EXISTS idx_movies_search_vector ON movies USING gin(search_vector);
 CREATE INDEX IF NOT EXISTS idx_movies_director ON movies (director);
+CREATE INDEX IF NOT EXISTS idx_movies_title_trgm ON movies USING gin (title gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_movies_director_trgm ON movies USING gin (director gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_movies_title_id ON movies (title, id);
+
+-- Sorted listings: (sort key, id) per direction, NULLs replaced so they sort last
+CREATE INDEX IF NOT EXISTS idx_movies_sort_imdb_rating_asc ON movies (coalesce(imdb_rating, 'Infinity'::float8), id);
+CREATE INDEX IF NOT EXISTS idx_movies_sort_imdb_rating_desc ON movies (coalesce(imdb_rating, '-Infinity'::float8), id);
+CREATE INDEX IF NOT EXISTS idx_movies_sort_release_date_asc ON movies (coalesce(release_date, '9999-12-31'::date), id);
+CREATE INDEX IF NOT EXISTS idx_movies_sort_release_date_desc ON movies (coalesce(release_date, '0001-01-01'::date), id);
+CREATE INDEX IF NOT EXISTS idx_movies_sort_box_office_asc ON movies (coalesce(box_office, 2147483647), id);
+CREATE INDEX IF NOT EXISTS idx_movies_sort_box_office_desc ON movies (coalesce(box_office, -2147483648), id);
+CREATE INDEX IF NOT EXISTS idx_movies_sort_metacritic_score_asc ON movies (coalesce(metacritic_score, 2147483647), id);
+CREATE INDEX IF NOT EXISTS idx_movies_sort_metacritic_score_desc ON movies (coalesce(metacritic_score, -2147483648), id);
 CREATE INDEX IF NOT EXISTS idx_movies_release_date ON movies (release_date);
 CREATE INDEX IF NOT EXISTS idx_movies_imdb_rating ON movies (imdb_rating);
 CREATE INDEX IF NOT EXISTS idx_movies_genres ON movies USING gin(genres);
+CREATE INDEX IF NOT EXISTS idx_movies_year_rating ON movies (release_year, imdb_rating);
+CREATE INDEX IF NOT EXISTS idx_movies_genres_year_rating ON movies USING gin (genres, release_year, imdb_rating);
 CREATE INDEX IF NOT EXISTS idx_movies_imdb_id ON movies (imdb_id);
 CREATE INDEX IF NOT EXISTS idx_movies_tmdb_id ON movies (tmdb_id);
 
@@ -16,3 +32,29 @@ CREATE INDEX IF NOT EXISTS idx_movies_tmdb_id ON movies (tmdb_id);
 CREATE INDEX IF NOT EXISTS idx_movies_title_vector ON movies USING ivfflat (title_vector vector_cosine_ops) WITH (lists = 100);
 CREATE INDEX IF NOT EXISTS idx_movies_synopsis_vector ON movies USING ivfflat (synopsis_vector vector_cosine_ops) WITH (lists = 100);
 CREATE INDEX IF NOT EXISTS idx_movies_combined_vector ON movies USING ivfflat (combined_vector vector_cosine_ops) WITH (lists = 100);
+
+-- Compact (quantized) vector indexes for VECTOR_QUANTIZATION=halfvec|binary are
+-- created for the configured mode only, by scripts/quantized_indexes.py
+
+-- Unfiltered facet counts for GET /movies/facets with FACETS_MATERIALIZED_VIEW=true
+-- Refresh with scripts/refresh_facets.py
+CREATE MATERIALIZED VIEW IF NOT EXISTS movie_facets AS
+SELECT facet, value, count FROM (
+    SELECT
+        CASE grouping(f.genre, f.language, f.country, f.decade, f.rating)
+            WHEN 15 THEN 'genre' WHEN 23 THEN 'language' WHEN 27 THEN 'country'
+            WHEN 29 THEN 'decade' WHEN 30 THEN 'rating' ELSE 'total'
+        END AS facet,
+        coalesce(f.genre, f.language, f.country, f.decade::text, f.rating::text, '') AS value,
+        CASE WHEN grouping(f.genre, f.language, f.country, f.decade, f.rating) = 31
+            THEN count(*) FILTER (WHERE f.n = 1) ELSE count(*)
+        END AS count
+    FROM movies m
+    JOIN unnest(
+        m.genres, m.languages, m.countries,
+        ARRAY[m.release_year / 10 * 10], ARRAY[floor(m.imdb_rating)::integer]
+    ) WITH ORDINALITY AS f(genre, language, country, decade, rating, n) ON true
+    GROUP BY GROUPING SETS (f.genre, f.language, f.country, f.decade, f.rating, ())
+) facets
+WHERE value <> '' OR facet = 'total';
+CREATE UNIQUE INDEX IF NOT EXISTS idx_movie_facets_facet_value ON movie_facets (facet, value);
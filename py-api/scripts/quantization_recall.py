@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Script to compare quantized vector search against exact search.
+
+For a sample of movies it computes the true k nearest neighbours with a
+sequential scan (index scans disabled), then runs the indexed search ("none")
+and each quantized mode (halfvec / binary + exact re-ranking) and reports their
+recall@k against that ground truth and their latency.
+
+    python scripts/quantization_recall.py --samples 200 --k 10 --vector-type combined
+"""
+
+import argparse
+import sys
+import os
+import time
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func, text
+from app.core.database import SessionLocal
+from app.crud.movie import movie_crud, QUANTIZED_DISTANCES
+from app.models.movie import Movie
+
+
+def exact_neighbors(db, vector_type: str, query_vector, k: int) -> set:
+    """Ids of the true ``k`` nearest movies, bypassing the HNSW/ivfflat index"""
+    column = f"{vector_type}_vector"
+    db.execute(text("SET LOCAL enable_indexscan = off"))
+    rows = db.execute(
+        text(
+            f"""
+            SELECT id FROM movies
+            WHERE {column} IS NOT NULL
+            ORDER BY {column} <=> CAST(:query_vector AS vector)
+            LIMIT :k
+        """
+        ),
+        {"query_vector": f"[{','.join(map(str, query_vector))}]", "k": k},
+    )
+    exact = {row.id for row in rows}
+    db.rollback()  # end the transaction that disabled index scans
+    return exact
+
+
+def measure_recall(samples: int, k: int, vector_type: str):
+    """Print recall@k and mean latency of each quantization mode"""
+    db = SessionLocal()
+    try:
+        column = getattr(Movie, f"{vector_type}_vector")
+        references = (
+            db.query(Movie.id, column)
+            .filter(column.isnot(None))
+            .order_by(func.random())
+            .limit(samples)
+            .all()
+        )
+        if not references:
+            print("No movies with vectors found.")
+            return
+
+        print(f"Comparing {len(references)} queries, k={k}, vectors={vector_type}")
+        modes = ["none"] + list(QUANTIZED_DISTANCES)
+        exact = []
+        results = {mode: [] for mode in modes}
+        timings = {mode: 0.0 for mode in modes}
+
+        for _, vector in references:
+            query_vector = list(vector)
+            exact.append(exact_neighbors(db, vector_type, query_vector, k))
+            for mode in modes:
+                start = time.perf_counter()
+                rows = movie_crud.vector_search(
+                    db, query_vector, k, vector_type, quantization=mode
+                )
+                timings[mode] += time.perf_counter() - start
+                results[mode].append({row.id for row in rows})
+            db.rollback()  # reset the transaction-local hnsw.ef_search
+
+        for mode in modes:
+            recall = sum(
+                len(found & truth) / max(len(truth), 1)
+                for found, truth in zip(results[mode], exact)
+            ) / len(references)
+            latency = timings[mode] / len(references) * 1000
+            print(f"{mode:>8}: recall@{k}={recall:.3f}  mean latency={latency:.2f} ms")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--samples", type=int, default=100)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument(
+        "--vector-type", default="combined", choices=["title", "synopsis", "combined"]
+    )
+    args = parser.parse_args()
+
+    measure_recall(args.samples, args.k, args.vector_type)
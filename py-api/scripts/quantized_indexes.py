@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Script to create the compact HNSW indexes of the configured VECTOR_QUANTIZATION
+mode and drop those of the other mode.
+
+Run it after changing VECTOR_QUANTIZATION:
+
+    VECTOR_QUANTIZATION=halfvec python scripts/quantized_indexes.py
+"""
+
+import sys
+import os
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.crud.movie import movie_crud
+
+
+def sync_quantized_indexes():
+    db = SessionLocal()
+    try:
+        movie_crud.sync_quantized_indexes(db, settings.vector_quantization)
+        print(
+            f"Quantized indexes match VECTOR_QUANTIZATION={settings.vector_quantization}"
+        )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sync_quantized_indexes()
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Script to refresh the movie_facets materialized view.
+
+GET /movies/facets serves unfiltered counts from this view when
+FACETS_MATERIALIZED_VIEW=true; run it periodically (e.g. from cron):
+
+    python scripts/refresh_facets.py
+"""
+
+import sys
+import os
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import SessionLocal
+from app.crud.movie import movie_crud
+
+
+def refresh_facets():
+    db = SessionLocal()
+    try:
+        movie_crud.refresh_facets_view(db)
+        print("Refreshed movie_facets")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    refresh_facets()
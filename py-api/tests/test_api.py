@@ -1,3 +1,4 @@
+import json
 import pytest
 from datetime import date
 
@@ -157,6 +158,7 @@ def test_get_movies_with_filters(client):
     data = response.json()
     assert len(data["movies"]) == 1
     assert data["movies"][0]["title"] == "Action Movie"
+    assert data["total"] == 1
 
     # Filter by year
     response = client.get("/api/v1/movies/?year=2021")
@@ -173,6 +175,134 @@ def test_get_movies_with_filters(client):
     assert data["movies"][0]["imdb_rating"] == 8.0
 
 
+def test_get_movies_cursor_pagination(client):
+    """Test walking a listing with next_cursor"""
+    for title in ["Casablanca", "Alien", "Brazil"]:
+        client.post("/api/v1/movies/", json={"title": title})
+
+    response = client.get("/api/v1/movies/?limit=2")
+    data = response.json()
+    assert [m["title"] for m in data["movies"]] == ["Alien", "Brazil"]
+    assert data["next_cursor"]
+
+    response = client.get(f"/api/v1/movies/?limit=2&cursor={data['next_cursor']}")
+    data = response.json()
+    assert [m["title"] for m in data["movies"]] == ["Casablanca"]
+    assert data["next_cursor"] is None
+
+    response = client.get("/api/v1/movies/?cursor=not-a-cursor")
+    assert response.status_code == 400
+
+
+def test_get_movies_sparse_fields(client):
+    """Test listings return a slim projection, or exactly the ?fields= asked for"""
+    client.post("/api/v1/movies/", json={"title": "Alien", "synopsis": "In space"})
+
+    movie = client.get("/api/v1/movies/").json()["movies"][0]
+    assert movie["title"] == "Alien"
+    assert "synopsis" not in movie
+
+    response = client.get("/api/v1/movies/?fields=title,synopsis")
+    assert response.json()["movies"][0].keys() == {"id", "title", "synopsis"}
+
+    response = client.get("/api/v1/movies/search/text?q=alien&fields=title")
+    assert response.json()["movies"][0].keys() == {"id", "title"}
+
+    response = client.get("/api/v1/movies/?fields=title,combined_vector")
+    assert response.status_code == 400
+
+
+def test_get_movie_facets(client):
+    """Test facet counts follow the listing filters"""
+    for title, genres in [("Heat", ["Crime", "Drama"]), ("Up", ["Animation"])]:
+        client.post("/api/v1/movies/", json={"title": title, "genres": genres})
+
+    response = client.get("/api/v1/movies/facets")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 2
+    assert {g["value"] for g in data["genres"]} == {"Crime", "Drama", "Animation"}
+
+    data = client.get("/api/v1/movies/facets?genre=Crime").json()
+    assert data["total"] == 1
+    assert {g["value"] for g in data["genres"]} == {"Crime", "Drama"}
+
+
+def test_export_movies(client):
+    """Test the catalogue streams as NDJSON or CSV"""
+    for title in ["Brazil", "Alien"]:
+        client.post("/api/v1/movies/", json={"title": title, "genres": ["Drama"]})
+
+    response = client.get("/api/v1/movies/export?fields=title,genres")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["title"] for row in rows] == ["Alien", "Brazil"]
+    assert rows[0]["genres"] == ["Drama"]
+
+    response = client.get("/api/v1/movies/export?format=csv&fields=title")
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.text.splitlines()[0] == "id,title"
+    assert len(response.text.splitlines()) == 3
+
+    response = client.get("/api/v1/movies/export?fields=title,combined_vector")
+    assert response.status_code == 400
+
+
+def test_bulk_create_movies(client):
+    """Test bulk create inserts valid movies and reports invalid ones"""
+    response = client.post(
+        "/api/v1/movies/bulk",
+        json={
+            "movies": [
+                {"title": "Bulk One", "genres": ["Drama"], "imdb_id": "tt9000001"},
+                {"title": "", "imdb_rating": 15.0},
+                {"title": "Bulk Two", "imdb_id": "tt9000001"},
+            ]
+        },
+    )
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data["created"] == 1
+    assert data["failed"] == 2
+    assert [r["status"] for r in data["results"]] == ["created", "error", "error"]
+
+    movie = client.get(f"/api/v1/movies/{data['results'][0]['id']}").json()
+    assert movie["title"] == "Bulk One"
+    assert movie["genres"] == ["Drama"]
+
+    response = client.post("/api/v1/movies/bulk", json={"movies": []})
+    assert response.status_code == 422
+
+
+def test_upsert_movies(client):
+    """Test upserts report inserted, updated and unchanged movies"""
+    movies = [
+        {"title": "Heat", "imdb_id": "tt0113277"},
+        {"title": "Alien", "imdb_id": "tt0078748"},
+    ]
+    response = client.post("/api/v1/movies/bulk/upsert", json={"movies": movies})
+    assert response.status_code == 200
+    assert response.json()["inserted"] == 2
+
+    movies[1]["synopsis"] = "In space no one can hear you scream"
+    data = client.post("/api/v1/movies/bulk/upsert", json={"movies": movies}).json()
+    assert [r["status"] for r in data["results"]] == ["unchanged", "updated"]
+
+    response = client.post(
+        "/api/v1/movies/upsert",
+        json={"title": "Heat", "runtime": 170, "imdb_id": "tt0113277"},
+    )
+    assert response.status_code == 200
+    assert response.json()["status"] == "updated"
+    movie = client.get(f"/api/v1/movies/{response.json()['id']}").json()
+    assert movie["runtime"] == 170
+
+    response = client.post("/api/v1/movies/upsert", json={"title": "No Key"})
+    assert response.status_code == 422
+
+
 def test_invalid_movie_data(client):
     """Test creating a movie with invalid data"""
     invalid_data = {
@@ -182,3 +312,89 @@ def test_invalid_movie_data(client):
 
     response = client.post("/api/v1/movies/", json=invalid_data)
     assert response.status_code == 422  # Validation error
+
+
+def test_create_movie_async_embeddings(client):
+    """Test async embedding mode returns before vectors are computed"""
+    from unittest.mock import patch
+
+    with patch("app.handlers.movie_handler.settings.embedding_mode", "async"):
+        response = client.post(
+            "/api/v1/movies/",
+            json={"title": "Queued Movie", "synopsis": "Embedded later"},
+        )
+
+    assert response.status_code == 200
+    assert response.json()["embedding_status"] == "pending"
+
+
+def test_find_similar_movies_batch(client):
+    """Test batch similar-movie lookup returns one result per reference movie"""
+    ids = []
+    for title in ["Alien", "Aliens", "Heat"]:
+        response = client.post(
+            "/api/v1/movies/", json={"title": title, "synopsis": f"{title} synopsis"}
+        )
+        ids.append(response.json()["id"])
+
+    response = client.post(
+        "/api/v1/movies/search/similar/batch",
+        json={"movie_ids": ids[:2], "limit": 2},
+    )
+    assert response.status_code == 200
+
+    results = response.json()["results"]
+    assert [result["movie_id"] for result in results] == ids[:2]
+    for result in results:
+        neighbour_ids = [item["movie"]["id"] for item in result["similar"]]
+        assert result["movie_id"] not in neighbour_ids
+        assert len(neighbour_ids) <= 2
+
+
+def test_find_similar_movies_batch_validation(client):
+    """Test batch similar-movie lookup requires at least one movie id"""
+    response = client.post(
+        "/api/v1/movies/search/similar/batch", json={"movie_ids": []}
+    )
+    assert response.status_code == 422
+
+
+def test_semantic_search(client):
+    """Test free-text semantic search returns scored movies"""
+    client.post(
+        "/api/v1/movies/",
+        json={
+            "title": "Space Movie",
+            "synopsis": "Astronauts travel through a wormhole",
+            "genres": ["Sci-Fi"],
+        },
+    )
+
+    response = client.get("/api/v1/movies/search/semantic?q=space travel&genre=Sci-Fi")
+    assert response.status_code == 200
+    for result in response.json():
+        assert "similarity_score" in result
+        assert "Sci-Fi" in result["movie"]["genres"]
+
+
+def test_semantic_search_requires_query(client):
+    """Test semantic search rejects an empty query"""
+    response = client.get("/api/v1/movies/search/semantic?q=")
+    assert response.status_code == 422
+
+
+def test_hybrid_search(client):
+    """Test hybrid search returns fused scores with per-signal details"""
+    client.post(
+        "/api/v1/movies/",
+        json={"title": "Hybrid Heist", "synopsis": "A crew plans a bank heist"},
+    )
+
+    response = client.get("/api/v1/movies/search/hybrid?q=heist&semantic_weight=0.5")
+    assert response.status_code == 200
+
+    results = response.json()
+    assert results[0]["movie"]["title"] == "Hybrid Heist"
+    assert results[0]["lexical_rank"] == 1
+    scores = [result["score"] for result in results]
+    assert scores == sorted(scores, reverse=True)
@@ -0,0 +1,152 @@
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+from app.services.autocomplete import TOP_K, AutocompleteService
+
+
+@pytest.fixture
+def movies():
+    return [
+        SimpleNamespace(
+            id=uuid4(),
+            title="The Dark Knight",
+            director="Christopher Nolan",
+            cast=[{"name": "Heath Ledger", "character": "Joker", "order": 1}],
+            imdb_rating=9.0,
+        ),
+        SimpleNamespace(
+            id=uuid4(),
+            title="The Prestige",
+            director="Christopher Nolan",
+            cast=[{"name": "Christian Bale", "character": "Borden", "order": 1}],
+            imdb_rating=8.5,
+        ),
+        SimpleNamespace(
+            id=uuid4(),
+            title="Inception",
+            director="Christopher Nolan",
+            cast=[{"name": "Leonardo DiCaprio", "character": "Cobb", "order": 1}],
+            imdb_rating=8.8,
+        ),
+        SimpleNamespace(
+            id=uuid4(),
+            title="Christmas Vacation",
+            director="Jeremiah Chechik",
+            cast=[],
+            imdb_rating=7.5,
+        ),
+    ]
+
+
+@pytest.fixture
+def service(movies):
+    db = MagicMock()
+    db.query.return_value.all.return_value = [
+        (m.id, m.title, m.director, m.cast, m.imdb_rating) for m in movies
+    ]
+    service = AutocompleteService(session_factory=lambda: db)
+    service.refresh()
+    return service
+
+
+def test_suggest_ranks_by_rating(service):
+    """Test prefix matches across kinds are ordered by IMDb rating"""
+    suggestions = service.suggest("chris")
+
+    assert [(s["type"], s["text"]) for s in suggestions] == [
+        ("director", "Christopher Nolan"),
+        ("cast", "Christian Bale"),
+        ("title", "Christmas Vacation"),
+    ]
+    assert suggestions[0]["imdb_rating"] == 9.0
+    assert suggestions[0]["movie_id"] is None
+
+
+def test_suggest_matches_inner_words(service, movies):
+    """Test a prefix can start at any word and ignores case and accents"""
+    suggestions = service.suggest("KNÍ")
+
+    assert suggestions == [
+        {
+            "text": "The Dark Knight",
+            "type": "title",
+            "movie_id": movies[0].id,
+            "imdb_rating": 9.0,
+        }
+    ]
+    assert service.suggest("zzz") == []
+    assert len(service.suggest("c", limit=2)) == 2
+
+
+def test_upsert_and_remove(service, movies):
+    """Test local writes are visible immediately, including precomputed prefixes"""
+    assert [s["text"] for s in service.suggest("in")] == ["Inception"]
+
+    movies[2].title = "Interstellar"
+    service.upsert_movie(movies[2])
+    assert [s["text"] for s in service.suggest("in")] == ["Interstellar"]
+
+    service.remove_movie(movies[2].id)
+    assert service.suggest("in") == []
+    assert [s["text"] for s in service.suggest("leo")] == []
+
+
+def test_common_prefix_top_list_follows_writes():
+    """Test a prefix matching more than TOP_K names stays exact after writes"""
+    movies = [
+        SimpleNamespace(
+            id=uuid4(),
+            title=f"The Film {i}",
+            director=None,
+            cast=[],
+            imdb_rating=i / 20,
+        )
+        for i in range(1, 2 * TOP_K + 1)
+    ]
+    db = MagicMock()
+    db.query.return_value.all.return_value = [
+        (m.id, m.title, m.director, m.cast, m.imdb_rating) for m in movies
+    ]
+    service = AutocompleteService(session_factory=lambda: db)
+    service.refresh()
+
+    def expected(prefix, limit):
+        ranked = sorted(
+            (m for m in movies if m.title.lower().startswith(prefix)),
+            key=lambda m: m.imdb_rating,
+            reverse=True,
+        )
+        return [m.title for m in ranked[:limit]]
+
+    assert [s["text"] for s in service.suggest("the", 50)] == expected("the", 50)
+
+    # Drop and demote the best ones until the kept list runs short
+    for movie in sorted(movies, key=lambda m: m.imdb_rating)[-TOP_K:]:
+        if movie.imdb_rating > 8:
+            service.remove_movie(movie.id)
+            movies.remove(movie)
+        else:
+            movie.imdb_rating = 0.1
+            service.upsert_movie(movie)
+
+    for prefix in ("t", "the", "the f", "the film 1"):
+        assert [s["text"] for s in service.suggest(prefix, 50)] == expected(prefix, 50)
+
+
+def test_refresh_replays_concurrent_writes(service, movies):
+    """Test writes applied while a reload reads the table survive the swap"""
+    stale_rows = [(m.id, m.title, m.director, m.cast, m.imdb_rating) for m in movies]
+
+    def read_rows():
+        movies[2].title = "Interstellar"
+        service.upsert_movie(movies[2])
+        service.remove_movie(movies[3].id)
+        return stale_rows
+
+    service.session_factory().query.return_value.all.side_effect = read_rows
+    service.refresh()
+
+    assert [s["text"] for s in service.suggest("in")] == ["Interstellar"]
+    assert [s["text"] for s in service.suggest("christm")] == []
@@ -0,0 +1,45 @@
+import pytest
+from unittest.mock import patch
+
+from app.core.cache import TTLCache
+
+
+def test_ttl_cache_get_and_set():
+    """Test values are returned until they are evicted"""
+    cache = TTLCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    assert cache.get("a") == 1
+    cache.set("c", 3)  # evicts "b", the least recently used
+
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 1
+
+
+def test_ttl_cache_expiry():
+    """Test entries expire after their TTL"""
+    cache = TTLCache(max_size=10, ttl=5)
+
+    with patch("app.core.cache.time.monotonic", return_value=100.0):
+        cache.set("query", [0.1])
+    with patch("app.core.cache.time.monotonic", return_value=104.0):
+        assert cache.get("query") == [0.1]
+    with patch("app.core.cache.time.monotonic", return_value=106.0):
+        assert cache.get("query") is None
+
+
+def test_ttl_cache_invalidate():
+    """Test single-key and full invalidation"""
+    cache = TTLCache()
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    cache.invalidate("a")
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+
+    cache.invalidate()
+    assert cache.stats()["size"] == 0
@@ -0,0 +1,69 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock, patch
+
+from app.crud.embedding_job import embedding_job_crud
+from app.crud.movie import movie_crud
+from app.schemas.movie import MovieCreate
+from app.services.embedding_worker import EmbeddingWorker
+from app.services.vector_service import vector_service
+from tests.conftest import TestingSessionLocal
+
+
+def test_worker_fills_pending_embeddings(db_session):
+    """Test the worker embeds queued movies and marks their jobs done"""
+    movie = movie_crud.create(
+        db_session, MovieCreate(title="Heat", synopsis="A heist thriller")
+    )
+    embedding_job_crud.enqueue(db_session, movie.id)
+    db_session.commit()
+
+    worker = EmbeddingWorker(session_factory=TestingSessionLocal)
+    assert worker.run_once() == 1
+    assert worker.run_once() == 0
+
+    db_session.expire_all()
+    movie = movie_crud.get(db_session, movie.id)
+    assert movie.embedding_status == "ready"
+    assert movie.combined_vector is not None
+    assert embedding_job_crud.count_by_status(db_session, "done") == 1
+
+
+def test_worker_retries_then_fails(db_session):
+    """Test failing jobs are retried and eventually marked failed"""
+    movie = movie_crud.create(
+        db_session, MovieCreate(title="Broken", synopsis="Never embedded before")
+    )
+    embedding_job_crud.enqueue(db_session, movie.id)
+    db_session.commit()
+
+    worker = EmbeddingWorker(session_factory=TestingSessionLocal, max_attempts=1)
+    model = Mock(encode=Mock(side_effect=RuntimeError("model crashed")))
+    with patch.object(vector_service, "model", model), patch.object(
+        vector_service, "batcher", None
+    ):
+        assert worker.run_once() == 0
+
+    db_session.expire_all()
+    assert embedding_job_crud.count_by_status(db_session, "failed") == 1
+    assert movie_crud.get(db_session, movie.id).embedding_status == "failed"
+
+
+def test_purge_done_jobs(db_session):
+    """Test done jobs past the retention are deleted, others kept"""
+    old = embedding_job_crud.enqueue(
+        db_session, movie_crud.create(db_session, MovieCreate(title="Old")).id
+    )
+    recent = embedding_job_crud.enqueue(
+        db_session, movie_crud.create(db_session, MovieCreate(title="Recent")).id
+    )
+    embedding_job_crud.enqueue(
+        db_session, movie_crud.create(db_session, MovieCreate(title="Queued")).id
+    )
+    old.status = recent.status = "done"
+    old.updated_at = datetime.now(timezone.utc) - timedelta(days=2)
+    db_session.commit()
+
+    assert embedding_job_crud.purge_done(db_session, timedelta(days=1)) == 1
+    assert embedding_job_crud.count_by_status(db_session, "done") == 1
+    assert embedding_job_crud.count_by_status(db_session, "pending") == 1
@@ -0,0 +1,58 @@
+import importlib.util
+from pathlib import Path
+
+from app.crud.movie import QUANTIZED_INDEXES
+from app.models.movie import (
+    CONTENT_HASH_EXPRESSION,
+    SEARCH_VECTOR_EXPRESSION,
+    SORT_NULL_SENTINELS,
+    sort_index_name,
+)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+VERSIONS = PROJECT_ROOT / "migrations" / "versions"
+
+
+def load_migration(name: str):
+    spec = importlib.util.spec_from_file_location(name, VERSIONS / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_search_vector_migration_matches_model():
+    """Test the latest search_vector migration uses the model's expression"""
+    migration = load_migration("0012_search_vector_cast_names")
+
+    assert migration.SEARCH_VECTOR_EXPRESSION == SEARCH_VECTOR_EXPRESSION
+
+
+def test_content_hash_migration_matches_model():
+    """Test the content_hash migration uses the model's expression"""
+    migration = load_migration("0010_content_hash")
+
+    assert migration.CONTENT_HASH_EXPRESSION == CONTENT_HASH_EXPRESSION
+
+
+def test_sort_index_ddl_matches_model():
+    """Test the sort index migration and init_db.sql use the model's sentinels"""
+    migration = load_migration("0008_sort_indexes")
+    init_db = (PROJECT_ROOT / "scripts" / "init_db.sql").read_text()
+
+    assert migration.SORT_NULL_SENTINELS == {
+        column: (ascending[0], descending[0])
+        for column, (ascending, descending) in SORT_NULL_SENTINELS.items()
+    }
+    for column, sentinels in SORT_NULL_SENTINELS.items():
+        for descending, (sentinel, _) in zip((False, True), sentinels):
+            assert (
+                f"CREATE INDEX IF NOT EXISTS {sort_index_name(column, descending)} "
+                f"ON movies (coalesce({column}, {sentinel}), id);"
+            ) in init_db
+
+
+def test_quantized_index_migration_matches_crud():
+    """Test the quantized index migration builds the indexes crud syncs"""
+    migration = load_migration("0002_quantized_vector_indexes")
+
+    assert migration.QUANTIZED_INDEXES == QUANTIZED_INDEXES
@@ -2,7 +2,10 @@ import pytest
 from datetime import date
 from uuid import uuid4
 
-from app.crud.movie import movie_crud
+from sqlalchemy import inspect, text
+
+from app.crud.movie import movie_crud, SORT_COLUMNS
+from app.models.movie import content_hash, sort_index_name
 from app.schemas.movie import MovieCreate, MovieUpdate, CastMember
 
 
@@ -115,6 +118,28 @@ def test_search_movies(db_session):
     assert results[0].director == "Christopher Nolan"
 
 
+def test_search_ranks_title_matches_first(db_session):
+    """Test that title matches outrank cast and synopsis matches"""
+    movie_crud.create(
+        db_session,
+        MovieCreate(title="Heat", synopsis="A crew plans one last heist in Chicago."),
+    )
+    movie_crud.create(
+        db_session,
+        MovieCreate(
+            title="The Untouchables",
+            cast=[CastMember(name="Sean Connery", character="Jim Malone", order=1)],
+        ),
+    )
+    movie_crud.create(db_session, MovieCreate(title="Chicago"))
+
+    results = movie_crud.search(db_session, "chicago")
+    assert [movie.title for movie in results] == ["Chicago", "Heat"]
+
+    results = movie_crud.search(db_session, "connery -heist")
+    assert [movie.title for movie in results] == ["The Untouchables"]
+
+
 def test_filter_movies(db_session):
     """Test filtering movies"""
     movies_data = [
@@ -151,6 +176,11 @@ def test_filter_movies(db_session):
     # Filter by year
     movies_2020 = movie_crud.get_multi(db_session, year=2020)
     assert len(movies_2020) == 2
+    assert movies_2020[0].release_year == 2020
+
+    # Filter by year range
+    assert len(movie_crud.get_multi(db_session, year_from=2021)) == 1
+    assert len(movie_crud.get_multi(db_session, year_from=2019, year_to=2020)) == 2
 
     # Filter by director
     director_a_movies = movie_crud.get_multi(db_session, director="Director A")
@@ -161,6 +191,35 @@ def test_filter_movies(db_session):
     assert len(high_rated_movies) == 2
 
 
+def test_filter_movies_fuzzy(db_session):
+    """Test typo-tolerant title and director filters"""
+    movie_crud.create(
+        db_session, MovieCreate(title="Interstellar", director="Christopher Nolan")
+    )
+    movie_crud.create(
+        db_session, MovieCreate(title="Jaws", director="Steven Spielberg")
+    )
+    movie_crud.create(
+        db_session, MovieCreate(title="100% Wolf", director="Alexs Stadermann")
+    )
+
+    # Substring filters treat LIKE wildcards literally
+    assert len(movie_crud.get_multi(db_session, title="100%")) == 1
+    assert len(movie_crud.get_multi(db_session, title="%")) == 1
+    assert movie_crud.get_multi(db_session, title="_aws") == []
+
+    results = movie_crud.get_multi(db_session, director="Cristopher Nolen", fuzzy=True)
+    assert [movie.title for movie in results] == ["Interstellar"]
+
+    results = movie_crud.get_multi(db_session, title="Intersteller", fuzzy=True)
+    assert [movie.title for movie in results] == ["Interstellar"]
+
+    results = movie_crud.get_multi(
+        db_session, title="Intersteller", fuzzy=True, similarity_threshold=0.95
+    )
+    assert results == []
+
+
 def test_count_movies(db_session):
     """Test counting movies"""
     assert movie_crud.count(db_session) == 0
@@ -169,3 +228,116 @@ def test_count_movies(db_session):
     movie_crud.create(db_session, movie_data)
 
     assert movie_crud.count(db_session) == 1
+
+
+def test_sort_movies_nulls_last(db_session):
+    """Test sorted listings put missing values last and page by cursor"""
+    for title, rating in [("Alien", 8.5), ("Unrated", None), ("Heat", 8.3)]:
+        movie_crud.create(db_session, MovieCreate(title=title, imdb_rating=rating))
+
+    movies = movie_crud.get_multi(db_session, sort="rating", descending=True)
+    assert [m.title for m in movies] == ["Alien", "Heat", "Unrated"]
+
+    movies = movie_crud.get_multi(db_session, sort="rating")
+    assert [m.title for m in movies] == ["Heat", "Alien", "Unrated"]
+
+    last = movies[1]
+    after = [movie_crud.sort_value(last, "rating", False), last.id]
+    movies = movie_crud.get_multi(db_session, sort="rating", after=after)
+    assert [m.title for m in movies] == ["Unrated"]
+
+
+def _plan_nodes(plan):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+@pytest.mark.parametrize("sort", SORT_COLUMNS)
+@pytest.mark.parametrize("descending", [False, True])
+def test_sort_uses_index(db_session, sort, descending):
+    """Test every sort is an ordered index scan rather than a full sort"""
+    if db_session.get_bind().dialect.name != "postgresql":
+        pytest.skip("EXPLAIN plans need PostgreSQL")
+
+    # Tiny test tables would otherwise always favour a sequential scan
+    db_session.execute(text("SET LOCAL enable_seqscan = off"))
+    query = movie_crud._order(movie_crud._list_query(db_session), sort, descending)
+    nodes = list(_plan_nodes(movie_crud.explain(db_session, query.limit(20))["Plan"]))
+
+    column = SORT_COLUMNS[sort]
+    expected = (
+        "idx_movies_title_id"
+        if column == "title"
+        else sort_index_name(column, descending)
+    )
+    assert expected in {node.get("Index Name") for node in nodes}
+    assert "Sort" not in {node["Node Type"] for node in nodes}
+
+
+def test_get_multi_loads_only_requested_fields(db_session):
+    """Test vectors are deferred and ``fields`` narrows the loaded columns"""
+    movie_crud.create(
+        db_session, MovieCreate(title="Alien", synopsis="In space", imdb_rating=8.5)
+    )
+    db_session.expire_all()
+
+    movie = movie_crud.get_multi(db_session)[0]
+    assert {"combined_vector", "search_vector"} <= inspect(movie).unloaded
+    assert "synopsis" not in inspect(movie).unloaded
+
+    db_session.expire_all()
+    movie = movie_crud.get_multi(db_session, fields=["title"], sort="rating")[0]
+    assert {"synopsis", "cast", "genres"} <= inspect(movie).unloaded
+    assert movie.title == "Alien"
+    assert movie.imdb_rating == 8.5
+
+
+def test_facets(db_session):
+    """Test facet counts count each movie once per value"""
+    movies = [
+        MovieCreate(
+            title="Heat",
+            release_date=date(1995, 12, 15),
+            imdb_rating=8.3,
+            genres=["Crime", "Drama"],
+            languages=["English", "Spanish"],
+            countries=["USA"],
+        ),
+        MovieCreate(
+            title="Se7en",
+            release_date=date(1995, 9, 22),
+            imdb_rating=8.6,
+            genres=["Crime"],
+            languages=["English"],
+            countries=["USA"],
+        ),
+        MovieCreate(title="Untitled"),
+    ]
+    for movie in movies:
+        movie_crud.create(db_session, movie)
+
+    facets = {}
+    for facet, value, count in movie_crud.facets(db_session):
+        facets.setdefault(facet, []).append((value, count))
+
+    assert facets["total"] == [("", 3)]
+    assert facets["genre"] == [("Crime", 2), ("Drama", 1)]
+    assert facets["language"] == [("English", 2), ("Spanish", 1)]
+    assert facets["country"] == [("USA", 2)]
+    assert facets["decade"] == [("1990", 2)]
+    assert facets["rating"] == [("8", 2)]
+
+    facets = movie_crud.facets(db_session, genre="Drama")
+    assert ("total", "", 1) in [tuple(row) for row in facets]
+
+
+def test_content_hash_matches_column(db_session):
+    """Test content_hash() computes the generated column's value"""
+    movie = movie_crud.create(
+        db_session, MovieCreate(title="Amélie", synopsis="Paris, 1997")
+    )
+    assert movie.content_hash == content_hash("Amélie", "Paris, 1997")
+
+    movie = movie_crud.create(db_session, MovieCreate(title="Untold"))
+    assert movie.content_hash == content_hash("Untold", None)
@@ -0,0 +1,408 @@
+import csv
+import io
+import json
+import pytest
+from types import SimpleNamespace
+from unittest.mock import ANY, Mock, patch
+from uuid import uuid4
+
+from app.handlers.movie_handler import MovieHandler
+from app.models.movie import content_hash
+from app.schemas.movie import MOVIE_FIELDS, MovieCreate, MovieUpdate
+
+
+def _movie(title):
+    return SimpleNamespace(id=uuid4(), title=title)
+
+
+@patch("app.handlers.movie_handler.movie_crud")
+def test_get_movies_total_from_window_and_cache(mock_crud):
+    """Test the total comes from the page query, then from the count cache"""
+    handler = MovieHandler()
+    mock_crud.get_multi_with_total.return_value = ([_movie("Alien")], 42)
+    mock_crud.get_multi.return_value = [_movie("Alien")]
+
+    first = handler.get_movies(Mock(), limit=10, genre="Sci-Fi")
+    second = handler.get_movies(Mock(), limit=10, genre="Sci-Fi")
+
+    assert first.total == second.total == 42
+    assert second.total_pages == 5
+    mock_crud.get_multi_with_total.assert_called_once()
+    mock_crud.get_multi.assert_called_once()
+    mock_crud.count.assert_not_called()
+
+    handler.count_cache.invalidate()
+    handler.get_movies(Mock(), limit=10, genre="Sci-Fi")
+    assert mock_crud.get_multi_with_total.call_count == 2
+
+
+@patch("app.handlers.movie_handler.movie_crud")
+def test_get_movies_estimated_total(mock_crud):
+    """Test estimated mode uses planner statistics instead of counting"""
+    handler = MovieHandler()
+    mock_crud.get_multi.return_value = []
+    mock_crud.estimate_count.return_value = 1000
+
+    response = handler.get_movies(Mock(), limit=100, count="estimated")
+
+    assert response.total == 1000
+    assert response.total_pages == 10
+    mock_crud.get_multi_with_total.assert_not_called()
+    mock_crud.count.assert_not_called()
+
+
+@patch("app.handlers.movie_handler.movie_crud")
+def test_get_movies_sparse_fields(mock_crud):
+    """Test ?fields= selects the loaded columns and the serialized fields"""
+    handler = MovieHandler()
+    mock_crud.get_multi_with_total.return_value = ([_movie("Alien")], 1)
+
+    response = handler.get_movies(Mock(), fields="title, imdb_rating")
+
+    kwargs = mock_crud.get_multi_with_total.call_args.kwargs
+    assert kwargs["fields"] == ("id", "title", "imdb_rating")
+    assert response.movies[0].model_dump(exclude_unset=True).keys() == {
+        "id",
+        "title",
+        "imdb_rating",
+    }
+
+    with pytest.raises(ValueError):
+        handler.get_movies(Mock(), fields="title,combined_vector")
+
+
+@patch("app.handlers.movie_handler.movie_crud")
+def test_get_facets_cached_until_write(mock_crud):
+    """Test facet rows are grouped per facet and cached per filter set"""
+    handler = MovieHandler()
+    mock_crud.facets.return_value = [
+        ("country", "USA", 2),
+        ("genre", "Drama", 2),
+        ("genre", "Crime", 1),
+        ("total", "", 2),
+    ]
+
+    facets = handler.get_facets(Mock(), genre="Drama")
+    handler.get_facets(Mock(), genre="Drama")
+
+    assert facets.total == 2
+    assert [(f.value, f.count) for f in facets.genres] == [("Drama", 2), ("Crime", 1)]
+    assert facets.countries[0].value == "USA"
+    assert facets.decades == []
+    mock_crud.facets.assert_called_once()
+
+    mock_crud.delete.return_value = True
+    with patch("app.handlers.movie_handler.neighbor_service"):
+        handler.delete_movie(Mock(), uuid4())
+    handler.get_facets(Mock(), genre="Drama")
+    assert mock_crud.facets.call_count == 2
+
+
+@patch("app.handlers.movie_handler.movie_crud")
+def test_get_facets_materialized_view(mock_crud):
+    """Test only unfiltered facets are read from the materialized view"""
+    handler = MovieHandler()
+    mock_crud.facets_from_view.return_value = [("total", "", 10)]
+    mock_crud.facets.return_value = [("total", "", 3)]
+
+    with patch("app.handlers.movie_handler.settings.facets_materialized_view", True):
+        assert handler.get_facets(Mock()).total == 10
+        assert handler.get_facets(Mock(), year=1994).total == 3
+
+
+@patch("app.handlers.movie_handler.settings.export_batch_size", 2)
+@patch("app.handlers.movie_handler.movie_crud")
+def test_export_movies(mock_crud):
+    """Test exports stream batches of NDJSON lines or CSV rows"""
+    handler = MovieHandler()
+    movies = [_movie("Alien"), _movie("Brazil"), _movie("Casablanca")]
+    movies[0].genres = ["Sci-Fi", "Horror"]
+    mock_crud.stream.return_value = movies
+
+    chunks = list(handler.export_movies(Mock(), fields="title,genres"))
+    assert len(chunks) == 2
+    lines = "".join(chunks).splitlines()
+    assert json.loads(lines[0]) == {
+        "id": str(movies[0].id),
+        "title": "Alien",
+        "genres": ["Sci-Fi", "Horror"],
+    }
+    assert mock_crud.stream.call_args.kwargs["batch_size"] == 2
+
+    rows = list(
+        csv.reader(
+            io.StringIO(
+                "".join(
+                    handler.export_movies(Mock(), format="csv", fields="title,genres")
+                )
+            )
+        )
+    )
+    assert rows[0] == ["id", "title", "genres"]
+    assert rows[1][1:] == ["Alien", '["Sci-Fi", "Horror"]']
+    assert len(rows) == 4
+
+
+@patch("app.handlers.movie_handler.neighbor_service")
+@patch("app.handlers.movie_handler.vector_service")
+@patch("app.handlers.movie_handler.movie_crud")
+def test_bulk_create_movies(mock_crud, mock_vectors, mock_neighbors):
+    """Test bulk create reports per-item errors and embeds in one batch"""
+    handler = MovieHandler()
+    mock_crud.existing_external_ids.return_value = ({"tt001"}, set())
+    mock_vectors.generate_movie_vectors.side_effect = lambda texts: [
+        {column: [0.1] * 384 for column in t} for t in texts
+    ]
+    # tt003 was inserted concurrently after the lookup: ON CONFLICT skips it
+    mock_crud.create_many.side_effect = lambda db, rows: {
+        row["id"] for row in rows if row["imdb_id"] != "tt003"
+    }
+    db = Mock()
+
+    response = handler.bulk_create_movies(
+        db,
+        [
+            {"title": "Alien", "synopsis": "In space", "imdb_id": "tt002"},
+            {"title": ""},
+            {"title": "Heat", "imdb_id": "tt001"},
+            {"title": "Aliens", "imdb_id": "tt002"},
+            {"title": "Brazil", "tmdb_id": 68},
+            {"title": "Raced", "imdb_id": "tt003"},
+        ],
+    )
+
+    assert (response.created, response.failed) == (2, 4)
+    assert [r.status for r in response.results] == [
+        "created",
+        "error",
+        "error",
+        "error",
+        "created",
+        "error",
+    ]
+    assert response.results[1].error.startswith("title:")
+    assert "already exists" in response.results[2].error
+    assert "already exists" in response.results[3].error
+    assert "tt003" in response.results[5].error
+
+    mock_vectors.generate_movie_vectors.assert_called_once()
+    rows = mock_crud.create_many.call_args.args[1]
+    assert [row["title"] for row in rows] == ["Alien", "Brazil", "Raced"]
+    assert len({frozenset(row) for row in rows}) == 1
+    assert rows[0]["genres"] is None  # omitted: NULL, as in POST /movies/
+    assert rows[0]["combined_vector"] is not None
+    assert rows[1]["synopsis_vector"] is None
+    assert [row["id"] for row in rows[:2]] == [
+        response.results[0].id,
+        response.results[4].id,
+    ]
+    db.commit.assert_called_once()
+
+
+@patch("app.handlers.movie_handler.neighbor_service")
+@patch("app.handlers.movie_handler.vector_service")
+@patch("app.handlers.movie_handler.movie_crud")
+def test_upsert_movies(mock_crud, mock_vectors, mock_neighbors):
+    """Test upserts only re-embed movies whose title or synopsis changed"""
+    handler = MovieHandler()
+    same_id, changed_id, new_id = uuid4(), uuid4(), uuid4()
+    mock_crud.content_hashes.return_value = {
+        "tt1": (same_id, content_hash("Heat", "A heist")),
+        "tt2": (changed_id, content_hash("Alien", "Old synopsis")),
+    }
+    mock_crud.imdb_ids_by_tmdb_id.return_value = {603: "tt9"}
+    mock_crud.upsert_many.return_value = [
+        (changed_id, "tt2", False, "ready"),
+        (new_id, "tt3", True, "ready"),
+    ]
+    mock_vectors.generate_movie_vectors.side_effect = lambda texts: [
+        {column: [0.1] * 384 for column in t} for t in texts
+    ]
+
+    response = handler.upsert_movies(
+        Mock(),
+        [
+            {"title": "Heat", "synopsis": "A heist", "imdb_id": "tt1"},
+            {"title": "Alien", "synopsis": "New synopsis", "imdb_id": "tt2"},
+            {"title": "Brazil", "imdb_id": "tt3"},
+            {"title": "No Key"},
+            {"title": "Heat again", "imdb_id": "tt1"},
+            {"title": "The Matrix", "imdb_id": "tt4", "tmdb_id": 603},
+        ],
+    )
+
+    assert [(r.status, r.id) for r in response.results[:3]] == [
+        ("unchanged", same_id),
+        ("updated", changed_id),
+        ("inserted", new_id),
+    ]
+    assert [r.status for r in response.results[3:]] == ["error"] * 3
+    assert "another movie" in response.results[5].error
+    assert (response.inserted, response.updated, response.unchanged) == (1, 1, 1)
+    assert response.failed == 3
+
+    texts = mock_vectors.generate_movie_vectors.call_args.args[0]
+    assert [t["title_vector"] for t in texts] == ["Alien", "Brazil"]
+    rows, columns, embedding_columns = mock_crud.upsert_many.call_args.args[1:]
+    assert rows[0]["title_vector"] is None
+    assert "imdb_id" not in columns
+    assert "combined_vector" in embedding_columns
+    mock_neighbors.queue_refresh.assert_called_once()
+    assert set(mock_neighbors.queue_refresh.call_args.args[1]) == {
+        changed_id,
+        new_id,
+    }
+
+
+@patch("app.handlers.movie_handler.neighbor_service")
+@patch("app.handlers.movie_handler.vector_service")
+@patch("app.handlers.movie_handler.movie_crud")
+def test_upsert_movies_embeds_text_changed_concurrently(
+    mock_crud, mock_vectors, mock_neighbors
+):
+    """Test rows the database saw as changed are embedded despite a stale hash"""
+    handler = MovieHandler()
+    movie_id = uuid4()
+    # The hash lookup still sees the item's text, another writer changed it since
+    mock_crud.content_hashes.return_value = {
+        "tt1": (movie_id, content_hash("Heat", "A heist"))
+    }
+    mock_crud.imdb_ids_by_tmdb_id.return_value = {}
+    mock_crud.upsert_many.return_value = [(movie_id, "tt1", False, "pending")]
+    mock_vectors.generate_movie_vectors.side_effect = lambda texts: [
+        {column: [0.1] * 384 for column in t} for t in texts
+    ]
+
+    response = handler.upsert_movies(
+        Mock(), [{"title": "Heat", "synopsis": "A heist", "imdb_id": "tt1"}]
+    )
+
+    assert response.updated == 1
+    mock_vectors.generate_movie_vectors.assert_called_once()
+    (row,) = mock_crud.update_vectors.call_args.args[1]
+    assert row["id"] == movie_id
+    assert row["embedding_status"] == "ready"
+    assert row["combined_vector"] == [0.1] * 384
+    mock_neighbors.queue_refresh.assert_called_once_with(ANY, [movie_id])
+
+
+def _stored_movie(**values):
+    return SimpleNamespace(**{**dict.fromkeys(MOVIE_FIELDS), **values})
+
+
+@patch("app.handlers.movie_handler.neighbor_service")
+@patch("app.handlers.movie_handler.vector_service")
+@patch("app.handlers.movie_handler.movie_crud")
+def test_create_movie_single_write(mock_crud, mock_vectors, mock_neighbors):
+    """Test a movie is inserted with its vectors and committed once"""
+    handler = MovieHandler()
+    db = Mock()
+    mock_vectors.generate_movie_vectors.return_value = [{"title_vector": [0.1] * 384}]
+    mock_crud.create.return_value = _stored_movie(id=uuid4(), title="Heat")
+
+    response = handler.create_movie(db, MovieCreate(title="Heat"))
+
+    assert response.title == "Heat"
+    columns = mock_crud.create.call_args.kwargs
+    assert columns["title_vector"] == [0.1] * 384
+    assert columns["embedding_status"] == "ready"
+    mock_neighbors.queue_refresh.assert_called_once()
+    db.commit.assert_called_once()
+    db.refresh.assert_not_called()
+
+
+@patch("app.handlers.movie_handler.neighbor_service")
+@patch("app.handlers.movie_handler.vector_service")
+@patch("app.handlers.movie_handler.movie_crud")
+def test_update_movie_single_write(mock_crud, mock_vectors, mock_neighbors):
+    """Test a title change embeds with the stored synopsis, then updates once"""
+    handler = MovieHandler()
+    db = Mock()
+    movie_id = uuid4()
+    mock_crud.get_text.return_value = SimpleNamespace(
+        title="Alien", synopsis="In space"
+    )
+    mock_vectors.generate_movie_vectors.side_effect = lambda texts: [
+        {column: [0.1] * 384 for column in t} for t in texts
+    ]
+    mock_crud.update.return_value = _stored_movie(id=movie_id, title="Aliens")
+
+    response = handler.update_movie(db, movie_id, MovieUpdate(title="Aliens"))
+
+    assert response.title == "Aliens"
+    texts = mock_vectors.generate_movie_vectors.call_args.args[0][0]
+    assert texts == {"title_vector": "Aliens", "combined_vector": "Aliens In space"}
+    columns = mock_crud.update.call_args.kwargs
+    assert set(columns) == {"title_vector", "combined_vector", "embedding_status"}
+    db.commit.assert_called_once()
+    db.refresh.assert_not_called()
+
+    mock_crud.get_text.return_value = None
+    assert handler.update_movie(db, uuid4(), MovieUpdate(synopsis="x")) is None
+    mock_crud.update.assert_called_once()
+
+
+@patch("app.handlers.movie_handler.ann_index_service")
+@patch("app.handlers.movie_handler.neighbor_service")
+@patch("app.handlers.movie_handler.movie_crud")
+def test_similar_movies_beyond_top_k_use_live_search(
+    mock_crud, mock_neighbors, mock_ann
+):
+    """Test limits above the precomputed top-K skip the neighbour table"""
+    handler = MovieHandler()
+    mock_neighbors.enabled = True
+    mock_ann.ready = False
+    mock_crud.get.return_value = None
+
+    with patch("app.handlers.movie_handler.settings.neighbor_top_k", 20):
+        handler.find_similar_movies(Mock(), uuid4(), limit=50)
+        mock_neighbors.get_neighbors.assert_not_called()
+        mock_crud.get.assert_called_once()
+
+        handler.find_similar_movies(Mock(), uuid4(), limit=20)
+        mock_neighbors.get_neighbors.assert_called_once()
+
+
+@patch("app.handlers.movie_handler.ann_index_service")
+@patch("app.handlers.movie_handler.neighbor_service")
+@patch("app.handlers.movie_handler.movie_crud")
+def test_similar_movies_not_in_memory_index_use_pgvector(
+    mock_crud, mock_neighbors, mock_ann
+):
+    """Test movies missing from the in-process index fall back to pgvector"""
+    handler = MovieHandler()
+    mock_neighbors.enabled = False
+    mock_ann.ready = True
+    indexed, new = uuid4(), uuid4()
+    mock_ann.get_vector.side_effect = lambda movie_id, _: (
+        [0.1, 0.2] if movie_id == indexed else None
+    )
+    mock_ann.search.return_value = []
+    mock_crud.get.return_value = SimpleNamespace(combined_vector=[0.3, 0.4])
+    mock_crud.vector_search.return_value = []
+    mock_crud.vector_search_batch.return_value = []
+    mock_crud.get_many.return_value = []
+
+    handler.find_similar_movies(Mock(), new, limit=5)
+    mock_crud.vector_search.assert_called_once_with(ANY, [0.3, 0.4], 6, "combined")
+
+    handler.find_similar_movies(Mock(), indexed, limit=5)
+    mock_crud.vector_search.assert_called_once()
+
+    handler.find_similar_movies_batch(Mock(), [indexed, new], limit=5)
+    mock_crud.vector_search_batch.assert_called_once_with(ANY, [new], 5, "combined")
+
+
+@patch("app.handlers.movie_handler.neighbor_service")
+@patch("app.handlers.movie_handler.movie_crud")
+def test_delete_movie_queues_dependents_first(mock_crud, mock_neighbors):
+    """Test dependents are queued before the delete, in its transaction"""
+    handler = MovieHandler()
+    db = Mock()
+    calls = []
+    mock_neighbors.queue_dependents.side_effect = lambda *args: calls.append("queue")
+    mock_crud.delete.side_effect = lambda *args: calls.append("delete") or True
+
+    assert handler.delete_movie(db, uuid4()) is True
+    assert calls == ["queue", "delete"]
+    db.commit.assert_not_called()
@@ -0,0 +1,24 @@
+import pytest
+from uuid import uuid4
+
+from app.core.pagination import InvalidCursorError, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    """Test cursors decode to their key values"""
+    movie_id = uuid4()
+    cursor = encode_cursor("movies", ["Heat", movie_id])
+
+    assert decode_cursor(cursor, "movies") == ["Heat", movie_id]
+
+
+def test_cursor_rejects_tampering():
+    """Test cursors from other listings or with bad payloads are rejected"""
+    cursor = encode_cursor("movies", ["Heat", uuid4()])
+
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, "search")
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor[:-3], "movies")
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(encode_cursor("movies", ["Heat", "not-a-uuid"]), "movies")
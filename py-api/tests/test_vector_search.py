@@ -77,3 +77,392 @@ def test_vector_service_initialization_failure(mock_transformer):
     # Should return zero vector when model is not available
     embedding = service.generate_embedding("test text")
     assert embedding == [0.0] * 384
+
+
+def test_hnsw_index_add_search_and_remove():
+    """Test the in-process HNSW index keeps results in sync with updates"""
+    pytest.importorskip("hnswlib")
+    from uuid import uuid4
+    from app.services.ann_index import HNSWIndex
+
+    index = HNSWIndex(dim=3, max_elements=2)
+    ids = [uuid4() for _ in range(3)]
+    index.add_items(ids, [[1.0, 0.0, 0.0], [0.9, 0.1, 0.0], [0.0, 0.0, 1.0]])
+
+    assert len(index) == 3  # grew past the initial capacity
+    results = index.knn_query([1.0, 0.0, 0.0], k=2)
+    assert [movie_id for movie_id, _ in results] == ids[:2]
+    assert results[0][1] < 1e-6  # cosine distance to itself
+
+    # Replacing a vector moves the movie in the graph
+    index.add_items([ids[1]], [[0.0, 0.1, 0.9]])
+    assert index.knn_query([0.0, 0.0, 1.0], k=2)[1][0] == ids[1]
+
+    assert index.remove(ids[2]) is True
+    assert index.remove(ids[2]) is False
+    assert ids[2] not in [movie_id for movie_id, _ in index.knn_query([0, 0, 1], k=5)]
+    assert index.get_vector(ids[2]) is None
+
+
+@patch("app.services.vector_service.SentenceTransformer")
+def test_generate_embedding_uses_cache(mock_transformer):
+    """Test repeated texts are served from the embedding cache"""
+    import numpy as np
+    from app.services.vector_service import VectorService
+    from app.services.embedding_cache import EmbeddingCache
+
+    mock_transformer.return_value.encode.side_effect = lambda text: (
+        np.ones((len(text), 384), dtype=np.float32)
+        if isinstance(text, list)
+        else np.ones(384, dtype=np.float32)
+    )
+    service = VectorService(cache=EmbeddingCache(max_size=10))
+
+    first = service.generate_embedding("The Matrix")
+    second = service.generate_embedding("  The   Matrix ")
+    service.generate_embeddings_batch(["The Matrix", "Inception"])
+
+    assert first == second
+    assert mock_transformer.return_value.encode.call_count == 2
+    stats = service.cache_stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 2
+
+
+def test_embedding_cache_disk_tier(tmp_path):
+    """Test embeddings persist in the memory-mapped disk tier"""
+    import numpy as np
+    from app.services.embedding_cache import EmbeddingCache, cache_key
+
+    path = str(tmp_path / "embeddings.bin")
+    key = cache_key("model", "The Matrix")
+    vector = np.arange(384, dtype=np.float32)
+
+    EmbeddingCache(max_size=1, disk_path=path, disk_slots=16).put(key, vector)
+
+    # A fresh cache (e.g. another worker or a restart) finds it on disk
+    cache = EmbeddingCache(max_size=1, disk_path=path, disk_slots=16)
+    assert np.array_equal(cache.get(key), vector)
+    assert cache.get(cache_key("model", "Inception")) is None
+    assert cache.stats()["disk_hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_disk_store_rejects_slot_overwritten_during_read(tmp_path):
+    """Test a slot whose key changes while its vector is copied is a miss"""
+    import numpy as np
+    from app.services.embedding_cache import DiskEmbeddingStore, cache_key
+
+    store = DiskEmbeddingStore(str(tmp_path / "embeddings.bin"), dim=4, slots=16)
+    key, other = cache_key("model", "The Matrix"), cache_key("model", "Inception")
+    store.put(key, np.ones(4, dtype=np.float32))
+
+    # Another process evicts the slot between the key check and the recheck
+    reads = iter([key, other])
+    with patch.object(store, "_stored_key", side_effect=lambda index: next(reads)):
+        assert store.get(key) is None
+    assert np.array_equal(store.get(key), np.ones(4))
+
+
+@patch("app.services.vector_service.SentenceTransformer")
+def test_generate_embeddings_batch_dedupes_texts(mock_transformer):
+    """Test equal texts are encoded once and float32 arrays are returned"""
+    import numpy as np
+    from app.services.vector_service import VectorService
+    from app.services.embedding_cache import EmbeddingCache
+
+    mock_transformer.return_value.encode.side_effect = lambda texts: np.ones(
+        (len(texts), 384), dtype=np.float32
+    )
+    service = VectorService(cache=EmbeddingCache(max_size=10))
+
+    embeddings = service.generate_embeddings_batch(
+        ["Heat", "Heat", "Heat A heist thriller"], as_numpy=True
+    )
+
+    assert embeddings.shape == (3, 384)
+    assert embeddings.dtype == np.float32
+    mock_transformer.return_value.encode.assert_called_once_with(
+        ["Heat", "Heat A heist thriller"]
+    )
+
+
+def test_embedding_batcher_coalesces_concurrent_requests():
+    """Test concurrent submissions share a single encode call"""
+    import asyncio
+    import numpy as np
+    from concurrent.futures import ThreadPoolExecutor
+    from app.services.vector_service import EmbeddingBatcher
+
+    batches = []
+
+    def encode(texts):
+        batches.append(list(texts))
+        return np.array([[float(len(text))] for text in texts], dtype=np.float32)
+
+    batcher = EmbeddingBatcher(encode, max_batch_size=4, max_wait_ms=200)
+    texts = ["a", "bb", "ccc", "dddd"]
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(batcher.embed, texts))
+
+    assert [float(r[0]) for r in results] == [1.0, 2.0, 3.0, 4.0]
+    assert len(batches) == 1
+    assert sorted(batches[0]) == texts
+
+    result = asyncio.run(batcher.embed_async("eeeee"))
+    assert float(result[0]) == 5.0
+
+
+def test_embedding_batcher_propagates_errors():
+    """Test encode failures are raised to every waiting caller"""
+    from app.services.vector_service import EmbeddingBatcher
+
+    def encode(texts):
+        raise RuntimeError("model crashed")
+
+    batcher = EmbeddingBatcher(encode, max_wait_ms=1)
+
+    with pytest.raises(RuntimeError):
+        batcher.embed("text", timeout=5)
+
+
+def test_embedding_server_round_trip(tmp_path):
+    """Test the embedding client talks to a shared server over a Unix socket"""
+    import threading
+    import numpy as np
+    from app.services.embedding_server import EmbeddingClient, EmbeddingServer
+
+    def embed(texts):
+        if "boom" in texts:
+            raise ValueError("bad input")
+        return np.array([[len(text), 1.0] for text in texts], dtype=np.float32)
+
+    socket_path = str(tmp_path / "embeddings.sock")
+    server = EmbeddingServer(socket_path, embed)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    try:
+        client = EmbeddingClient(socket_path, timeout=5)
+        embeddings = client.encode(["a", "abc"])
+        assert embeddings.shape == (2, 2)
+        assert embeddings[1].tolist() == [3.0, 1.0]
+        assert client.encode("abcd").tolist() == [4.0, 1.0]
+
+        from app.services.embedding_server import EmbeddingServerError
+
+        with pytest.raises(EmbeddingServerError):
+            client.encode(["boom"])
+        # The connection stays usable after an error response
+        assert client.encode(["ab"]).shape == (1, 2)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_embedding_server_model_error_reaches_client(tmp_path):
+    """Test an encode error on the server raises in the client and is not cached"""
+    import threading
+    from app.services.embedding_cache import EmbeddingCache
+    from app.services.embedding_server import EmbeddingServer, service_embed
+    from app.services.vector_service import VectorService
+
+    failing_model = Mock()
+    failing_model.encode.side_effect = RuntimeError("CUDA out of memory")
+    with patch(
+        "app.services.vector_service.SentenceTransformer", return_value=failing_model
+    ):
+        server_service = VectorService(cache=EmbeddingCache(max_size=8))
+
+    socket_path = str(tmp_path / "embeddings.sock")
+    server = EmbeddingServer(socket_path, service_embed(server_service))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    try:
+        with patch(
+            "app.services.vector_service.settings.embedding_server_socket",
+            socket_path,
+        ):
+            client_service = VectorService(cache=EmbeddingCache(max_size=8))
+        client_service.batcher = None
+
+        with pytest.raises(Exception):
+            client_service.generate_movie_vectors(
+                [{"title_vector": "Heat"}], raise_on_error=True
+            )
+        assert len(client_service.cache._entries) == 0
+        assert len(server_service.cache._entries) == 0
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_bulk_similarity_matches_pairwise():
+    """Test one-vs-many and many-vs-many agree with calculate_similarity"""
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    queries = rng.normal(size=(3, 8)).astype(np.float32)
+    candidates = rng.normal(size=(10, 8)).astype(np.float32)
+    candidates[4] = 0.0  # zero vectors score 0
+
+    matrix = vector_service.similarity_many_to_many(queries, candidates, chunk_size=3)
+    assert matrix.shape == (3, 10)
+    assert matrix.dtype == np.float32
+    for i in range(3):
+        for j in range(10):
+            expected = vector_service.calculate_similarity(queries[i], candidates[j])
+            assert abs(matrix[i, j] - expected) < 1e-5
+
+    row = vector_service.similarity_one_to_many(queries[0], candidates)
+    assert np.allclose(row, matrix[0], atol=1e-6)
+
+
+def test_bulk_similarity_normalizes_per_chunk():
+    """Test candidates are normalized chunk by chunk and lists are accepted"""
+    import numpy as np
+    from app.services.vector_service import VectorService
+
+    rng = np.random.default_rng(2)
+    queries = rng.normal(size=(2, 8)).astype(np.float32)
+    candidates = rng.normal(size=(10, 8)).astype(np.float32)
+    expected = VectorService.normalize(queries) @ VectorService.normalize(candidates).T
+
+    with patch.object(
+        VectorService, "normalize", side_effect=VectorService.normalize
+    ) as normalize:
+        matrix = vector_service.similarity_many_to_many(
+            queries, candidates, chunk_size=4
+        )
+    assert np.allclose(matrix, expected, atol=1e-6)
+    assert max(len(call.args[0]) for call in normalize.call_args_list) == 4
+
+    unit = VectorService.normalize(candidates)
+    matrix = vector_service.similarity_many_to_many(
+        VectorService.normalize(queries).tolist(),
+        unit.tolist(),
+        normalized=True,
+        chunk_size=4,
+    )
+    assert np.allclose(matrix, expected, atol=1e-6)
+
+
+def test_top_k_similar_chunked():
+    """Test chunked top-k returns the same neighbours as a full sort"""
+    import numpy as np
+
+    rng = np.random.default_rng(1)
+    queries = rng.normal(size=(4, 16))
+    candidates = rng.normal(size=(1000, 16))
+
+    indices, scores = vector_service.top_k_similar(
+        queries, candidates, k=5, chunk_size=128
+    )
+
+    full = vector_service.similarity_many_to_many(queries, candidates)
+    expected = np.argsort(-full, axis=1)[:, :5]
+    assert indices.shape == (4, 5)
+    assert np.array_equal(indices, expected)
+    assert np.all(np.diff(scores, axis=1) <= 0)
+
+
+@patch("app.services.vector_service.SentenceTransformer")
+def test_generate_movie_vectors_raise_on_error(mock_transformer):
+    """Test strict mode raises encode errors instead of returning zero vectors"""
+    from app.services.vector_service import VectorService
+    from app.services.embedding_cache import EmbeddingCache
+
+    mock_transformer.return_value.encode.side_effect = RuntimeError("model crashed")
+    service = VectorService(cache=EmbeddingCache(max_size=10))
+    texts = [{"title_vector": "Heat"}]
+
+    assert not service.generate_movie_vectors(texts)[0]["title_vector"].any()
+    with pytest.raises(RuntimeError, match="model crashed"):
+        service.generate_movie_vectors(texts, raise_on_error=True)
+
+    service.model = None
+    with pytest.raises(RuntimeError, match="not available"):
+        service.generate_movie_vectors(texts, raise_on_error=True)
+
+
+def test_ann_index_reload_replays_concurrent_writes():
+    """Test writes made while the index reloads survive the swap"""
+    pytest.importorskip("hnswlib")
+    from types import SimpleNamespace
+    from uuid import uuid4
+    from app.services.ann_index import ANNIndexService
+
+    service = ANNIndexService()
+    stored, written = uuid4(), uuid4()
+
+    def rows():
+        # Another request writes while the rows are being read
+        service.upsert_movie(
+            SimpleNamespace(id=written, combined_vector=[0.0, 1.0, 0.0])
+        )
+        return [(stored, [1.0, 0.0, 0.0])]
+
+    db = Mock()
+    db.query.return_value.filter.return_value.all.side_effect = rows
+    with patch("app.services.ann_index.settings") as mock_settings:
+        mock_settings.vector_search_backend = "hnsw"
+        mock_settings.vector_dimension = 3
+        mock_settings.hnsw_m = 16
+        mock_settings.hnsw_ef_construction = 200
+        mock_settings.hnsw_ef_search = 64
+        service.load(db)
+
+    assert service.ready
+    assert service.get_vector(written, "combined") is not None
+    assert service.get_vector(stored, "combined") is not None
+    assert service.get_vector(written, "title") is None
+
+    service.remove_movie(written)
+    assert service.get_vector(written, "combined") is None
+
+
+def test_ann_index_sync_applies_changed_rows():
+    """Test a sync reads only rows updated since the load and applies them"""
+    pytest.importorskip("hnswlib")
+    from datetime import datetime, timezone
+    from types import SimpleNamespace
+    from uuid import uuid4
+    from app.services.ann_index import ANNIndexService
+
+    loaded_at = datetime(2026, 10, 17, 12, 0, tzinfo=timezone.utc)
+    changed_at = datetime(2026, 10, 17, 12, 1, tzinfo=timezone.utc)
+    service = ANNIndexService()
+    stored, created = uuid4(), uuid4()
+
+    db = Mock()
+    db.query.return_value.scalar.return_value = loaded_at
+    db.query.return_value.filter.return_value.all.return_value = [
+        (stored, [1.0, 0.0, 0.0])
+    ]
+    with patch("app.services.ann_index.settings") as mock_settings:
+        mock_settings.vector_search_backend = "hnsw"
+        mock_settings.vector_dimension = 3
+        mock_settings.hnsw_m = 16
+        mock_settings.hnsw_ef_construction = 200
+        mock_settings.hnsw_ef_search = 64
+        service.load(db)
+
+    def changed(vector):
+        return {
+            "title_vector": None,
+            "synopsis_vector": None,
+            "combined_vector": vector,
+        }
+
+    db = Mock()
+    db.query.return_value.filter.return_value.all.return_value = [
+        SimpleNamespace(id=created, updated_at=changed_at, **changed([0.0, 1.0, 0.0])),
+        # Queued for re-embedding: its vectors were cleared
+        SimpleNamespace(id=stored, updated_at=loaded_at, **changed(None)),
+    ]
+    assert service.sync(db) == 2
+
+    db.query.return_value.filter.assert_called_once()
+    assert service.get_vector(created, "combined") is not None
+    assert service.get_vector(stored, "combined") is None
+    assert service._synced_at == changed_at